@@ -7,9 +7,13 @@ from backend.api import v1_app, v2_app
 from backend.api.auth import auth_router
 from backend.api.config import settings
 from backend.api.health_check import health_router
+from backend.database import DatabaseInterface
+from backend.database.postgres import PostgresSessionManager
+from backend.database.postgres.invalidation import invalidation_listener
 from backend.loguru_logger import logger_setup
 from backend.middleware import add_http_middleware
 from backend.rabbit import declare_queues, init_rabbit
+from backend.rabbit.outbox import OutboxRelay
 
 logger_setup(settings)
 
@@ -25,7 +29,16 @@ async def lifespan(func_app: FastAPI):
     # func_app.state.rabbit_channel = _ch
     v2_app.state.rabbit_connection = _conn
     v2_app.state.rabbit_channel = _ch
+    await DatabaseInterface.init_all()
+    await PostgresSessionManager.warm_up()
+    invalidation_listener.start()
+    v2_app.state.outbox_relay = OutboxRelay(channel=_ch, settings=settings)
+    v2_app.state.outbox_relay.start()
     yield
+    logger.info("Lifespan processes shutdown...")
+    await v2_app.state.outbox_relay.stop()
+    await invalidation_listener.stop()
+    await PostgresSessionManager.dispose()
 
 
 _app = FastAPI(lifespan=lifespan, root_path="")
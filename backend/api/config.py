@@ -66,6 +66,10 @@ class Settings(BaseSettings):
     RABBITMQ_S_QUEUE: str
     RABBITMQ_M_QUEUE: str
     RABBITMQ_L_QUEUE: str
+    # transactional outbox, see backend.rabbit.outbox.OutboxRelay
+    RABBITMQ_OUTBOX_BATCH_SIZE: int = 100
+    RABBITMQ_OUTBOX_POLL_INTERVAL: float = 1.0
+    RABBITMQ_OUTBOX_RETENTION: float = 86_400.0
 
     # Health check
     CGROUP_CPU_USAGE: str | None = None
@@ -1,10 +1,17 @@
 import time
+import typing
 
 import fastapi
 import psutil
 from loguru import logger
 
 from backend.api.config import settings
+from backend.database.postgres import PostgresSessionManager
+from backend.database.postgres.counts import count_service
+from backend.database.postgres.entity_cache import entity_cache
+from backend.database.postgres.invalidation import invalidation_listener
+from backend.database.postgres.record_loader import record_loader
+from backend.database.postgres.statement_stats import statement_stats
 
 health_router = fastapi.APIRouter(prefix="/health-app", tags=["health-app"])
 
@@ -156,4 +163,31 @@ async def rabbit(request: fastapi.Request) -> dict:
             status_code=fastapi.status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"message": "Not connected to RabbitMQ"},
         )
-    return {"status": "healthy", "message": "Connected to RabbitMQ"}
+    relay = getattr(request.app.state, "outbox_relay", None)
+    return {
+        "status": "healthy",
+        "message": "Connected to RabbitMQ",
+        "outbox": relay.stats() if relay else None,
+    }
+
+
+@health_router.get("/postgres", status_code=200)
+async def postgres() -> dict:
+    """Report process-wide Postgres pool, cache and loader usage."""
+    return {
+        "pool": PostgresSessionManager.pool_stats(),
+        "cache": entity_cache.stats(),
+        "invalidation": invalidation_listener.stats(),
+        "loader": record_loader.stats(),
+        "statements": statement_stats.stats(),
+        "counts": count_service.stats(),
+    }
+
+
+@health_router.get("/postgres/statements", status_code=200)
+async def postgres_statements(
+    limit: int = fastapi.Query(20, ge=1, le=1_000),
+    order_by: typing.Literal["total", "count", "max"] = "total",
+) -> list[dict]:
+    """Top statement fingerprints with their latency histograms."""
+    return statement_stats.top(limit=limit, order_by=order_by)
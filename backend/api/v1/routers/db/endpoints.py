@@ -23,7 +23,10 @@ db_router = fastapi.APIRouter(prefix="/database", tags=["Database"])
 async def postgres_endpoint(
     pg_db: typing.Annotated[
         "PostgresImplementation",
-        Depends(DatabaseInterface.get_db_impl(db_name="Postgres")),
+        # GET route runs every CRUD method, including writes
+        Depends(
+            DatabaseInterface.get_db_impl(db_name="Postgres", read_only=False)
+        ),
     ],
     method: AllowedDbMethod,
 ):
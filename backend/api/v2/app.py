@@ -55,10 +55,24 @@ _app.add_middleware(
 _app = exceptions.add_handlers(app=_app)
 _app.include_router(router=routers.about)
 _app.include_router(router=routers.health)
-_app.include_router(router=routers.files_router)
-_app.include_router(router=routers.users_router)
-_app.include_router(router=routers.workspaces_router)
-_app.include_router(router=routers.tasks_router)
+# Postgres backed routers, routes can shorten or extend the deadline
+_app.include_router(
+    router=routers.files_router,
+    dependencies=[routers.request_deadline()],
+)
+_app.include_router(
+    router=routers.users_router,
+    dependencies=[routers.request_deadline()],
+)
+_app.include_router(
+    router=routers.workspaces_router,
+    dependencies=[routers.request_deadline()],
+)
+_app.include_router(
+    router=routers.tasks_router,
+    dependencies=[routers.request_deadline()],
+)
+_app.include_router(router=routers.admin_router)
 
 
 v2_app = _app
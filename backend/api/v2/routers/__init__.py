@@ -1,7 +1,9 @@
 from .about.endpoints import about_router as about
+from .admin.endpoints import admin_router
+from .deadline import request_deadline
 from .files.endpoints import files_router
 from .health.endpoints import health_router as health
-from .models import Page
+from .models import BulkResponse, Page
 from .tasks.endpoints import tasks_router
 from .users.endpoints import users_router
 from .workspaces.endpoints import workspaces_router
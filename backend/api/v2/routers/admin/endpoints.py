@@ -0,0 +1,40 @@
+import fastapi
+
+from backend import auth
+from backend.database.postgres.slow_queries import slow_queries
+
+from . import examples
+
+admin_router = auth.APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@admin_router.get(
+    "/slow-queries",
+    status_code=fastapi.status.HTTP_200_OK,
+    responses=examples.response.admin_slow_queries,
+)
+async def get_slow_queries(
+    limit: int = fastapi.Query(10, ge=1, le=100),
+) -> list[dict]:
+    """
+    Top slow statement fingerprints of this process with sampled
+    EXPLAIN (ANALYZE, BUFFERS) plans. Use it to spot missing indexes.
+    """
+    return slow_queries.top(limit=limit)
+
+
+@admin_router.get(
+    "/slow-queries/stats",
+    status_code=fastapi.status.HTTP_200_OK,
+)
+async def get_slow_queries_stats() -> dict:
+    return slow_queries.stats()
+
+
+@admin_router.delete(
+    "/slow-queries",
+    status_code=fastapi.status.HTTP_204_NO_CONTENT,
+)
+async def clear_slow_queries():
+    slow_queries.clear()
+    return fastapi.Response(status_code=fastapi.status.HTTP_204_NO_CONTENT)
@@ -0,0 +1 @@
+from . import request, response
@@ -0,0 +1,45 @@
+from backend import exceptions
+
+admin_slow_queries = {
+    200: {
+        "description": "Slowest statement fingerprints with sampled plans",
+        "content": {
+            "application/json": {
+                "examples": {
+                    "one_fingerprint": {
+                        "summary": "Lookup by non indexed column",
+                        "value": [
+                            {
+                                "digest": "3f1c0b5e2a9d7c41",
+                                "sql": "SELECT users.id, users.user_id, "
+                                "users.name, users.email FROM users "
+                                "WHERE users.email = %(email_1)s",
+                                "count": 12,
+                                "max_s": 1.2031,
+                                "total_s": 9.8712,
+                                "routes": ["/api/v2/users/{user_id}"],
+                                "last": {
+                                    "duration_s": 0.8123,
+                                    "params": {"email_1": "str"},
+                                    "correlation_id": "8c3b0c1d2e4f",
+                                    "route": "/api/v2/users/{user_id}",
+                                    "captured_at": 1760000000.0,
+                                },
+                                "plan": [{"Plan": {"Node Type": "Seq Scan"}}],
+                            }
+                        ],
+                    },
+                }
+            }
+        },
+    },
+    "4xx": {
+        "description": "4xx Status code returned",
+        "content": {
+            "application/json": {
+                "examples": exceptions.api.ApiError._api_errors
+            }
+        },
+    },
+    500: {"description": "Internal server error"},
+}
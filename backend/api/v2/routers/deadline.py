@@ -0,0 +1,61 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import fastapi
+from loguru import logger
+
+from backend.database.postgres.query_context import QueryContext, query_context
+
+
+async def _watch_disconnect(
+    *,
+    request: fastapi.Request,
+    task: asyncio.Task,
+    context: QueryContext,
+) -> None:
+    # Body is read already, what's left on receive channel is disconnect.
+    # Blocking receive instead of polling `request.is_disconnected()`,
+    # BaseHTTPMiddleware drops the message when receive is cancelled.
+    while (await request.receive())["type"] != "http.disconnect":
+        continue
+    context.disconnected = True
+    logger.warning(f"Client disconnected, cancelling {context.route}")
+    task.cancel()
+
+
+def request_deadline(seconds: float | None = None) -> fastapi.params.Depends:
+    """Route/router dependency bounding time spent in Postgres.
+    Usage: `@router.get("/", dependencies=[request_deadline(5)])`.
+    Deadline counts from request start, None keeps the default
+        POSTGRES_REQUEST_TIMEOUT. Every transaction gets time left
+        as its statement_timeout, StatementTimeoutError once it runs out.
+    Until route returns, client disconnect cancels route's task,
+        which cancels query in flight and frees its connection.
+    Request body is already read when dependencies run,
+        so polling for disconnect can't swallow it.
+    """
+
+    async def set_deadline(request: fastapi.Request) -> AsyncIterator[None]:
+        context = query_context.get()
+        if context is None:
+            yield
+            return
+        if seconds is not None:
+            context.deadline = context.started + seconds
+        if context.watcher is not None:  # router and route both have one
+            yield
+            return
+        context.watcher = asyncio.create_task(
+            _watch_disconnect(
+                request=request,
+                task=asyncio.current_task(),
+                context=context,
+            )
+        )
+        try:
+            yield
+        finally:
+            context.watcher.cancel()
+            context.watcher = None
+
+    return fastapi.Depends(set_deadline, scope="function")
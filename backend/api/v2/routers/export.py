@@ -0,0 +1,69 @@
+import csv
+import io
+import typing
+from collections.abc import AsyncIterator
+
+import orjson
+import pydantic
+from fastapi.responses import StreamingResponse
+
+ExportFormat = typing.Literal["ndjson", "csv"]
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_response(
+    *,
+    batches: AsyncIterator[list],
+    model: type[pydantic.BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Streams record batches as a downloadable NDJSON or CSV file.
+    Every row goes through response model, so only public fields leave.
+    One batch is rendered and sent at a time, next one is fetched
+        only after client took previous, slow clients slow down the cursor.
+    """
+    render = _render_ndjson if export_format == "ndjson" else _render_csv
+    return StreamingResponse(
+        render(batches=batches, model=model),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename={filename}.{export_format}"
+            )
+        },
+    )
+
+
+async def _render_ndjson(
+    *,
+    batches: AsyncIterator[list],
+    model: type[pydantic.BaseModel],
+) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(
+            orjson.dumps(model.model_validate(row).model_dump()) + b"\n"
+            for row in batch
+        )
+
+
+async def _render_csv(
+    *,
+    batches: AsyncIterator[list],
+    model: type[pydantic.BaseModel],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(model.model_fields))
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(
+            model.model_validate(row).model_dump(mode="json") for row in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,68 @@
+import functools
+
+import fastapi
+import pydantic
+
+from backend import exceptions
+
+
+def fields_query(model: type[pydantic.BaseModel]):
+    """`?fields=` query parameter listing allowed fields in its description."""
+    return fastapi.Query(
+        None,
+        description=(
+            "Comma-separated fields to return, all when omitted. "
+            f"One of: {', '.join(model.model_fields)}"
+        ),
+    )
+
+
+def parse_fields(
+    *,
+    fields: str | None,
+    model: type[pydantic.BaseModel],
+) -> tuple[str, ...] | None:
+    """
+    Validates `?fields=` against model, returns them in model order.
+    None means all fields were requested.
+    """
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    if unknown := requested - set(model.model_fields):
+        raise exceptions.api.FieldFormatError(
+            f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    if not requested or requested == set(model.model_fields):
+        return None
+    return tuple(f for f in model.model_fields if f in requested)
+
+
+@functools.cache
+def projected_model(
+    model: type[pydantic.BaseModel],
+    fields: tuple[str, ...],
+) -> type[pydantic.BaseModel]:
+    """Model with only `fields` of `model`, built once per combination."""
+    return pydantic.create_model(
+        f"{model.__name__}Fields",
+        __config__=pydantic.ConfigDict(from_attributes=True),
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items()
+            if name in fields
+        },
+    )
+
+
+def project(
+    *,
+    records: list,
+    model: type[pydantic.BaseModel],
+    fields: tuple[str, ...],
+) -> list[dict]:
+    trimmed = projected_model(model, fields)
+    return [
+        trimmed.model_validate(record).model_dump(mode="json")
+        for record in records
+    ]
@@ -0,0 +1 @@
+from .models import File, FileBatchUpdate, FilesPageResponse
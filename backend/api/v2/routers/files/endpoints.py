@@ -3,17 +3,34 @@ import typing
 import zipfile
 
 import fastapi
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
 
 from backend import auth
-from backend.database import FS_SESSION
+from backend.api.v2.routers.deadline import request_deadline
+from backend.api.v2.routers.export import ExportFormat, export_response
+from backend.api.v2.routers.fields import fields_query, parse_fields, project
+from backend.api.v2.routers.include import (
+    FileDetail,
+    include_query,
+    nest,
+    parse_include,
+)
+from backend.api.v2.routers.models import BulkResponse
+from backend.api.v2.routers.pagination import build_page, decode_cursor
+from backend.database import FS_SESSION, PG_SESSION, PG_STREAM_SESSION
 from backend.database.file_storage import Record
 
+from . import File, FileBatchUpdate, FilesPageResponse
+
 files_router = auth.APIRouter(prefix="/files", tags=["Files"])
 
 if typing.TYPE_CHECKING:
-    from backend.database import FileStorageImplementation
+    from backend.database import (
+        FileStorageImplementation,
+        PostgresImplementation,
+    )
+    from backend.database.models import BulkResult
 FILE_NAME = str
 CONTENT = bytes
 
@@ -95,6 +112,98 @@ async def get_files(
     )
 
 
+@files_router.get(
+    "/export",
+    status_code=fastapi.status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    dependencies=[request_deadline(600)],
+)
+async def export_files(
+    pg_db: "PostgresImplementation" = PG_STREAM_SESSION,
+    export_format: ExportFormat = fastapi.Query(  # noqa: B008
+        "ndjson",
+        alias="format",
+        description="`ndjson` (one JSON object per line) or `csv`",
+    ),
+) -> StreamingResponse:
+    """
+    Download metadata of all files from Postgres `files` table.
+    """
+    return export_response(
+        batches=pg_db.stream_records(place="files"),
+        model=File,
+        export_format=export_format,
+        filename="files",
+    )
+
+
+@files_router.get("/metadata", status_code=fastapi.status.HTTP_200_OK)
+async def get_many_files_metadata(
+    pg_db: "PostgresImplementation" = PG_SESSION,
+    page_num: int = fastapi.Query(
+        1,
+        ge=1,
+        description="Page number (starting from 1)",
+    ),
+    page_size: int = fastapi.Query(
+        20,
+        ge=1,
+        le=100,
+        description="Number of results per page_num",
+    ),
+    cursor: str | None = fastapi.Query(
+        None,
+        description="Cursor from `next_page`, takes precedence over page_num",
+    ),
+    fields: str | None = fields_query(File),
+    include: str | None = include_query(FileDetail),
+    request: fastapi.Request = None,
+) -> FilesPageResponse:
+    """
+    Paginated metadata of files from Postgres `files` table.
+    `fields` limits returned fields, e.g. `file_id,name` skips long urls.
+    `include=owner` embeds owners with one extra query for whole page.
+    """
+    columns = parse_fields(fields=fields, model=File)
+    relations = parse_include(
+        include=include, model=FileDetail, fields=columns
+    )
+    files: list[File] = await pg_db.get_many_records(
+        page_num=page_num,
+        page_size=page_size,
+        place="files",
+        after=decode_cursor(cursor=cursor) if cursor else None,
+        columns=columns,
+        include=relations,
+    )
+    total = await pg_db.count_records(place="files")
+    files, page = build_page(
+        records=files,
+        page_num=page_num,
+        page_size=page_size,
+        request=request,
+        route_name="get_many_files_metadata",
+        total=total,
+    )
+    if relations:
+        return ORJSONResponse(
+            {
+                "files": nest(
+                    records=files, model=FileDetail, include=relations
+                ),
+                "page": page.model_dump(mode="json"),
+            }
+        )
+    if columns:
+        return ORJSONResponse(
+            {
+                "files": project(records=files, model=File, fields=columns),
+                "page": page.model_dump(mode="json"),
+            }
+        )
+    return FilesPageResponse(files=files, page=page)
+
+
 # # ADD many files (multipart/form-data)
 @files_router.post("/", status_code=fastapi.status.HTTP_201_CREATED)
 async def add_many_files(
@@ -132,6 +241,27 @@ async def delete_many_files_json(
     return await file_storage.delete_many_records(filenames)
 
 
+@files_router.patch("/", status_code=fastapi.status.HTTP_200_OK)
+async def update_many_files(
+    pg_db: "PostgresImplementation" = PG_SESSION,
+    files: list[FileBatchUpdate] = fastapi.Body(  # noqa: B008
+        ...,
+        min_length=1,
+        max_length=100_000,
+    ),
+) -> BulkResponse:
+    """
+    Update metadata of many files at once in Postgres `files` table.
+    Only fields that are sent get updated.
+    Files that were not found or failed to update are listed in `failed`.
+    """
+    result: BulkResult = await pg_db.update_many_records(
+        records=files,
+        place="files",
+    )
+    return BulkResponse(**result.model_dump(exclude={"records"}))
+
+
 # # UPDATE many files (multipart/form-data)
 # @files_router.put("/many/update")
 # async def update_many_files(
@@ -0,0 +1,27 @@
+import pydantic
+
+from backend.api.v2.routers.models import Page
+
+
+class File(pydantic.BaseModel):
+    file_id: str
+    name: str
+    url: str
+    size_mb: float
+    type: str
+    user_id: str
+    model_config = {"from_attributes": True}  # <-- allow File instances
+
+
+class FileBatchUpdate(pydantic.BaseModel):
+    file_id: str
+    name: str | None = None
+    url: str | None = None
+    size_mb: float | None = None
+    type: str | None = None
+    user_id: str | None = None
+
+
+class FilesPageResponse(pydantic.BaseModel):
+    files: list[File]
+    page: Page
@@ -0,0 +1,83 @@
+import fastapi
+import pydantic
+
+from backend import exceptions
+from backend.api.v2.routers.files.models import File
+from backend.api.v2.routers.users.models import User
+from backend.api.v2.routers.workspaces.models import Workspace
+
+
+class UserDetail(User):
+    workspaces: list[Workspace] | None = None
+    files: list[File] | None = None
+
+
+class WorkspaceDetail(Workspace):
+    owner: User | None = None
+
+
+class FileDetail(File):
+    owner: User | None = None
+
+
+def relations(model: type[pydantic.BaseModel]) -> tuple[str, ...]:
+    """Fields a detail model adds on top of its base model."""
+    base = model.__base__.model_fields
+    return tuple(name for name in model.model_fields if name not in base)
+
+
+def include_query(model: type[pydantic.BaseModel]):
+    """`?include=` query parameter listing relations in its description."""
+    return fastapi.Query(
+        None,
+        description=(
+            "Comma-separated related records to embed. "
+            f"One of: {', '.join(relations(model))}"
+        ),
+    )
+
+
+def parse_include(
+    *,
+    include: str | None,
+    model: type[pydantic.BaseModel],
+    fields: tuple[str, ...] | None = None,
+) -> tuple[str, ...] | None:
+    """
+    Validates `?include=` against relations of detail model.
+    Can't be combined with `?fields=`, nested records need whole rows.
+    """
+    if not include:
+        return None
+    requested = {r.strip() for r in include.split(",") if r.strip()}
+    allowed = relations(model)
+    if unknown := requested - set(allowed):
+        raise exceptions.api.FieldFormatError(
+            f"Unknown include: {', '.join(sorted(unknown))}"
+        )
+    if requested and fields:
+        raise exceptions.api.FieldFormatError(
+            "`fields` and `include` can't be used together"
+        )
+    return tuple(r for r in allowed if r in requested) or None
+
+
+def nest(
+    *,
+    records: list,
+    model: type[pydantic.BaseModel],
+    include: tuple[str, ...],
+) -> list[dict]:
+    """
+    Dumps ORM records with eagerly loaded `include` relations.
+    Only attributes of base model and `include` are read, touching
+        any other relation would lazy load, which AsyncSession can't do.
+    """
+    base = model.__base__.model_fields
+    skipped = set(relations(model)) - set(include)
+    return [
+        model.model_validate(
+            {name: getattr(record, name) for name in (*base, *include)}
+        ).model_dump(mode="json", exclude=skipped)
+        for record in records
+    ]
@@ -1,9 +1,24 @@
 import pydantic
 
+from backend.database.models import ChunkReport
+
 
 class Page(pydantic.BaseModel):
     page_num: int
     page_size: int
     total_items: int
+    # total_items comes from planner statistics, not COUNT(*)
+    is_estimate: bool = False
+    next_cursor: str | None = None
     next_page: pydantic.HttpUrl | None = None
     previous_page: pydantic.HttpUrl | None = None
+
+
+class BulkResponse(pydantic.BaseModel):
+    affected: int
+    inserted: int = 0
+    updated: int = 0
+    failed: list[str] = []
+    unchanged: list[str] = []
+    invalid: list[int] = []
+    chunks: list[ChunkReport] = []
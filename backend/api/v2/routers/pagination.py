@@ -0,0 +1,75 @@
+import base64
+import binascii
+import typing
+
+import fastapi
+import orjson
+
+from backend import exceptions
+from backend.api.v2.routers.models import Page
+
+if typing.TYPE_CHECKING:
+    from backend.database.postgres.counts import Count
+
+
+def encode_cursor(*, last_id: int) -> str:
+    """Opaque cursor pointing after the last returned record."""
+    raw: bytes = orjson.dumps({"id": last_id})
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(*, cursor: str) -> int:
+    """Returns record id that the cursor points after."""
+    try:
+        padded: str = cursor + "=" * (-len(cursor) % 4)
+        last_id = orjson.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError):
+        last_id = None
+    if not isinstance(last_id, int):
+        raise exceptions.api.FieldFormatError(f"Invalid cursor: {cursor}")
+    return last_id
+
+
+def build_page(
+    *,
+    records: list | None,
+    page_num: int,
+    page_size: int,
+    request: fastapi.Request,
+    route_name: str,
+    total: "Count | None" = None,
+) -> tuple[list, Page]:
+    """
+    Trims `get_many_records` result to page_size and builds Page.
+    `get_many_records` returns page_size + 1 when next page is available.
+    Next page link always carries a cursor, so following pages use keyset
+    pagination even if the first one was requested by page_num.
+    Other query params (fields, include, count...) are kept in the link,
+    so response shape doesn't change while paginating.
+    `total` is whole table count from `count_records`,
+    without it total_items is just the size of this page.
+    """
+    records = list(records or [])
+    next_cursor = None
+    next_page = None
+    if len(records) == page_size + 1:
+        records = records[:-1]
+        next_cursor = encode_cursor(last_id=records[-1].id)
+        next_page = str(
+            request.url_for(route_name)
+            .replace(query=request.url.query)
+            .include_query_params(
+                cursor=next_cursor,
+                page_num=page_num + 1,
+                page_size=page_size,
+            )
+        )
+    page: Page = Page(
+        page_num=page_num,
+        page_size=page_size,
+        total_items=total.value if total else len(records),
+        is_estimate=total.is_estimate if total else False,
+        next_cursor=next_cursor,
+        next_page=next_page,
+    )
+    return records, page
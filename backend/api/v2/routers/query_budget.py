@@ -0,0 +1,27 @@
+import fastapi
+
+from backend.api.config import EnvType, settings
+from backend.database.postgres.query_context import query_context
+
+STRICT_ENVS: tuple[EnvType, ...] = (EnvType.LOCAL, EnvType.DEV)
+
+
+def query_budget(
+    limit: int, strict: bool | None = None
+) -> fastapi.params.Depends:
+    """Route dependency capping SQL statements executed by one request.
+    Usage: `@router.get("/", dependencies=[query_budget(3)])`.
+    Over budget request fails with QueryBudgetExceededError in LOCAL/DEV,
+        elsewhere only a warning is logged, unless strict is given.
+    """
+
+    async def set_budget() -> None:
+        context = query_context.get()
+        if context is None:
+            return
+        context.budget = limit
+        context.strict = (
+            settings.ENV_TYPE in STRICT_ENVS if strict is None else strict
+        )
+
+    return fastapi.Depends(set_budget)
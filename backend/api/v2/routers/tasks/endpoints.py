@@ -1,6 +1,7 @@
 import json
+import typing
+import uuid
 
-import aio_pika
 import fastapi
 import pydantic
 from asgi_correlation_id import correlation_id
@@ -8,11 +9,16 @@ from loguru import logger
 
 from backend import auth
 from backend.api.config import settings
+from backend.database import PG_SESSION
+from backend.database.postgres.models import Outbox
 
 from . import examples
 
 tasks_router = auth.APIRouter(prefix="/tasks", tags=["Tasks"])
 
+if typing.TYPE_CHECKING:
+    from backend.database import PostgresImplementation
+
 
 class TaskCreate(pydantic.BaseModel):
     user: str = pydantic.Field(..., examples=["alice", "bob"])
@@ -26,8 +32,13 @@ class TaskCreate(pydantic.BaseModel):
 async def create_task(
     payload: TaskCreate,
     request: fastapi.Request,
+    pg_db: "PostgresImplementation" = PG_SESSION,
 ) -> fastapi.responses.JSONResponse:
-    rabbit_ch = request.app.state.rabbit_channel
+    """
+    Queue a report task. Message is committed to the outbox
+    in this request's transaction, outbox relay publishes it afterwards,
+    so request never waits on RabbitMQ.
+    """
     logger.debug(f"Create task called with user={payload.user}")
     # Prepare a fake task
     task_message = {
@@ -35,21 +46,19 @@ async def create_task(
         "user": payload.user,
         "status": "created",
     }
-    message_body = json.dumps(task_message).encode()
-
-    # Publish a message to a queue named "tasks"
-    await rabbit_ch.default_exchange.publish(
-        aio_pika.Message(
-            body=message_body,
-            correlation_id=correlation_id.get(),
+    await pg_db.add_record(
+        place="outbox",
+        data=Outbox(
+            message_id=uuid.uuid4().hex,
             type="generate_report",
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            routing_key=settings.RABBITMQ_S_QUEUE,
+            body=json.dumps(task_message),
+            correlation_id=correlation_id.get(),
         ),
-        routing_key=settings.RABBITMQ_S_QUEUE,
-    )
-    logger.info(
-        f"Published dummy task to RabbitMQ. " f"Queue 'tasks': {task_message}"
     )
+    if (relay := getattr(request.app.state, "outbox_relay", None)) is not None:
+        relay.wake()
+    logger.info(f"Queued dummy task in outbox. Queue 'tasks': {task_message}")
 
     return fastapi.responses.JSONResponse(
         content={"data": task_message},
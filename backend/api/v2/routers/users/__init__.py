@@ -1 +1,7 @@
-from .models import Page, User, UsersPageResponse, UserUpdate
+from .models import (
+    Page,
+    User,
+    UserBatchUpdate,
+    UsersPageResponse,
+    UserUpdate,
+)
@@ -1,34 +1,95 @@
 import typing
 
 import fastapi
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from backend import auth, exceptions
-from backend.database import PG_SESSION
+from backend.api.v2.routers.deadline import request_deadline
+from backend.api.v2.routers.export import ExportFormat, export_response
+from backend.api.v2.routers.fields import fields_query, parse_fields, project
+from backend.api.v2.routers.include import (
+    UserDetail,
+    include_query,
+    nest,
+    parse_include,
+)
+from backend.api.v2.routers.models import BulkResponse
+from backend.api.v2.routers.pagination import build_page, decode_cursor
+from backend.api.v2.routers.query_budget import query_budget
+from backend.database import PG_SESSION, PG_STREAM_SESSION
 
-from . import Page, User, UsersPageResponse, UserUpdate, examples
+from . import User, UserBatchUpdate, UsersPageResponse, UserUpdate, examples
 
 users_router = auth.APIRouter(prefix="/users", tags=["Users"])
 
 if typing.TYPE_CHECKING:
     from backend.database import PostgresImplementation
+    from backend.database.models import BulkResult
+
+
+@users_router.get(
+    "/export",
+    status_code=fastapi.status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    dependencies=[request_deadline(600)],
+    responses=examples.response.users_export_users,
+)
+async def export_users(
+    pg_db: "PostgresImplementation" = PG_STREAM_SESSION,
+    export_format: ExportFormat = fastapi.Query(  # noqa: B008
+        "ndjson",
+        alias="format",
+        description="`ndjson` (one JSON object per line) or `csv`",
+    ),
+) -> StreamingResponse:
+    """
+    Download all users as one streamed file instead of paging through them.
+    """
+    return export_response(
+        batches=pg_db.stream_records(place="users"),
+        model=User,
+        export_format=export_format,
+        filename="users",
+    )
 
 
 @users_router.get(
     "/{user_id}",
     status_code=fastapi.status.HTTP_200_OK,
     responses=examples.response.users_get_user,
+    dependencies=[query_budget(3)],
 )
 async def get_user(
     pg_db: "PostgresImplementation" = PG_SESSION,
     user_id: str = fastapi.Path(..., example="user_1"),
+    fields: str | None = fields_query(User),
+    include: str | None = include_query(UserDetail),
 ) -> User:
+    """
+    Fetch one user, `fields` limits returned fields,
+    `include` embeds their workspaces and/or files.
+    """
+    columns = parse_fields(fields=fields, model=User)
+    relations = parse_include(
+        include=include, model=UserDetail, fields=columns
+    )
     result: User = await pg_db.get_record(
         key="user_id",
         value=user_id,
         place="users",
+        columns=columns,
+        include=relations,
     )
     if not result:
         raise exceptions.api.NotFoundError(f"User: {user_id} not found")
+    if relations:
+        return ORJSONResponse(
+            nest(records=[result], model=UserDetail, include=relations)[0]
+        )
+    if columns:
+        return ORJSONResponse(
+            project(records=[result], model=User, fields=columns)[0]
+        )
     return result
 
 
@@ -36,6 +97,7 @@ async def get_user(
     "/",
     status_code=fastapi.status.HTTP_200_OK,
     responses=examples.response.users_get_many_users,
+    dependencies=[query_budget(5)],
 )
 async def get_many_users(
     pg_db: "PostgresImplementation" = PG_SESSION,
@@ -50,32 +112,83 @@ async def get_many_users(
         le=100,
         description="Number of results per page_num",
     ),
+    cursor: str | None = fastapi.Query(
+        None,
+        description="Cursor from `next_page`, takes precedence over page_num",
+    ),
+    fields: str | None = fields_query(User),
+    include: str | None = include_query(UserDetail),
     request: fastapi.Request = None,
 ) -> UsersPageResponse:
     """
-    Fetch a paginated list of users.
+    Fetch a paginated list of users, `fields` limits returned fields.
+    `include` embeds workspaces and/or files, one extra query each
+    no matter how many users are on the page.
     """
+    columns = parse_fields(fields=fields, model=User)
+    relations = parse_include(
+        include=include, model=UserDetail, fields=columns
+    )
     users: list[User] = await pg_db.get_many_records(
         page_num=page_num,
         page_size=page_size,
         place="users",
+        after=decode_cursor(cursor=cursor) if cursor else None,
+        columns=columns,
+        include=relations,
     )
-    next_page = None
-    if len(users) == page_size + 1:
-        # Check if next page is available.
-        # `get_many_records` returns page_size + 1
-        base_url = str(request.url_for("get_many_users"))
-        next_page = f"{base_url}?page={page_num+1}&page_size={page_size}"
-        users = users[:-1]
-    page: Page = Page(
+    total = await pg_db.count_records(place="users")
+    users, page = build_page(
+        records=users,
         page_num=page_num,
         page_size=page_size,
-        total_items=len(users),
-        next_page=next_page,
+        request=request,
+        route_name="get_many_users",
+        total=total,
     )
+    if relations:
+        return ORJSONResponse(
+            {
+                "users": nest(
+                    records=users, model=UserDetail, include=relations
+                ),
+                "page": page.model_dump(mode="json"),
+            }
+        )
+    if columns:
+        return ORJSONResponse(
+            {
+                "users": project(records=users, model=User, fields=columns),
+                "page": page.model_dump(mode="json"),
+            }
+        )
     return UsersPageResponse(users=users, page=page)
 
 
+@users_router.patch(
+    "/",
+    status_code=fastapi.status.HTTP_200_OK,
+    responses=examples.response.users_update_many_users,
+)
+async def update_many_users(
+    pg_db: "PostgresImplementation" = PG_SESSION,
+    users: list[UserBatchUpdate] = fastapi.Body(  # noqa: B008
+        ...,
+        min_length=1,
+        max_length=100_000,
+    ),
+) -> BulkResponse:
+    """
+    Update many users at once. Only fields that are sent get updated.
+    Users that were not found or failed to update are listed in `failed`.
+    """
+    result: BulkResult = await pg_db.update_many_records(
+        records=users,
+        place="users",
+    )
+    return BulkResponse(**result.model_dump(exclude={"records"}))
+
+
 @users_router.patch("/{user_id}", status_code=fastapi.status.HTTP_200_OK)
 async def update_user(
     pg_db: "PostgresImplementation" = PG_SESSION,
@@ -85,19 +198,14 @@ async def update_user(
         openapi_examples=examples.request.users,
     ),
 ) -> User:
-    existing_user: User = await pg_db.get_record(
+    updated_user: User = await pg_db.patch_record(
+        place="users",
         key="user_id",
         value=user_id,
-        place="users",
+        changes=user,
     )
-    if not existing_user:
+    if not updated_user:
         raise exceptions.api.NotFoundError(f"User: {user_id} not found")
-    existing_user.name = user.name
-    existing_user.email = user.email
-    updated_user = await pg_db.update_record(
-        data=existing_user,
-        place="users",
-    )
     return updated_user
 
 
@@ -134,6 +242,55 @@ async def create_user(
 ) -> User:
     new_user: User = await pg_db.add_record(
         place="users",
-        record=user,
+        data=user,
     )
     return new_user
+
+
+@users_router.post(
+    "/bulk",
+    status_code=fastapi.status.HTTP_201_CREATED,
+    responses=examples.response.users_create_many_users,
+)
+async def create_many_users(
+    pg_db: "PostgresImplementation" = PG_SESSION,
+    users: list[User] = fastapi.Body(  # noqa: B008
+        ...,
+        min_length=1,
+        max_length=100_000,
+        openapi_examples=examples.request.users_bulk,
+    ),
+) -> BulkResponse:
+    """
+    Add many users at once. Writes are chunked, big batches use COPY.
+    """
+    result: BulkResult = await pg_db.add_many_records(
+        records=users,
+        place="users",
+    )
+    return BulkResponse(**result.model_dump(exclude={"records"}))
+
+
+@users_router.put(
+    "/bulk",
+    status_code=fastapi.status.HTTP_200_OK,
+    responses=examples.response.users_upsert_many_users,
+)
+async def upsert_many_users(
+    pg_db: "PostgresImplementation" = PG_SESSION,
+    users: list[User] = fastapi.Body(  # noqa: B008
+        ...,
+        min_length=1,
+        max_length=100_000,
+        openapi_examples=examples.request.users_bulk,
+    ),
+) -> BulkResponse:
+    """
+    Create users that don't exist yet and update the ones that do.
+    Unchanged users are not counted in `affected`.
+    """
+    result: BulkResult = await pg_db.upsert_many_records(
+        records=users,
+        place="users",
+    )
+    return BulkResponse(**result.model_dump(exclude={"records"}))
@@ -33,3 +33,12 @@ users: dict = {
         },
     },
 }
+
+
+users_bulk: dict = {
+    "three_users": {
+        "summary": "Adding a few users at once",
+        "description": "Large batches are split into chunks by the database.",
+        "value": [example["value"] for example in users.values()],
+    },
+}
@@ -162,3 +162,147 @@ users_delete_user = {
     },
     500: {"description": "Internal server error"},
 }
+
+users_create_many_users = {
+    201: {
+        "description": "Users added, per-chunk report returned",
+        "content": {
+            "application/json": {
+                "examples": {
+                    "three_users": {
+                        "summary": "Single chunk",
+                        "description": "All users added in one chunk.",
+                        "value": {
+                            "affected": 3,
+                            "failed": [],
+                            "chunks": [
+                                {
+                                    "index": 0,
+                                    "size": 3,
+                                    "affected": 3,
+                                    "duration": 0.0042,
+                                    "error": None,
+                                }
+                            ],
+                        },
+                    },
+                }
+            }
+        },
+    },
+    "4xx": {
+        "description": "4xx Status code returned",
+        "content": {
+            "application/json": {
+                "examples": exceptions.api.ApiError._api_errors
+            }
+        },
+    },
+    500: {"description": "Internal server error"},
+}
+
+users_export_users = {
+    200: {
+        "description": "All users streamed as NDJSON or CSV file",
+        "content": {
+            "application/x-ndjson": {
+                "example": (
+                    '{"user_id":"user_2137","name":"John",'
+                    '"email":"john.paul@second.pl"}\n'
+                )
+            },
+            "text/csv": {
+                "example": "user_id,name,email\r\n"
+                "user_2137,John,john.paul@second.pl\r\n"
+            },
+        },
+    },
+    "4xx": {
+        "description": "4xx Status code returned",
+        "content": {
+            "application/json": {
+                "examples": exceptions.api.ApiError._api_errors
+            }
+        },
+    },
+    500: {"description": "Internal server error"},
+}
+
+users_update_many_users = {
+    200: {
+        "description": "Users updated, not applied users listed in failed",
+        "content": {
+            "application/json": {
+                "examples": {
+                    "partial_failure": {
+                        "summary": "One user not found",
+                        "description": "Two users updated, one not found.",
+                        "value": {
+                            "affected": 2,
+                            "failed": ["user_1939"],
+                            "chunks": [
+                                {
+                                    "index": 0,
+                                    "size": 3,
+                                    "affected": 2,
+                                    "duration": 0.0031,
+                                    "error": None,
+                                }
+                            ],
+                        },
+                    },
+                }
+            }
+        },
+    },
+    "4xx": {
+        "description": "4xx Status code returned",
+        "content": {
+            "application/json": {
+                "examples": exceptions.api.ApiError._api_errors
+            }
+        },
+    },
+    500: {"description": "Internal server error"},
+}
+
+users_upsert_many_users = {
+    200: {
+        "description": "Users created or updated, unchanged ones skipped",
+        "content": {
+            "application/json": {
+                "examples": {
+                    "mixed": {
+                        "summary": "New, changed and unchanged users",
+                        "description": "One created, one updated, "
+                        "one already up to date.",
+                        "value": {
+                            "affected": 2,
+                            "inserted": 1,
+                            "updated": 1,
+                            "failed": [],
+                            "chunks": [
+                                {
+                                    "index": 0,
+                                    "size": 3,
+                                    "affected": 2,
+                                    "duration": 0.0042,
+                                    "error": None,
+                                }
+                            ],
+                        },
+                    },
+                }
+            }
+        },
+    },
+    "4xx": {
+        "description": "4xx Status code returned",
+        "content": {
+            "application/json": {
+                "examples": exceptions.api.ApiError._api_errors
+            }
+        },
+    },
+    500: {"description": "Internal server error"},
+}
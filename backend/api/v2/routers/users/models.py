@@ -15,6 +15,12 @@ class UserUpdate(pydantic.BaseModel):
     email: str
 
 
+class UserBatchUpdate(pydantic.BaseModel):
+    user_id: str
+    name: str | None = None
+    email: str | None = None
+
+
 class UsersPageResponse(pydantic.BaseModel):
     users: list[User]
     page: Page
@@ -1 +1,7 @@
-from .models import Page, Workspace, WorkspacesPageResponse, WorkspaceUpdate
+from .models import (
+    Page,
+    Workspace,
+    WorkspaceBatchUpdate,
+    WorkspacesPageResponse,
+    WorkspaceUpdate,
+)
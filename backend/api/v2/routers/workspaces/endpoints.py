@@ -1,13 +1,26 @@
 import typing
 
 import fastapi
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from backend import auth, exceptions
-from backend.database import PG_SESSION
+from backend.api.v2.routers.deadline import request_deadline
+from backend.api.v2.routers.export import ExportFormat, export_response
+from backend.api.v2.routers.fields import fields_query, parse_fields, project
+from backend.api.v2.routers.include import (
+    WorkspaceDetail,
+    include_query,
+    nest,
+    parse_include,
+)
+from backend.api.v2.routers.models import BulkResponse
+from backend.api.v2.routers.pagination import build_page, decode_cursor
+from backend.api.v2.routers.query_budget import query_budget
+from backend.database import PG_SESSION, PG_STREAM_SESSION
 
 from . import (
-    Page,
     Workspace,
+    WorkspaceBatchUpdate,
     WorkspacesPageResponse,
     WorkspaceUpdate,
 )
@@ -15,26 +28,73 @@ from . import (
 workspaces_router = auth.APIRouter(prefix="/workspaces", tags=["Workspaces"])
 if typing.TYPE_CHECKING:
     from backend.database import PostgresImplementation
+    from backend.database.models import BulkResult
+
+
+@workspaces_router.get(
+    "/export",
+    status_code=fastapi.status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    dependencies=[request_deadline(600)],
+)
+async def export_workspaces(
+    pg_db: "PostgresImplementation" = PG_STREAM_SESSION,
+    export_format: ExportFormat = fastapi.Query(  # noqa: B008
+        "ndjson",
+        alias="format",
+        description="`ndjson` (one JSON object per line) or `csv`",
+    ),
+) -> StreamingResponse:
+    """
+    Download all workspaces as one streamed file.
+    """
+    return export_response(
+        batches=pg_db.stream_records(place="workspaces"),
+        model=Workspace,
+        export_format=export_format,
+        filename="workspaces",
+    )
 
 
 @workspaces_router.get(
     "/{workspace_id}",
     status_code=fastapi.status.HTTP_200_OK,
     # responses=examples.response.workspaces_get_workspace,
+    dependencies=[query_budget(2)],
 )
 async def get_workspace(
     pg_db: "PostgresImplementation" = PG_SESSION,
     workspace_id: str = fastapi.Path(..., example="1"),
+    fields: str | None = fields_query(Workspace),
+    include: str | None = include_query(WorkspaceDetail),
 ) -> Workspace:
+    """
+    Fetch one workspace, `fields` limits returned fields,
+    `include=owner` embeds owning user.
+    """
+    columns = parse_fields(fields=fields, model=Workspace)
+    relations = parse_include(
+        include=include, model=WorkspaceDetail, fields=columns
+    )
     result: Workspace = await pg_db.get_record(
         key="workspace_id",
         value=workspace_id,
         place="workspaces",
+        columns=columns,
+        include=relations,
     )
     if not result:
         raise exceptions.api.NotFoundError(
             f"Workspace: {workspace_id} not found"
         )
+    if relations:
+        return ORJSONResponse(
+            nest(records=[result], model=WorkspaceDetail, include=relations)[0]
+        )
+    if columns:
+        return ORJSONResponse(
+            project(records=[result], model=Workspace, fields=columns)[0]
+        )
     return result
 
 
@@ -42,6 +102,7 @@ async def get_workspace(
     "/",
     status_code=fastapi.status.HTTP_200_OK,
     # responses=examples.response.workspaces_get_many_workspaces,
+    dependencies=[query_budget(4)],
 )
 async def get_many_workspaces(
     pg_db: "PostgresImplementation" = PG_SESSION,
@@ -56,36 +117,82 @@ async def get_many_workspaces(
         le=100,
         description="Number of results per page_num",
     ),
+    cursor: str | None = fastapi.Query(
+        None,
+        description="Cursor from `next_page`, takes precedence over page_num",
+    ),
+    fields: str | None = fields_query(Workspace),
+    include: str | None = include_query(WorkspaceDetail),
     request: fastapi.Request = None,
 ) -> WorkspacesPageResponse:
     """
-    Fetch paginated list of workspaces.
+    Fetch paginated list of workspaces, `fields` limits returned fields.
+    `include=owner` embeds owners with one extra query for whole page.
     """
+    columns = parse_fields(fields=fields, model=Workspace)
+    relations = parse_include(
+        include=include, model=WorkspaceDetail, fields=columns
+    )
     workspaces: list[Workspace] = await pg_db.get_many_records(
         page_num=page_num,
         page_size=page_size,
         place="workspaces",
+        after=decode_cursor(cursor=cursor) if cursor else None,
+        columns=columns,
+        include=relations,
     )
-    # if not workspaces:
-    #     raise exceptions.api.NotFoundError("No workspaces found")
-
-    next_page = None
-    if len(workspaces) == page_size + 1:
-        # Check if next page is available.
-        # `get_many_records` returns page_size + 1
-        base_url = str(request.url_for("get_many_workspaces"))
-        next_page = f"{base_url}?page={page_num+1}&page_size={page_size}"
-        workspaces = workspaces[:-1]
-
-    page: Page = Page(
+    total = await pg_db.count_records(place="workspaces")
+    workspaces, page = build_page(
+        records=workspaces,
         page_num=page_num,
         page_size=page_size,
-        total_items=len(workspaces),
-        next_page=next_page,
+        request=request,
+        route_name="get_many_workspaces",
+        total=total,
     )
+    if relations:
+        return ORJSONResponse(
+            {
+                "workspaces": nest(
+                    records=workspaces,
+                    model=WorkspaceDetail,
+                    include=relations,
+                ),
+                "page": page.model_dump(mode="json"),
+            }
+        )
+    if columns:
+        return ORJSONResponse(
+            {
+                "workspaces": project(
+                    records=workspaces, model=Workspace, fields=columns
+                ),
+                "page": page.model_dump(mode="json"),
+            }
+        )
     return WorkspacesPageResponse(workspaces=workspaces, page=page)
 
 
+@workspaces_router.patch("/", status_code=fastapi.status.HTTP_200_OK)
+async def update_many_workspaces(
+    pg_db: "PostgresImplementation" = PG_SESSION,
+    workspaces: list[WorkspaceBatchUpdate] = fastapi.Body(  # noqa: B008
+        ...,
+        min_length=1,
+        max_length=100_000,
+    ),
+) -> BulkResponse:
+    """
+    Update many workspaces at once. Only fields that are sent get updated.
+    Workspaces that were not found or failed to update are in `failed`.
+    """
+    result: BulkResult = await pg_db.update_many_records(
+        records=workspaces,
+        place="workspaces",
+    )
+    return BulkResponse(**result.model_dump(exclude={"records"}))
+
+
 @workspaces_router.patch(
     "/{workspace_id}", status_code=fastapi.status.HTTP_200_OK
 )
@@ -94,21 +201,16 @@ async def update_workspace(
     workspace_id: str = fastapi.Path(..., example="workspace_1"),
     workspace: WorkspaceUpdate = fastapi.Body(...),  # noqa: B008
 ) -> Workspace:
-    existing_workspace: Workspace = await pg_db.get_record(
+    updated_workspace: Workspace = await pg_db.patch_record(
+        place="workspaces",
         key="workspace_id",
         value=workspace_id,
-        place="workspaces",
+        changes=workspace,
     )
-    if not existing_workspace:
+    if not updated_workspace:
         raise exceptions.api.NotFoundError(
             f"Workspace: {workspace_id} not found"
         )
-    existing_workspace.name = workspace.name
-    existing_workspace.email = workspace.email
-    updated_workspace = await pg_db.update_record(
-        data=existing_workspace,
-        place="workspaces",
-    )
     return updated_workspace
 
 
@@ -144,6 +246,6 @@ async def create_workspace(
 ) -> Workspace:
     new_workspace: Workspace = await pg_db.add_record(
         place="workspaces",
-        record=workspace,
+        data=workspace,
     )
     return new_workspace
@@ -15,6 +15,12 @@ class WorkspaceUpdate(pydantic.BaseModel):
     user_id: str
 
 
+class WorkspaceBatchUpdate(pydantic.BaseModel):
+    workspace_id: str
+    name: str | None = None
+    user_id: str | None = None
+
+
 class WorkspacesPageResponse(pydantic.BaseModel):
     workspaces: list[Workspace]
     page: Page
@@ -1,5 +1,13 @@
 from .file_storage.file_storage_implementation import FileStorageImplementation
-from .interface import FS_SESSION, MONGO_SESSION, PG_SESSION, DatabaseInterface
+from .interface import (
+    FS_SESSION,
+    MONGO_SESSION,
+    PG_RO_SESSION,
+    PG_RW_SESSION,
+    PG_SESSION,
+    PG_STREAM_SESSION,
+    DatabaseInterface,
+)
 from .mock.mock_implementation import MockImplementation
 from .mongo.mongo_implementation import MongoImplementation
 from .postgres.postgres_implementation import PostgresImplementation
@@ -1,3 +1,5 @@
+import typing
+
 import pydantic_settings
 
 
@@ -10,6 +12,71 @@ class PostgresConfig(pydantic_settings.BaseSettings):
     SYNC_DRIVER: str = "postgresql+psycopg2"
     ASYNC_DRIVER: str = "postgresql+asyncpg"
 
+    # create missing tables on startup, see postgres.schema.init_schema
+    POSTGRES_INIT_SCHEMA: bool = True
+
+    # connection pool, one per process
+    POSTGRES_POOL_SIZE: int = 50
+    POSTGRES_POOL_MAX_OVERFLOW: int = 20
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_WARMUP: int = 5
+
+    # read replicas, full async URLs, e.g. postgresql+asyncpg://u:p@host/db
+    POSTGRES_REPLICA_URLS: list[str] = []
+    POSTGRES_REPLICA_STRATEGY: typing.Literal[
+        "least_connections", "round_robin"
+    ] = "least_connections"
+    POSTGRES_REPLICA_POOL_SIZE: int = 20
+    POSTGRES_REPLICA_COOLDOWN: float = 30.0
+    POSTGRES_READ_YOUR_WRITES_WINDOW: float = 5.0
+    # signs write marker cookie, must be the same in every process
+    POSTGRES_READ_YOUR_WRITES_SECRET: str = (
+        "735518e366c202923a9facda778cc55296f20794d6ddfc438fac7deb4084664b"
+    )
+
+    # bulk operations
+    POSTGRES_BULK_CHUNK_SIZE: int = 1_000
+    POSTGRES_BULK_COPY_THRESHOLD: int = 10_000
+    POSTGRES_BULK_COPY_CHUNK_SIZE: int = 50_000
+    POSTGRES_STREAM_BATCH_SIZE: int = 1_000
+
+    # in-process entity cache in front of get_record
+    POSTGRES_CACHE_ENABLED: bool = True
+    POSTGRES_CACHE_TTL: float = 30.0
+    POSTGRES_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    POSTGRES_CACHE_MAX_ITEMS: int = 10_000
+    # cross-process invalidation of entity cache over LISTEN/NOTIFY
+    POSTGRES_CACHE_CHANNEL: str = "entity_cache_invalidation"
+    POSTGRES_CACHE_LISTEN_RETRY: float = 1.0
+    POSTGRES_CACHE_LISTEN_KEEPALIVE: float = 30.0
+
+    # coalescing of concurrent get_record lookups into one IN (...) query
+    POSTGRES_COALESCE_READS: bool = True
+    POSTGRES_LOADER_MAX_BATCH_SIZE: int = 500
+
+    # per statement fingerprint latency histograms
+    POSTGRES_STATEMENT_STATS_MAX_SIZE: int = 1_000
+
+    # slow query log, sampled EXPLAIN (ANALYZE, BUFFERS) of slow SELECTs
+    POSTGRES_SLOW_QUERY_ENABLED: bool = True
+    POSTGRES_SLOW_QUERY_THRESHOLD: float = 0.5
+    POSTGRES_SLOW_QUERY_SAMPLE_RATE: float = 0.1
+    POSTGRES_SLOW_QUERY_MAX_ENTRIES: int = 500
+    POSTGRES_SLOW_QUERY_EXPLAIN_TIMEOUT: float = 5.0
+    POSTGRES_SLOW_QUERY_EXPLAIN_INTERVAL: float = 60.0
+
+    # pagination totals, COUNT(*) below threshold, planner estimate above
+    POSTGRES_COUNT_TTL: float = 30.0
+    POSTGRES_COUNT_EXACT_THRESHOLD: int = 100_000
+
+    # request deadline, applied as SET LOCAL statement_timeout, 0 disables
+    POSTGRES_REQUEST_TIMEOUT: float = 30.0
+
+    # per request statement counting, see query_context.QueryContext
+    POSTGRES_N_PLUS_ONE_THRESHOLD: int = 5
+
     # computed fields
     sync_url: str = "None"
     async_url: str = "None"
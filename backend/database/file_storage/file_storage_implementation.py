@@ -1,5 +1,6 @@
 import pathlib
 import typing
+from collections.abc import AsyncIterator
 
 from loguru import logger
 
@@ -128,6 +129,24 @@ class FileStorageImplementation(DatabaseInterface):
             files.append(file.name)
         return sorted(files, key=lambda f: f.lower())
 
+    async def stream_records(
+        self,
+        *,
+        batch_size: int = 100,
+    ) -> AsyncIterator[list[Record]]:
+        """Reads all files in the data folder, batch_size files at a time.
+
+        Yields:
+            list[Record]: Filenames with contents, sorted by filename.
+        """
+        logger.debug("Streaming records from File Storage")
+        files: list[FILE_NAME] = await self.list_records()
+        for start in range(0, len(files), batch_size):
+            yield [
+                await self.get_record(record=file)
+                for file in files[start : start + batch_size]
+            ]
+
     async def add_record(
         self,
         record: Record,
@@ -276,6 +295,20 @@ class FileStorageImplementation(DatabaseInterface):
             results[result.filename] = result.content
         return results
 
+    async def upsert_many_records(
+        self,
+        records: list[Record],
+    ) -> dict[FILE_NAME, bool]:
+        """Writes files whether they exist or not, filename is the key.
+
+        Args:
+            records (list[Record]): List of records to write.
+        Returns:
+            Dict of filename and content as boolean state of writing.
+        """
+        logger.debug("Upserting many files in File Storage")
+        return await self.add_many_records(records=records, overwrite=True)
+
     async def delete_record(
         self,
         record: FILE_NAME,
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import abc
+import time
 import typing
-from collections.abc import AsyncGenerator, Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
 from typing import ClassVar, Literal, overload
 
-from fastapi import Depends
+from fastapi import Depends, Request
 
 if typing.TYPE_CHECKING:
     from backend.database import (
@@ -26,6 +27,9 @@ PG_TYPE = Callable[..., AsyncGenerator["PostgresImplementation"]]
 MONGO_TYPE = Callable[..., AsyncGenerator["MongoImplementation"]]
 MOCK_TYPE = Callable[..., AsyncGenerator["MockImplementation"]]
 FS_TYPE = Callable[..., AsyncGenerator["FileStorageImplementation"]]
+READ_ONLY_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+# Client's marker of its last committed write, see http middleware
+WRITE_MARKER_COOKIE: str = "db_last_write"
 
 
 class DatabaseInterface(abc.ABC):
@@ -46,7 +50,6 @@ class DatabaseInterface(abc.ABC):
         if "session_factory" not in cls.__dict__:
             raise NotImplementedError(f"'session_factory' {msg}")
         cls._registry[cls.database_name.lower()] = cls
-        cls.init_db()
         cls.sessions[cls.database_name.lower()] = typing.Annotated[
             f"{cls.database_name}Implementation",
             Depends(DatabaseInterface.get_db_impl(db_name=cls.database_name)),
@@ -58,42 +61,101 @@ class DatabaseInterface(abc.ABC):
 
     @staticmethod
     @overload
-    def get_db_impl(*, db_name: Literal["Postgres"]) -> PG_TYPE: ...
+    def get_db_impl(
+        *, db_name: Literal["Postgres"], read_only: bool | None = None
+    ) -> PG_TYPE: ...
 
     @staticmethod
     @overload
-    def get_db_impl(*, db_name: Literal["Mongo"]) -> MONGO_TYPE: ...
+    def get_db_impl(
+        *, db_name: Literal["Mongo"], read_only: bool | None = None
+    ) -> MONGO_TYPE: ...
 
     @staticmethod
     @overload
-    def get_db_impl(*, db_name: Literal["Mock"]) -> MOCK_TYPE: ...
+    def get_db_impl(
+        *, db_name: Literal["Mock"], read_only: bool | None = None
+    ) -> MOCK_TYPE: ...
 
     @staticmethod
     @overload
-    def get_db_impl(*, db_name: Literal["FileStorage"]) -> FS_TYPE: ...
+    def get_db_impl(
+        *, db_name: Literal["FileStorage"], read_only: bool | None = None
+    ) -> FS_TYPE: ...
 
     @classmethod
-    def get_db_impl(cls, *, db_name: str) -> ABC_TYPE:
-        async def get_db() -> AsyncGenerator[DatabaseInterface]:
+    def get_db_impl(
+        cls,
+        *,
+        db_name: str,
+        read_only: bool | None = None,
+    ) -> ABC_TYPE:
+        """
+        Builds FastAPI dependency yielding implementation with open session.
+        read_only=None picks read-only session for GET/HEAD/OPTIONS routes,
+            True/False forces one flavor regardless of HTTP method.
+        Time of a committed write goes to `request.state.last_write`,
+            http middleware hands it to the client as WRITE_MARKER_COOKIE.
+        """
+
+        async def get_db(
+            request: Request,
+        ) -> AsyncGenerator[DatabaseInterface]:
             db = cls._registry[db_name.lower()]
-            async with db.session_factory() as session:
+            session_read_only = read_only
+            if session_read_only is None:
+                session_read_only = request.method in READ_ONLY_METHODS
+
+            def wrote() -> None:
+                request.state.last_write = time.time()
+
+            async with db.open_session(
+                read_only=session_read_only,
+                last_write=request.cookies.get(WRITE_MARKER_COOKIE),
+                on_write_commit=wrote,
+            ) as session:
                 yield db(session=session)
 
         return get_db
 
+    @classmethod
+    def open_session(
+        cls,
+        *,
+        read_only: bool = False,
+        last_write: str | None = None,
+        on_write_commit: Callable[[], None] | None = None,
+    ):
+        """
+        Returns session context manager of the implementation.
+        Databases without read-only sessions ignore read_only.
+        last_write is client's WRITE_MARKER_COOKIE, if any,
+            on_write_commit is to be called after committing a write.
+        Databases without replicas ignore both.
+        """
+        return cls.session_factory()
+
     @classmethod
     def get_session(cls, *, db_name: str) -> ABC_TYPE:
         return cls.sessions[db_name.lower()]
 
     @classmethod  # noqa: B027
-    def init_db(cls):
+    async def init_db(cls) -> None:
         """
         Initialize a database:
         - Create all tables/collections defined if they don't exist.
         - If not applicable, don't create an implementation for init_db.
+        Called once on application startup, never at import,
+            so importing needs no running database.
         """
         pass
 
+    @classmethod
+    async def init_all(cls) -> None:
+        """Runs init_db of every registered implementation."""
+        for db in cls._registry.values():
+            await db.init_db()
+
     @abc.abstractmethod
     def get_record(
         self,
@@ -118,6 +180,18 @@ class DatabaseInterface(abc.ABC):
         There is a risk of mistake while function call.
         """
 
+    @abc.abstractmethod
+    def stream_records(
+        self,
+        place: str,
+        batch_size: int,
+    ) -> AsyncIterator[list]:
+        """Async generator walking every record of a place in batches.
+        Meant for exports and jobs going through whole tables.
+        Implementation must not materialize all records at once,
+            memory use should depend only on batch_size.
+        """
+
     # @abc.abstractmethod
     # def list_records(
     #     self,
@@ -140,7 +214,7 @@ class DatabaseInterface(abc.ABC):
     @abc.abstractmethod
     def add_many_records(
         self,
-        data: list[typing.Any],
+        records: list[typing.Any],
         place: str,
     ):
         """Need to be separate from add_record.
@@ -162,7 +236,7 @@ class DatabaseInterface(abc.ABC):
     @abc.abstractmethod
     def update_many_records(
         self,
-        data: list[typing.Any],
+        records: list[typing.Any],
         place: str,
     ):
         """Need to be separate from add_record.
@@ -173,6 +247,21 @@ class DatabaseInterface(abc.ABC):
         There is a risk of mistake while function call.
         """
 
+    @abc.abstractmethod
+    def upsert_many_records(
+        self,
+        records: list[typing.Any],
+        place: str,
+        conflict_key: str | None = None,
+    ):
+        """Adds records that don't exist yet, updates the ones that do.
+        Existence is decided by conflict_key, a unique column.
+        Meant for sync jobs re-sending records that may or may not exist,
+            instead of get_record then add_record/update_record per record.
+        If db supports native upsert, please implement.
+        If db doesn't support it, please implement for loop get/add/update.
+        """
+
     @abc.abstractmethod
     def delete_record(
         self,
@@ -197,6 +286,24 @@ class DatabaseInterface(abc.ABC):
         """
 
 
-PG_SESSION = Depends(DatabaseInterface.get_db_impl(db_name="Postgres"))
+# Postgres sessions end right after the route function returns,
+# so pool connection is not held while response is being sent.
+PG_SESSION = Depends(
+    DatabaseInterface.get_db_impl(db_name="Postgres"),
+    scope="function",
+)
+PG_RO_SESSION = Depends(
+    DatabaseInterface.get_db_impl(db_name="Postgres", read_only=True),
+    scope="function",
+)
+PG_RW_SESSION = Depends(
+    DatabaseInterface.get_db_impl(db_name="Postgres", read_only=False),
+    scope="function",
+)
+# For StreamingResponse reading from DB while response is being sent.
+PG_STREAM_SESSION = Depends(
+    DatabaseInterface.get_db_impl(db_name="Postgres", read_only=True),
+    scope="request",
+)
 MONGO_SESSION = Depends(DatabaseInterface.get_db_impl(db_name="Mongo"))
 FS_SESSION = Depends(DatabaseInterface.get_db_impl(db_name="FileStorage"))
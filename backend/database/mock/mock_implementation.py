@@ -1,4 +1,5 @@
 import typing
+from collections.abc import AsyncIterator
 
 from loguru import logger
 
@@ -38,6 +39,15 @@ class MockImplementation(DatabaseInterface):
         logger.debug("Getting many records from Mock Database")
         return list(books.values())
 
+    async def stream_records(
+        self,
+        batch_size: int = 100,
+    ) -> AsyncIterator[list[dict]]:
+        logger.debug("Streaming records from Mock Database")
+        records = list(books.values())
+        for start in range(0, len(records), batch_size):
+            yield records[start : start + batch_size]
+
     async def add_record(self, record: typing.Any) -> str:
         logger.debug("Adding record to Mock Database")
         msg: str = "Adding record to Mock Database"
@@ -73,6 +83,11 @@ class MockImplementation(DatabaseInterface):
         logger.debug(msg)
         return msg
 
+    async def upsert_many_records(self, records: list[typing.Any]) -> str:
+        msg: str = "Upserting many records in Mock Database"
+        logger.debug(msg)
+        return msg
+
     async def delete_record(self, record_id: int) -> None:
         logger.debug("Deleting record in Mock Database")
         book = books.get(record_id, None)
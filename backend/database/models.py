@@ -0,0 +1,34 @@
+import typing
+
+import pydantic
+
+
+class ChunkReport(pydantic.BaseModel):
+    """Outcome of a single chunk of a bulk operation."""
+
+    index: int
+    size: int
+    affected: int = 0
+    duration: float = 0.0
+    error: str | None = None
+
+
+class BulkResult(pydantic.BaseModel):
+    """Outcome of a bulk operation.
+    records: rows returned by the database, empty when not available (COPY).
+    affected: number of rows written or removed across all chunks.
+    inserted, updated: split of affected rows for upserts.
+    failed: keys of records that were not applied.
+    unchanged: keys of records that had nothing to update.
+    invalid: positions of records missing the key.
+    chunks: per-chunk sizes and timings.
+    """
+
+    records: list[typing.Any] = []
+    affected: int = 0
+    inserted: int = 0
+    updated: int = 0
+    failed: list[str] = []
+    unchanged: list[str] = []
+    invalid: list[int] = []
+    chunks: list[ChunkReport] = []
@@ -1,4 +1,5 @@
 import typing
+from collections.abc import AsyncIterator
 
 from loguru import logger
 
@@ -30,6 +31,11 @@ class MongoImplementation(DatabaseInterface):
         logger.debug(msg)
         return msg
 
+    async def stream_records(self) -> AsyncIterator[list[str]]:
+        msg: str = "Streaming records from Mongo"
+        logger.debug(msg)
+        yield [msg]
+
     async def add_record(self, record: typing.Any) -> str:
         msg: str = "Adding record to Mongo"
         logger.debug(msg)
@@ -64,6 +70,11 @@ class MongoImplementation(DatabaseInterface):
         logger.debug(msg)
         return msg
 
+    async def upsert_many_records(self, records: list[typing.Any]) -> str:
+        msg: str = "Upserting many records in Mongo"
+        logger.debug(msg)
+        return msg
+
     async def delete_record(self, record: typing.Any):
         msg: str = "Deleting record from Mongo"
         logger.debug(msg)
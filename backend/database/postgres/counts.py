@@ -0,0 +1,111 @@
+import dataclasses
+import time
+
+from loguru import logger
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.config import pg_config
+from backend.database.postgres.models import dependents, tables
+
+
+@dataclasses.dataclass
+class Count:
+    value: int
+    is_estimate: bool
+    expires_at: float
+
+
+class CountService:
+    """
+    Row counts of whole tables for pagination totals, cached per place.
+    Planner estimate `pg_class.reltuples` costs nothing but is only
+        as fresh as last ANALYZE, tables estimated below
+        `exact_threshold` rows are counted exactly with COUNT(*).
+    Writes of this process `bump` cached counts, so totals follow them
+        without a new query. Writes of other processes and rolled back
+        ones are corrected when entry expires after `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        exact_threshold: int,
+        dependents: dict[str, tuple[str, ...]],
+    ) -> None:
+        self.ttl = ttl
+        self.exact_threshold = exact_threshold
+        self._dependents = dependents
+        self._counts: dict[str, Count] = {}
+        self.hits: int = 0
+        self.estimated: int = 0
+        self.counted: int = 0
+
+    async def count(self, session: AsyncSession, place: str) -> Count:
+        cached = self._counts.get(place)
+        if cached is not None and cached.expires_at > time.monotonic():
+            self.hits += 1
+            return cached
+        table = tables[place]
+        estimate = await session.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table)"
+            ),
+            {"table": table.__tablename__},
+        )
+        # -1 means never analyzed, no estimate yet
+        if estimate is not None and estimate >= self.exact_threshold:
+            value, is_estimate = int(estimate), True
+            self.estimated += 1
+        else:
+            value = await session.scalar(
+                select(func.count()).select_from(table.__table__)
+            )
+            is_estimate = False
+            self.counted += 1
+        logger.opt(lazy=True).debug(
+            "Counted place:{place} {value} estimate:{estimate}",
+            place=lambda: place,
+            value=lambda: value,
+            estimate=lambda: is_estimate,
+        )
+        count = Count(
+            value=value,
+            is_estimate=is_estimate,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._counts[place] = count
+        return count
+
+    def bump(self, place: str, delta: int) -> None:
+        """Applies rows added (+) or removed (-) to cached count."""
+        cached = self._counts.get(place)
+        if cached is not None:
+            cached.value = max(cached.value + delta, 0)
+        if delta < 0:
+            # Cascading deletes remove an unknown number of children
+            for dependent in self._dependents.get(place, ()):
+                self._counts.pop(dependent, None)
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "estimated": self.estimated,
+            "counted": self.counted,
+            "places": {
+                place: {"value": c.value, "is_estimate": c.is_estimate}
+                for place, c in self._counts.items()
+            },
+        }
+
+
+count_service = CountService(
+    ttl=pg_config.POSTGRES_COUNT_TTL,
+    exact_threshold=pg_config.POSTGRES_COUNT_EXACT_THRESHOLD,
+    dependents=dependents,
+)
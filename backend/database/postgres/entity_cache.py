@@ -0,0 +1,191 @@
+import collections
+import dataclasses
+import time
+
+import orjson
+from loguru import logger
+
+from backend.database.config import pg_config
+from backend.database.postgres.models import dependents, natural_keys
+
+CACHE_KEY = tuple[str, str, str]  # place, column name, column value
+ENTRY_OVERHEAD: int = 200  # rough bytes of key, entry and dict structure
+
+
+@dataclasses.dataclass
+class _Entry:
+    row: dict
+    expires_at: float
+    size: int
+    aliases: tuple[CACHE_KEY, ...]
+
+
+class EntityCache:
+    """
+    In-process LRU + TTL cache of single rows read by `get_record`.
+    Keyed by (place, key, value) exactly like `get_record` arguments.
+    Rows are stored as plain dicts, never as session-bound ORM objects.
+
+    Every entry is also indexed by its alias columns (id and natural key),
+    so a write knowing only one of them evicts row cached under any key.
+    Invalidating by other column drops whole place, because we can't tell
+    which cached rows match it.
+    Size budget is counted in serialized bytes, LRU entries evicted first.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        max_bytes: int,
+        max_items: int,
+        alias_columns: dict[str, tuple[str, ...]],
+        dependents: dict[str, tuple[str, ...]],
+        enabled: bool = True,
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.enabled = enabled
+        self._alias_columns = alias_columns
+        self._dependents = dependents
+        self._entries: collections.OrderedDict[CACHE_KEY, _Entry] = (
+            collections.OrderedDict()
+        )
+        self._aliases: dict[CACHE_KEY, set[CACHE_KEY]] = {}
+        self.size_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+    def get(self, place: str, key: str, value: str) -> dict | None:
+        if not self.enabled:
+            return None
+        cache_key: CACHE_KEY = (place, key, str(value))
+        entry = self._entries.get(cache_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at < time.monotonic():
+            self._drop(cache_key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(cache_key)
+        self.hits += 1
+        return entry.row
+
+    def set(self, place: str, key: str, value: str, row: dict) -> None:
+        if not self.enabled:
+            return
+        cache_key: CACHE_KEY = (place, key, str(value))
+        size: int = len(orjson.dumps(row, default=str)) + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        self._drop(cache_key)
+        aliases = tuple(
+            (place, column, str(row[column]))
+            for column in self._alias_columns.get(place, ())
+            if row.get(column) is not None
+        )
+        self._entries[cache_key] = _Entry(
+            row=row,
+            expires_at=time.monotonic() + self.ttl,
+            size=size,
+            aliases=aliases,
+        )
+        self.size_bytes += size
+        for alias in aliases:
+            self._aliases.setdefault(alias, set()).add(cache_key)
+        while self._entries and (
+            self.size_bytes > self.max_bytes
+            or len(self._entries) > self.max_items
+        ):
+            oldest, _ = next(iter(self._entries.items()))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate(
+        self,
+        place: str,
+        key: str,
+        value: str,
+        cascade: bool = False,
+    ) -> None:
+        """
+        Evicts every entry of a row identified by key and value.
+        With cascade=True places referencing this one by foreign key
+            are dropped too, as their rows could have been cascade deleted.
+        """
+        if cascade:
+            self.invalidate_dependents(place)
+        if key not in self._alias_columns.get(place, ()):
+            self.invalidate_place(place)
+            return
+        cache_key: CACHE_KEY = (place, key, str(value))
+        for aliased in self._aliases.get(cache_key, set()).copy():
+            self._drop(aliased)
+            self.invalidations += 1
+        if cache_key in self._entries:
+            self._drop(cache_key)
+            self.invalidations += 1
+
+    def invalidate_place(self, place: str) -> None:
+        for cache_key in [k for k in self._entries if k[0] == place]:
+            self._drop(cache_key)
+            self.invalidations += 1
+
+    def invalidate_dependents(self, place: str) -> None:
+        """Drops places referencing given place by foreign key."""
+        for dependent in self._dependents.get(place, ()):
+            self.invalidate_place(dependent)
+
+    def clear(self) -> None:
+        logger.debug("Clearing Postgres entity cache")
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._aliases.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict:
+        lookups: int = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "items": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _drop(self, cache_key: CACHE_KEY) -> None:
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        self.size_bytes -= entry.size
+        for alias in entry.aliases:
+            keys = self._aliases.get(alias)
+            if keys is None:
+                continue
+            keys.discard(cache_key)
+            if not keys:
+                del self._aliases[alias]
+
+
+entity_cache = EntityCache(
+    ttl=pg_config.POSTGRES_CACHE_TTL,
+    max_bytes=pg_config.POSTGRES_CACHE_MAX_BYTES,
+    max_items=pg_config.POSTGRES_CACHE_MAX_ITEMS,
+    alias_columns={
+        place: ("id", natural_key)
+        for place, natural_key in natural_keys.items()
+    },
+    dependents=dependents,
+    enabled=pg_config.POSTGRES_CACHE_ENABLED,
+)
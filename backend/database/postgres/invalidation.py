@@ -0,0 +1,196 @@
+import asyncio
+import collections
+import contextlib
+
+import asyncpg
+import orjson
+from loguru import logger
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.config import pg_config
+from backend.database.postgres.entity_cache import entity_cache
+
+# place, key, value, cascade
+INVALIDATION = tuple[str, str | None, str | None, bool]
+PAYLOAD_LIMIT: int = 7_900  # NOTIFY payload must be shorter than 8000 bytes
+PLACE_WIDE_AFTER: int = 1_000  # more keys of one place drop the whole place
+
+
+def invalidate(
+    session: AsyncSession,
+    place: str,
+    key: str,
+    value: str,
+    cascade: bool = False,
+) -> None:
+    """
+    Evicts row from local entity cache right away and queues the same
+        eviction for every other process, NOTIFYed on session commit.
+    """
+    entity_cache.invalidate(place, key, value, cascade=cascade)
+    _queue(session, (place, key, str(value), cascade))
+
+
+def invalidate_dependents(session: AsyncSession, place: str) -> None:
+    entity_cache.invalidate_dependents(place)
+    _queue(session, (place, None, None, True))
+
+
+def _queue(session: AsyncSession, entry: INVALIDATION) -> None:
+    if not entity_cache.enabled:
+        return
+    session.info.setdefault("invalidations", set()).add(entry)
+
+
+def payloads(entries: set[INVALIDATION]) -> list[str]:
+    """
+    Packs invalidations into as few NOTIFY payloads as fit the size limit.
+    Places with more than PLACE_WIDE_AFTER keys are silently collapsed
+        into one `(place, "", "", cascade)` entry, cascade set if any of
+        its entries had it. Empty key is no alias column, so
+        `EntityCache.invalidate` drops every cached row of that place,
+        including rows that were not written.
+    """
+    per_place = collections.Counter(entry[0] for entry in entries)
+    crowded = {p for p, count in per_place.items() if count > PLACE_WIDE_AFTER}
+    entries = {entry for entry in entries if entry[0] not in crowded} | {
+        (place, "", "", any(e[3] for e in entries if e[0] == place))
+        for place in crowded
+    }
+    result: list[str] = []
+    chunk: list[bytes] = []
+    size = 2  # brackets of JSON array
+    for entry in sorted(entries, key=str):
+        encoded = orjson.dumps(entry)
+        if chunk and size + len(encoded) + 1 > PAYLOAD_LIMIT:
+            result.append(f"[{b','.join(chunk).decode()}]")
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded) + 1
+    if chunk:
+        result.append(f"[{b','.join(chunk).decode()}]")
+    return result
+
+
+async def notify(session: AsyncSession, entries: set[INVALIDATION]) -> None:
+    """
+    NOTIFY is queued by Postgres until commit and dropped on rollback,
+        so other processes only hear about writes that really happened.
+    """
+    for payload in payloads(entries):
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": pg_config.POSTGRES_CACHE_CHANNEL, "payload": payload},
+        )
+    logger.opt(lazy=True).debug(
+        "Notified {count} cache invalidations", count=lambda: len(entries)
+    )
+
+
+def apply(payload: str) -> None:
+    for place, key, value, cascade in orjson.loads(payload):
+        if key is None:
+            entity_cache.invalidate_dependents(place)
+        else:
+            entity_cache.invalidate(place, key, value, cascade=cascade)
+
+
+class InvalidationListener:
+    """
+    LISTENs for invalidations NOTIFYed by every process
+        and applies them to entity cache of this one.
+    Holds one dedicated asyncpg connection to primary outside the pool,
+        LISTEN needs a connection that stays open and is never handed out.
+    While not listening, writes of other processes go unnoticed,
+        so cache is cleared whenever listening starts or stops.
+    Own notifications come back too, evicting again rows that concurrent
+        requests of this process re-read before the write committed.
+    """
+
+    def __init__(
+        self,
+        *,
+        channel: str,
+        retry_interval: float,
+        keepalive: float,
+    ) -> None:
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self.keepalive = keepalive
+        self._task: asyncio.Task | None = None
+        self.listening: bool = False
+        self.received: int = 0
+        self.reconnects: int = 0
+
+    def start(self) -> None:
+        if not entity_cache.enabled:
+            return
+        logger.info(f"Listening for cache invalidations on {self.channel}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except Exception as exc_info:
+                logger.warning(f"Cache invalidation LISTEN lost: {exc_info!r}")
+            entity_cache.clear()
+            self.reconnects += 1
+            await asyncio.sleep(self.retry_interval)
+
+    async def _listen(self) -> None:
+        dsn = (
+            make_url(pg_config.async_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        connection: asyncpg.Connection = await asyncpg.connect(
+            dsn, timeout=self.keepalive
+        )
+        lost = asyncio.Event()
+        try:
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(self.channel, self._on_notify)
+            entity_cache.clear()
+            self.listening = True
+            while True:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(lost.wait(), timeout=self.keepalive)
+                if lost.is_set():
+                    raise ConnectionError("LISTEN connection closed")
+                # Half-open TCP connection would otherwise wait forever
+                await connection.execute("SELECT 1", timeout=self.keepalive)
+        finally:
+            self.listening = False
+            connection.terminate()
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        try:
+            apply(payload)
+        except (ValueError, TypeError) as exc_info:
+            logger.error(f"Bad cache invalidation {payload!r}: {exc_info!r}")
+            return
+        self.received += 1
+
+    def stats(self) -> dict:
+        return {
+            "listening": self.listening,
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+
+invalidation_listener = InvalidationListener(
+    channel=pg_config.POSTGRES_CACHE_CHANNEL,
+    retry_interval=pg_config.POSTGRES_CACHE_LISTEN_RETRY,
+    keepalive=pg_config.POSTGRES_CACHE_LISTEN_KEEPALIVE,
+)
@@ -1,3 +1,6 @@
+import datetime
+
+from sqlalchemy import DateTime, Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -9,13 +12,17 @@ class User(SQLModel, table=True):
     name: str = Field(index=True)
     email: str = Field(index=True)
 
+    # Children are removed by ondelete="CASCADE" foreign keys.
+    # passive_deletes keeps ORM from loading them just to delete them.
     workspaces: list["Workspace"] = Relationship(
         back_populates="owner",
-        cascade_delete=True,  # for python cascade delete
+        cascade_delete=True,
+        passive_deletes=True,
     )
     files: list["File"] = Relationship(
         back_populates="owner",
-        cascade_delete=True,  # for python cascade delete
+        cascade_delete=True,
+        passive_deletes=True,
     )
 
 
@@ -44,12 +51,71 @@ class File(SQLModel, table=True):
     owner: User | None = Relationship(back_populates="files")
 
 
+class Outbox(SQLModel, table=True):
+    """
+    RabbitMQ messages written in the transaction that caused them,
+        published later by `backend.rabbit.outbox.OutboxRelay`.
+    Pending rows have no `sent_at`, partial index keeps finding them cheap
+        however many sent rows wait for retention cleanup.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index(
+            "ix_outbox_pending", "id", postgresql_where=text("sent_at IS NULL")
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    message_id: str = Field(index=True, unique=True)
+    type: str
+    routing_key: str
+    body: str
+    correlation_id: str | None = None
+    created_at: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.UTC),
+        sa_type=DateTime(timezone=True),
+    )
+    sent_at: datetime.datetime | None = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+    )
+
+
 tables: dict[str, type[SQLModel]] = {
     "users": User,
     "workspaces": Workspace,
     "files": File,
+    "outbox": Outbox,
+}
+
+# Unique business key of every table, used by bulk operations.
+natural_keys: dict[str, str] = {
+    "users": "user_id",
+    "workspaces": "workspace_id",
+    "files": "file_id",
+    "outbox": "message_id",
 }
 
+
+def _dependents() -> dict[str, tuple[str, ...]]:
+    """Places that hold foreign keys to a given place."""
+    result: dict[str, tuple[str, ...]] = {}
+    for place, table in tables.items():
+        result[place] = tuple(
+            other
+            for other, other_table in tables.items()
+            if any(
+                fk.column.table is table.__table__
+                for fk in other_table.__table__.foreign_keys
+            )
+        )
+    return result
+
+
+# Places holding foreign keys to a place, their rows go with its rows.
+dependents: dict[str, tuple[str, ...]] = _dependents()
+
 if __name__ == "__main__":
     # need to comment out postgres implementation in init
     from sqlmodel import Session, create_engine
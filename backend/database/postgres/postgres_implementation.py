@@ -1,14 +1,47 @@
 import typing
+from collections.abc import AsyncIterator, Callable
 
+import pydantic
 from loguru import logger
+from sqlalchemy import (
+    Boolean,
+    any_,
+    bindparam,
+    column,
+    exc,
+    insert,
+    literal_column,
+    or_,
+    update,
+    values,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import SQLModel, create_engine, delete, select
+from sqlalchemy.orm import make_transient_to_detached, selectinload
+from sqlalchemy.orm.util import identity_key
+from sqlmodel import SQLModel, delete, select
 
 from backend import exceptions
 from backend.database.config import pg_config
 from backend.database.interface import DatabaseInterface
+from backend.database.models import BulkResult, ChunkReport
 from backend.database.postgres import PostgresSessionManager
-from backend.database.postgres.models import tables
+from backend.database.postgres.counts import Count, count_service
+from backend.database.postgres.entity_cache import entity_cache
+from backend.database.postgres.invalidation import (
+    invalidate,
+    invalidate_dependents,
+)
+from backend.database.postgres.models import natural_keys, tables
+from backend.database.postgres.record_loader import record_loader
+from backend.database.postgres.replicas import (
+    is_statement_timeout,
+    replica_set,
+)
+from backend.database.postgres.schema import init_schema
+from backend.database.postgres.statements import statements
 
 COLUMN_NAME = str
 COLUMN_VALUE = str
@@ -16,6 +49,128 @@ COLUMN_VALUE = str
 T = typing.TypeVar("T", bound=SQLModel)
 
 
+def _group_changes(
+    *,
+    records: list[SQLModel | pydantic.BaseModel | dict],
+    key: str,
+    columns: set[str],
+) -> tuple[dict[tuple[str, ...], list[dict]], list[str], list[int]]:
+    """Prepares partial records for a set-based update.
+    Deduplicates on key, last change wins.
+    Groups by changed columns, one VALUES list needs the same columns per row.
+    Returns groups, keys of records that have nothing to update
+        and positions of records without key.
+    """
+    latest: dict[str, dict] = {}
+    invalid: list[int] = []
+    for position, record in enumerate(records):
+        if not isinstance(record, dict):
+            record = record.model_dump(exclude_unset=True)
+        if record.get(key) is None:
+            invalid.append(position)
+            continue
+        latest[str(record[key])] = record
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    unchanged: list[str] = []
+    for key_value, record in latest.items():
+        changed = tuple(sorted(c for c in record if c not in (key, "id")))
+        if unknown := set(changed) - columns:
+            raise exceptions.db.sql.DataError(
+                internal_message=f"Unknown columns {unknown} in update"
+            )
+        if not changed:
+            unchanged.append(key_value)
+            continue
+        groups.setdefault(changed, []).append(record)
+    return groups, unchanged, invalid
+
+
+def _projection(
+    table: type[SQLModel],
+    columns: typing.Sequence[str],
+) -> list:
+    """Table columns by name, `id` always first as cursors need it."""
+    core_columns = table.__table__.columns
+    if unknown := set(columns) - set(core_columns.keys()):
+        raise exceptions.db.sql.DataError(
+            internal_message=f"Unknown columns {unknown} in projection"
+        )
+    return [core_columns["id"]] + [
+        core_columns[name] for name in columns if name != "id"
+    ]
+
+
+def _eager_load(
+    table: type[SQLModel],
+    include: typing.Sequence[str],
+) -> list:
+    """selectinload of every included relationship.
+    Each costs one `SELECT ... WHERE fk IN (...)` for all parent rows,
+        so number of queries doesn't depend on number of rows.
+    """
+    relationships = sa_inspect(table).relationships
+    if unknown := set(include) - set(relationships.keys()):
+        raise exceptions.db.sql.InvalidRequestError(
+            internal_message=f"Unknown relationships {unknown} to include"
+        )
+    return [
+        selectinload(relationships[name].class_attribute) for name in include
+    ]
+
+
+def _validate_rows(
+    table: type[SQLModel],
+    records: list,
+    place: str,
+) -> list[dict]:
+    """Records as full table rows, `id` left out unless set."""
+    try:
+        rows: list[dict] = [
+            table.model_validate(record).model_dump() for record in records
+        ]
+    except pydantic.ValidationError as exc_info:
+        raise exceptions.db.sql.DataError(
+            internal_message=f"Invalid records for {place}: {exc_info}"
+        ) from exc_info
+    for row in rows:
+        if row.get("id") is None:
+            row.pop("id", None)
+    return rows
+
+
+def _upsert_statement(
+    table: type[SQLModel],
+    place: str,
+    conflict_key: str,
+):
+    """`INSERT ... ON CONFLICT DO UPDATE ... RETURNING` of whole rows.
+    Update is skipped for rows identical to stored ones.
+    """
+    core = table.__table__
+    key_column = core.columns.get(conflict_key)
+    if key_column is None or not (key_column.unique or key_column.primary_key):
+        raise exceptions.db.sql.InvalidRequestError(
+            internal_message=f"{place}.{conflict_key} is not unique"
+        )
+    statement = pg_insert(core)
+    changed = [
+        c.name for c in core.columns if c.name not in ("id", conflict_key)
+    ]
+    return statement.on_conflict_do_update(
+        index_elements=[key_column],
+        set_={name: statement.excluded[name] for name in changed},
+        where=or_(
+            *(
+                core.columns[name].is_distinct_from(statement.excluded[name])
+                for name in changed
+            )
+        ),
+    ).returning(
+        *core.columns,
+        literal_column("(xmax = 0)", Boolean).label("inserted"),
+    )
+
+
 class PostgresImplementation(DatabaseInterface):
     database_name = "Postgres"
     session_factory = PostgresSessionManager
@@ -23,12 +178,34 @@ class PostgresImplementation(DatabaseInterface):
     def __init__(self, *args, session: AsyncSession, **kwargs) -> None:
         self.session: AsyncSession = session
 
+    @classmethod
+    def open_session(
+        cls,
+        *,
+        read_only: bool = False,
+        last_write: str | None = None,
+        on_write_commit: Callable[[], None] | None = None,
+    ) -> PostgresSessionManager:
+        return PostgresSessionManager(
+            read_only=read_only,
+            last_write=last_write,
+            on_write_commit=on_write_commit,
+        )
+
     async def get_record(
         self,
         key: str,
         value: str,
         place: str,
+        columns: typing.Sequence[str] | None = None,
+        include: typing.Sequence[str] | None = None,
     ) -> T | False:
+        """With `columns` only those (and `id`) are selected,
+            result is then a read-only row, not an ORM object.
+        Cached record serves any columns, partial rows are never cached.
+        Only committed rows are cached, see `_can_cache`.
+        `include` relationships are loaded eagerly, bypassing the cache.
+        """
         logger.opt(lazy=True).debug(
             "Getting key:{key} value:{value} ," "place:{place}",
             key=lambda: key,
@@ -38,16 +215,93 @@ class PostgresImplementation(DatabaseInterface):
         table = tables.get(place, None)
         if table is None:
             return None
-        statement = select(table).where(getattr(table, key) == value)
-        results = await self.session.execute(statement)
+        lookup = statements.get(place, key)
+        if include:
+            results = await self.session.execute(
+                lookup.select.options(*_eager_load(table, include)),
+                {"value": value},
+            )
+            return results.scalars().first()
+        if (row := entity_cache.get(place, key, value)) is not None:
+            return self._attach(table=table, row=row)
+        if columns is not None:
+            statement = select(*_projection(table, columns)).where(
+                lookup.column == value
+            )
+            results = await self.session.execute(statement)
+            return results.first()
+        if self._can_coalesce():
+            row = await record_loader.load(place, key, value)
+            if row is None:
+                return None
+            # Loader reads on replica whenever there are any
+            if not replica_set.enabled:
+                entity_cache.set(place, key, value, row)
+            return self._attach(table=table, row=row)
+        results = await self.session.execute(lookup.select, {"value": value})
         result = results.scalars().first()
+        if result and self._can_cache():
+            entity_cache.set(place, key, value, result.model_dump())
         return result or None
 
+    def _can_cache(self) -> bool:
+        """Row read by this session may go to process-wide entity cache.
+        Not when read on a replica, a lagging one could put back a row
+            whose invalidation was already broadcast.
+        Not when session holds writes of its own, not committed yet,
+            a rollback would leave other requests served a row that
+            never existed.
+        """
+        if self.session.info.get("replica"):
+            return False
+        return self.session.info.get("read_only", False) or not (
+            self.session.info.get("writes")
+            or self.session.new
+            or self.session.dirty
+            or self.session.deleted
+        )
+
+    def _can_coalesce(self) -> bool:
+        """Lookup may be served by shared loader outside of this session.
+        Loader reads through its own read-only session, which may go
+            to a replica, so only read-only sessions use it.
+            Sessions that write stay on primary and see their own writes.
+        Sticky sessions (user wrote recently) skip it too.
+        Only safe when session holds no transaction or unflushed changes,
+            otherwise loader's own connection could miss our writes.
+        """
+        return (
+            pg_config.POSTGRES_COALESCE_READS
+            and self.session.info.get("read_only", False)
+            and not self.session.info.get("sticky")
+            and not self.session.in_transaction()
+            and not (self.session.new or self.session.dirty)
+            and not self.session.deleted
+        )
+
+    def _attach(self, table: type[T], row: dict) -> T:
+        """Turns a cached row into an ORM object owned by this session.
+        Object is attached as if it was just loaded, no SQL is emitted,
+        so changes on it are flushed as UPDATE like for a queried one.
+        """
+        existing = self.session.identity_map.get(
+            identity_key(table, row["id"])
+        )
+        if existing is not None:
+            return existing
+        instance = table.model_validate(row)
+        make_transient_to_detached(instance)
+        self.session.add(instance)
+        return instance
+
     async def get_many_records(
         self,
         page_num: int,
         page_size: int,
         place: str,
+        after: int | None = None,
+        columns: typing.Sequence[str] | None = None,
+        include: typing.Sequence[str] | None = None,
     ) -> list[T] | None:
         """Need to be separate from get_record.
         *This function returns requested page_size + 1*
@@ -59,72 +313,450 @@ class PostgresImplementation(DatabaseInterface):
         - If yes means next page is available.
         - If not means this is your last page.
         2. Trim last record in list if above page_size
+
+        Records are ordered by primary key `id`.
+        With `after` set, keyset mode is used: `WHERE id > after`,
+        cost of every page is the same no matter how deep it is.
+        Without it falls back to OFFSET mode based on page_num.
+        With `columns` only those (and `id`) are selected as plain rows.
+        `include` relationships are loaded eagerly, one query each.
         """
         logger.opt(lazy=True).debug(
-            "Getting place:{place}",
+            "Getting place:{place} after:{after}",
             place=lambda: place,
+            after=lambda: after,
         )
         table = tables.get(place, None)
         if table is None:
             return None
-        offset: int = (page_num - 1) * page_size
-        statement = select(table).offset(offset).limit(page_size + 1)
+        if columns is None:
+            statement = select(table)
+        else:
+            statement = select(*_projection(table, columns))
+        statement = statement.order_by(table.id).limit(page_size + 1)
+        if include:
+            statement = statement.options(*_eager_load(table, include))
+        if after is not None:
+            statement = statement.where(table.id > after)
+        else:
+            statement = statement.offset((page_num - 1) * page_size)
         results = await self.session.execute(statement)
-        results = results.scalars().all()
+        if columns is None:
+            results = results.scalars().all()
+        else:
+            results = results.all()
         return results or None
 
+    async def count_records(self, place: str) -> Count | None:
+        """Total rows of place, exact or estimated, see CountService."""
+        if place not in tables:
+            return None
+        return await count_service.count(self.session, place)
+
+    async def stream_records(
+        self,
+        place: str,
+        batch_size: int | None = None,
+    ) -> AsyncIterator[list[T]]:
+        """Walks whole table ordered by `id` through server-side cursor.
+        Rows are fetched and yielded batch_size at a time,
+            so memory stays flat no matter how big the table is.
+        Cursor lives in session's transaction, keep session open until
+            generator is exhausted or closed.
+        """
+        table = tables.get(place, None)
+        if table is None:
+            return
+        batch_size = batch_size or pg_config.POSTGRES_STREAM_BATCH_SIZE
+        logger.opt(lazy=True).debug(
+            "Streaming place:{place} in batches of {size}",
+            place=lambda: place,
+            size=lambda: batch_size,
+        )
+        statement = (
+            select(table)
+            .order_by(table.id)
+            .execution_options(yield_per=batch_size)
+        )
+        results = await self.session.stream_scalars(statement)
+        try:
+            async for partition in results.partitions():
+                yield partition
+        finally:
+            await results.close()
+
     async def add_record(
         self,
         data: T,
         place: str,
     ) -> T | None:
+        """Single `INSERT ... RETURNING` round-trip, then commit.
+        Returned record is built from RETURNING row and is not attached
+            to the session, so commit doesn't expire it and no refresh
+            SELECT is needed.
+        """
         table: type[SQLModel] = tables.get(place, None)
         if table is None:
             return None
-        db_record = table.model_validate(data)
         try:
-            self.session.add(db_record)
+            row: dict = table.model_validate(data).model_dump()
+        except pydantic.ValidationError as exc_info:
+            raise exceptions.db.sql.DataError(
+                internal_message=f"Invalid record for {place}: {exc_info}"
+            ) from exc_info
+        if row.get("id") is None:
+            row.pop("id", None)
+        statement = (
+            insert(table).values(row).returning(*table.__table__.columns)
+        )
+        try:
+            results = await self.session.execute(statement)
+            db_record = table.model_validate(results.mappings().one())
             await self.session.commit()
-            await self.session.refresh(db_record)
-        except Exception:
-            exc = exceptions.db.sql.AddRecordError
-            msg: str = f"Record: {data.model_dump()}"
-            raise exc(internal_message=f"{exc} {msg}") from exc
+        except exc.IntegrityError as exc_info:
+            raise exceptions.db.sql.AddRecordError(
+                internal_message=f"Record: {row} {exc_info}"
+            ) from exc_info
+        count_service.bump(place, 1)
         return db_record
 
     async def add_many_records(
         self,
         records: list[T],
         place: str,
-    ) -> str:
+        chunk_size: int | None = None,
+        use_copy: bool | None = None,
+    ) -> BulkResult | None:
         """Need to be separate from add_record.
         Some databases offer bulk operations.
         If db supports bulk add, please implement.
         If db doesn't support bulk add, please implement for loop add_record.
         Function name contains 'many' due to similarities with add_record.
         There is a risk of mistake while function call.
+
+        Records are validated against `tables[place]` up front,
+        then written in chunks of multi-row `INSERT ... RETURNING`.
+        Batches of POSTGRES_BULK_COPY_THRESHOLD or more go through COPY,
+        which is much faster but cannot return rows, ids are assigned by DB.
+        `use_copy` forces one path or the other.
         """
-        msg: str = "Adding many records to Postgres"
-        logger.debug(msg)
-        return msg
+        table: type[SQLModel] = tables.get(place, None)
+        if table is None:
+            return None
+        rows: list[dict] = _validate_rows(table, records, place)
+        if use_copy is None:
+            use_copy = len(rows) >= pg_config.POSTGRES_BULK_COPY_THRESHOLD
+        logger.opt(lazy=True).debug(
+            "Adding {n} records to place:{place} copy:{copy}",
+            n=lambda: len(rows),
+            place=lambda: place,
+            copy=lambda: use_copy,
+        )
+        if use_copy:
+            result = await self._copy_many_records(
+                rows=rows,
+                table=table,
+                chunk_size=chunk_size,
+            )
+            count_service.bump(place, result.affected)
+            return result
+        chunk_size = chunk_size or pg_config.POSTGRES_BULK_CHUNK_SIZE
+        result = BulkResult()
+        statement = insert(table).returning(
+            table,
+            sort_by_parameter_order=True,
+        )
+        for index, start in enumerate(range(0, len(rows), chunk_size)):
+            chunk = rows[start : start + chunk_size]
+            try:
+                async with self.session.measure(
+                    f"add_many_records[{place}:{index}]"
+                ) as measurement:
+                    inserted = await self.session.scalars(statement, chunk)
+                    inserted = inserted.all()
+            except exc.IntegrityError as exc_info:
+                raise exceptions.db.sql.AddRecordError(
+                    internal_message=f"Chunk {index} of {place}: {exc_info}"
+                ) from exc_info
+            result.records.extend(inserted)
+            result.affected += len(inserted)
+            result.chunks.append(
+                ChunkReport(
+                    index=index,
+                    size=len(chunk),
+                    affected=len(inserted),
+                    duration=measurement.duration,
+                )
+            )
+        count_service.bump(place, result.affected)
+        return result
+
+    async def _copy_many_records(
+        self,
+        rows: list[dict],
+        table: type[SQLModel],
+        chunk_size: int | None = None,
+    ) -> BulkResult:
+        """COPY fast path for add_many_records.
+        Uses asyncpg `copy_records_to_table` on the session's connection,
+        so it takes part in the same transaction as other session work.
+        Driver adapter sends BEGIN lazily on first statement, without one
+            run before, every COPY chunk would autocommit on its own.
+        """
+        chunk_size = chunk_size or pg_config.POSTGRES_BULK_COPY_CHUNK_SIZE
+        columns: list[str] = [
+            column.name
+            for column in table.__table__.columns
+            if column.name != "id"
+        ]
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not driver_connection.is_in_transaction():
+            # BEGIN through the adapter, so session commit/rollback end it
+            await connection.exec_driver_sql(
+                "SELECT 1", execution_options={"measure": False}
+            )
+        # COPY bypasses execute, read-your-writes must still see it
+        self.session.info["writes"] = True
+        result = BulkResult()
+        for index, start in enumerate(range(0, len(rows), chunk_size)):
+            chunk = rows[start : start + chunk_size]
+            records = [tuple(row.get(c) for c in columns) for row in chunk]
+            try:
+                async with self.session.measure(
+                    f"copy_many_records[{table.__tablename__}:{index}]"
+                ) as measurement:
+                    await driver_connection.copy_records_to_table(
+                        table.__tablename__,
+                        records=records,
+                        columns=columns,
+                    )
+            except exceptions.BaseCustomError:
+                raise
+            except Exception as exc_info:
+                if is_statement_timeout(exc_info):
+                    raise  # request deadline, see session manager __aexit__
+                raise exceptions.db.sql.AddRecordError(
+                    internal_message=(
+                        f"COPY chunk {index} of {table.__tablename__}: "
+                        f"{exc_info}"
+                    )
+                ) from exc_info
+            result.affected += len(chunk)
+            result.chunks.append(
+                ChunkReport(
+                    index=index,
+                    size=len(chunk),
+                    affected=len(chunk),
+                    duration=measurement.duration,
+                )
+            )
+        return result
 
     async def update_record(self, data: T, place: str) -> T:
         self.session.add(data)
+        invalidate(self.session, place, "id", data.id)
         await self.session.commit()
         await self.session.refresh(data)
         return data
 
-    async def update_many_records(self, data: list[T], place: str) -> str:
+    async def patch_record(
+        self,
+        place: str,
+        key: str,
+        value: str,
+        changes: pydantic.BaseModel | dict,
+    ) -> T | None:
+        """Partial update as a single `UPDATE ... RETURNING` round-trip.
+        Only fields set in `changes` are written, no prior SELECT.
+        Returns updated record detached from session,
+            None when no row matches key and value.
+        """
+        table: type[SQLModel] = tables.get(place, None)
+        if table is None:
+            return None
+        if not isinstance(changes, dict):
+            changes = changes.model_dump(exclude_unset=True)
+        changes = {k: v for k, v in changes.items() if k != "id"}
+        columns = table.__table__.columns
+        if unknown := set(changes) - set(columns.keys()):
+            raise exceptions.db.sql.DataError(
+                internal_message=f"Unknown columns {unknown} in update"
+            )
+        lookup = statements.get(place, key)
+        if not changes:
+            return await self.get_record(key=key, value=value, place=place)
+        statement = (
+            update(table)
+            .where(lookup.column == value)
+            .values(changes)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            results = await self.session.execute(statement)
+            row = results.mappings().first()
+            if row is not None:
+                invalidate(self.session, place, "id", row["id"])
+            await self.session.commit()
+        except exc.IntegrityError as exc_info:
+            raise exceptions.db.sql.IntegrityError(
+                internal_message=f"Patch {place} {key}={value}: {exc_info}"
+            ) from exc_info
+        if row is None:
+            return None
+        return table.model_validate(row)
+
+    async def update_many_records(
+        self,
+        records: list[T | dict],
+        place: str,
+        key: str | None = None,
+        chunk_size: int | None = None,
+    ) -> BulkResult | None:
         """Need to be separate from add_record.
         Some databases offer bulk operations.
         If db supports bulk add, please implement.
         If db doesn't support bulk add, please implement for loop add_record.
         Function name contains 'many' due to similarities with add_record.
         There is a risk of mistake while function call.
+
+        Set-based update, one statement per chunk:
+        `UPDATE t SET .. FROM (VALUES ..) AS v WHERE t.key = v.key RETURNING`
+        Records are partial, only fields that are set get updated.
+        `key` defaults to natural key of a table (user_id, workspace_id...).
+        Every chunk runs in its own savepoint, failing chunk is reported
+        in `failed` together with keys that matched no row.
+        Records with nothing but the key are listed in `unchanged`,
+        records without the key in `invalid` by their position.
         """
-        msg: str = "Updating many records in Postgres"
-        logger.debug(msg)
-        return msg
+        table: type[SQLModel] = tables.get(place, None)
+        if table is None:
+            return None
+        key = key or natural_keys[place]
+        table_columns = table.__table__.columns
+        result = BulkResult()
+        groups, result.unchanged, result.invalid = _group_changes(
+            records=records,
+            key=key,
+            columns=set(table_columns.keys()),
+        )
+        chunk_size = chunk_size or pg_config.POSTGRES_BULK_CHUNK_SIZE
+        index: int = 0
+        for changed, group in groups.items():
+            names = (key, *changed)
+            for start in range(0, len(group), chunk_size):
+                chunk = group[start : start + chunk_size]
+                chunk_keys = [str(record[key]) for record in chunk]
+                data = values(
+                    *(column(n, table_columns[n].type) for n in names),
+                    name="data",
+                ).data([tuple(record[n] for n in names) for record in chunk])
+                statement = (
+                    update(table)
+                    .where(getattr(table, key) == data.c[key])
+                    .values({n: data.c[n] for n in changed})
+                    .returning(table)
+                    .execution_options(synchronize_session=False)
+                )
+                report = ChunkReport(index=index, size=len(chunk))
+                index += 1
+                try:
+                    async with self.session.begin_nested():
+                        async with self.session.measure(
+                            f"update_many_records[{place}:{report.index}]"
+                        ) as measurement:
+                            updated = await self.session.scalars(statement)
+                            updated = updated.all()
+                except exc.DBAPIError as exc_info:
+                    if is_statement_timeout(exc_info):
+                        raise  # request deadline, not a bad chunk
+                    logger.opt(exception=exc_info).warning(
+                        f"Chunk {report.index} of {place} update failed"
+                    )
+                    report.error = str(exc_info.orig)
+                    result.failed.extend(chunk_keys)
+                    result.chunks.append(report)
+                    continue
+                updated_keys = {str(getattr(row, key)) for row in updated}
+                for row in updated:
+                    invalidate(self.session, place, "id", row.id)
+                result.failed.extend(
+                    k for k in chunk_keys if k not in updated_keys
+                )
+                result.records.extend(updated)
+                result.affected += len(updated)
+                report.affected = len(updated)
+                report.duration = measurement.duration
+                result.chunks.append(report)
+        return result
+
+    async def upsert_many_records(
+        self,
+        records: list[T],
+        place: str,
+        conflict_key: str | None = None,
+        chunk_size: int | None = None,
+    ) -> BulkResult | None:
+        """Adds records that don't exist yet, updates the ones that do.
+        One `INSERT ... ON CONFLICT (conflict_key) DO UPDATE ... RETURNING`
+            per chunk, `conflict_key` defaults to natural key.
+        Rows identical to stored ones are not rewritten and not returned,
+            so re-sending unchanged records leaves no dead tuples.
+        Duplicates of a key within the batch are collapsed, last one wins,
+            Postgres refuses to update the same row twice in one statement.
+        RETURNING `xmax = 0` tells inserted rows from updated ones.
+        """
+        table: type[SQLModel] = tables.get(place, None)
+        if table is None:
+            return None
+        conflict_key = conflict_key or natural_keys[place]
+        statement = _upsert_statement(table, place, conflict_key)
+        validated: list[dict] = _validate_rows(table, records, place)
+        if any(row.get(conflict_key) is None for row in validated):
+            raise exceptions.db.sql.DataError(
+                internal_message=f"{place} records without {conflict_key}"
+            )
+        rows: list[dict] = list(
+            {row[conflict_key]: row for row in validated}.values()
+        )
+        chunk_size = chunk_size or pg_config.POSTGRES_BULK_CHUNK_SIZE
+        result = BulkResult()
+        for index, start in enumerate(range(0, len(rows), chunk_size)):
+            chunk = rows[start : start + chunk_size]
+            try:
+                async with self.session.measure(
+                    f"upsert_many_records[{place}:{index}]"
+                ) as measurement:
+                    upserted = await self.session.execute(statement, chunk)
+                    upserted = upserted.mappings().all()
+            except exc.IntegrityError as exc_info:
+                raise exceptions.db.sql.IntegrityError(
+                    internal_message=f"Chunk {index} of {place}: {exc_info}"
+                ) from exc_info
+            for row in upserted:
+                if row["inserted"]:
+                    result.inserted += 1
+                else:
+                    result.updated += 1
+                    invalidate(self.session, place, "id", row["id"])
+                result.records.append(
+                    table.model_validate(
+                        {k: v for k, v in row.items() if k != "inserted"}
+                    )
+                )
+            result.affected += len(upserted)
+            result.chunks.append(
+                ChunkReport(
+                    index=index,
+                    size=len(chunk),
+                    affected=len(upserted),
+                    duration=measurement.duration,
+                )
+            )
+        count_service.bump(place, result.inserted)
+        return result
 
     async def delete_record(
         self,
@@ -135,36 +767,93 @@ class PostgresImplementation(DatabaseInterface):
         table: type[SQLModel] = tables.get(place, None)
         if table is None:
             return False
-        statement = delete(table).where(getattr(table, key) == value)
+        lookup = statements.get(place, key)
         try:
-            result = await self.session.execute(statement)
+            result = await self.session.execute(
+                lookup.delete, {"value": value}
+            )
+            invalidate(self.session, place, key, value, cascade=True)
             await self.session.commit()
-        except Exception as exc:
-            raise exceptions.db.DbError from exc
+        except exceptions.BaseCustomError:
+            raise  # request deadline or query budget, raised by cursor events
+        except exc.SQLAlchemyError as exc_info:
+            if is_statement_timeout(exc_info):
+                raise  # request deadline, see session manager __aexit__
+            raise exceptions.db.DbError from exc_info
+        count_service.bump(place, -result.rowcount)
         return result.rowcount  # result.rowcount number of rows affected
 
     async def delete_many_records(
         self,
-        data: list[T],
+        data: list[str],
         place: str,
-    ) -> str:
+        key: str | None = None,
+        chunk_size: int | None = None,
+    ) -> BulkResult | None:
         """Need to be separate from delete_record.
         Some databases offer bulk operations.
         If db supports bulk delete, please implement.
         If db doesn't support bulk delete, please add for loop delete_record.
         Function name contains 'many' due to similarities with delete_record.
         There is a risk of mistake while function call.
+
+        `data` is a list of key values, `key` defaults to natural key.
+        Runs `DELETE FROM t WHERE key = ANY($1)` per chunk on the core table,
+        so no rows or children are ever loaded into the session.
+        Children go away through ondelete="CASCADE" foreign keys.
         """
-        msg = "Deleting many records in Postgres"
-        logger.debug(msg)
-        return msg
+        table: type[SQLModel] = tables.get(place, None)
+        if table is None:
+            return None
+        key_column = table.__table__.columns[key or natural_keys[place]]
+        statement = delete(table.__table__).where(
+            key_column == any_(bindparam("keys", type_=ARRAY(key_column.type)))
+        )
+        chunk_size = chunk_size or pg_config.POSTGRES_BULK_CHUNK_SIZE
+        result = BulkResult()
+        invalidate_dependents(self.session, place)
+        for index, start in enumerate(range(0, len(data), chunk_size)):
+            chunk = data[start : start + chunk_size]
+            try:
+                async with self.session.measure(
+                    f"delete_many_records[{place}:{index}]"
+                ) as measurement:
+                    deleted = await self.session.execute(
+                        statement,
+                        {"keys": chunk},
+                    )
+            except exceptions.BaseCustomError:
+                raise
+            except exc.SQLAlchemyError as exc_info:
+                if is_statement_timeout(exc_info):
+                    raise
+                raise exceptions.db.DbError(
+                    internal_message=f"Chunk {index} of {place}: {exc_info}"
+                ) from exc_info
+            for value in chunk:
+                invalidate(self.session, place, key_column.name, value)
+            result.affected += deleted.rowcount
+            result.chunks.append(
+                ChunkReport(
+                    index=index,
+                    size=len(chunk),
+                    affected=deleted.rowcount,
+                    duration=measurement.duration,
+                )
+            )
+        count_service.bump(place, -result.affected)
+        return result
 
     @classmethod
-    def init_db(cls):
+    async def init_db(cls) -> None:
         """
         Initialize a Postgres database:
         - Create all tables defined with SQLModel if they don't exist.
+        - Skipped when stored schema fingerprint matches, see init_schema.
         """
-        engine = create_engine(pg_config.sync_url, echo=False)
-        SQLModel.metadata.create_all(engine, checkfirst=True)
-        logger.debug("Postgres tables initialized successfully.")
+        if not pg_config.POSTGRES_INIT_SCHEMA:
+            return
+        await init_schema(
+            engine=PostgresSessionManager.get_engine(),
+            metadata=SQLModel.metadata,
+        )
@@ -0,0 +1,109 @@
+import asyncio
+import contextvars
+import dataclasses
+import time
+
+from asgi_correlation_id import correlation_id
+from loguru import logger
+
+from backend import exceptions
+from backend.database.config import pg_config
+
+
+@dataclasses.dataclass
+class QueryContext:
+    """
+    State of one HTTP request shared with every DB session serving it.
+    Set by http middleware, sessions outside of requests see None.
+    ASGI scope is kept, because route is known only after routing.
+
+    Counts statements per fingerprint, the same statement shape repeated
+        `n_plus_one_threshold` times within one request is logged as N+1.
+    With `budget` set (see `query_budget` dependency) going over it
+        is logged, or raises QueryBudgetExceededError when `strict`.
+    Every transaction gets time left until `deadline` (monotonic)
+        as its statement_timeout, see `request_deadline` dependency.
+    """
+
+    scope: dict
+    started: float = dataclasses.field(default_factory=time.monotonic)
+    deadline: float | None = None
+    disconnected: bool = False
+    watcher: asyncio.Task | None = None
+    budget: int | None = None
+    strict: bool = False
+    n_plus_one_threshold: int = pg_config.POSTGRES_N_PLUS_ONE_THRESHOLD
+    statements: int = 0
+    repeats: dict = dataclasses.field(default_factory=dict)
+    n_plus_one: list[str] = dataclasses.field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.deadline is None and pg_config.POSTGRES_REQUEST_TIMEOUT > 0:
+            self.deadline = self.started + pg_config.POSTGRES_REQUEST_TIMEOUT
+
+    def remaining(self) -> float | None:
+        """Seconds left until deadline, None without one."""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        if route is None:
+            return self.scope.get("path", "")
+        return self.scope.get("root_path", "") + route.path
+
+    def check_budget(self) -> None:
+        """Called before a statement is executed."""
+        if self.budget is None or self.statements < self.budget:
+            return
+        msg: str = (
+            f"{self.route} exceeded query budget of {self.budget} statements"
+        )
+        if self.strict:
+            raise exceptions.db.sql.QueryBudgetExceededError(
+                internal_message=msg
+            )
+        if self.statements == self.budget:
+            logger.warning(msg)
+
+    def record(self, fingerprint) -> None:
+        """Called when a statement is sent to Postgres."""
+        self.statements += 1
+        if fingerprint is None:
+            return
+        count: int = self.repeats.get(fingerprint, 0) + 1
+        self.repeats[fingerprint] = count
+        if count == self.n_plus_one_threshold:
+            self.n_plus_one.append(fingerprint.digest)
+            logger.opt(lazy=True).warning(
+                "Possible N+1: statement {digest} repeated {n} times in "
+                "{route} | SQL: {sql}",
+                digest=lambda: fingerprint.digest,
+                n=lambda: count,
+                route=lambda: self.route,
+                sql=lambda: fingerprint.text,
+            )
+
+    def summary(self) -> str:
+        msg: str = f"sql: {self.statements}"
+        if self.budget is not None:
+            msg += f"/{self.budget}"
+        if self.n_plus_one:
+            msg += f" | N+1: {','.join(self.n_plus_one)}"
+        return msg
+
+
+query_context: contextvars.ContextVar[QueryContext | None] = (
+    contextvars.ContextVar("query_context", default=None)
+)
+
+
+def current_route() -> str | None:
+    context = query_context.get()
+    return context.route if context is not None else None
+
+
+def current_correlation_id() -> str | None:
+    return correlation_id.get()
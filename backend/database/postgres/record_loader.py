@@ -0,0 +1,120 @@
+import asyncio
+import contextvars
+
+from loguru import logger
+
+from backend.database.config import pg_config
+from backend.database.postgres.session_manager import PostgresSessionManager
+from backend.database.postgres.statements import statements
+
+BATCH_KEY = tuple[str, str]  # place, column name
+LOOKUP = tuple[str, str, str]  # place, column name, column value
+
+
+class RecordLoader:
+    """
+    DataLoader-style coalescing of concurrent `get_record` lookups.
+    Lookups queued in one event-loop tick for the same (place, key)
+        are resolved by one `SELECT ... WHERE key IN (...)` and fanned out.
+    Identical lookups still in flight share a single future.
+    Batches run on their own short session from the shared pool,
+        so callers' sessions don't need to be in any particular state.
+    Rows are returned as dicts, caller attaches them to its own session.
+    """
+
+    def __init__(self, *, max_batch_size: int) -> None:
+        self.max_batch_size = max_batch_size
+        self._pending: dict[BATCH_KEY, dict[str, tuple]] = {}
+        self._in_flight: dict[LOOKUP, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.loads: int = 0
+        self.coalesced: int = 0
+        self.batches: int = 0
+
+    async def load(self, place: str, key: str, value) -> dict | None:
+        self.loads += 1
+        lookup: LOOKUP = (place, key, str(value))
+        future = self._in_flight.get(lookup)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Nobody might await a failed future if all callers were cancelled
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[lookup] = future
+        batch_key: BATCH_KEY = (place, key)
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            batch = self._pending[batch_key] = {}
+            loop.call_soon(self._dispatch, batch_key)
+        batch[str(value)] = (value, future)
+        if len(batch) >= self.max_batch_size:
+            self._dispatch(batch_key)
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        return {
+            "loads": self.loads,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _dispatch(self, batch_key: BATCH_KEY) -> None:
+        batch = self._pending.pop(batch_key, None)
+        if not batch:
+            return
+        # Batch serves several requests, it must not run in context
+        # (query budget, deadline) of the one that happened to queue first
+        task = asyncio.create_task(
+            self._resolve(batch_key, batch), context=contextvars.Context()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch_key: BATCH_KEY, batch: dict) -> None:
+        place, key = batch_key
+        self.batches += 1
+        logger.opt(lazy=True).debug(
+            "Loading {n} records from place:{place} by key:{key}",
+            n=lambda: len(batch),
+            place=lambda: place,
+            key=lambda: key,
+        )
+        try:
+            rows = await self._fetch(
+                place=place,
+                key=key,
+                values=[value for value, _ in batch.values()],
+            )
+        except BaseException as exc_info:
+            for _, future in batch.values():
+                if not future.done():
+                    future.set_exception(exc_info)
+            if isinstance(exc_info, asyncio.CancelledError):
+                raise
+        else:
+            for value, (_, future) in batch.items():
+                if not future.done():
+                    future.set_result(rows.get(value))
+        finally:
+            for value in batch:
+                self._in_flight.pop((place, key, value), None)
+
+    @staticmethod
+    async def _fetch(*, place: str, key: str, values: list) -> dict[str, dict]:
+        lookup = statements.get(place, key)
+        async with PostgresSessionManager(read_only=True) as session:
+            results = await session.execute(
+                lookup.select_in, {"values": values}
+            )
+            return {
+                str(getattr(row, key)): row.model_dump()
+                for row in results.scalars().all()
+            }
+
+
+record_loader = RecordLoader(
+    max_batch_size=pg_config.POSTGRES_LOADER_MAX_BATCH_SIZE,
+)
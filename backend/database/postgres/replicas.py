@@ -0,0 +1,212 @@
+import dataclasses
+import hashlib
+import hmac
+import itertools
+import os
+import time
+
+from loguru import logger
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from backend.database.config import pg_config
+from backend.database.postgres.session_measurement import (
+    InstrumentedAsyncAdaptedQueuePool,
+    instrument_engine,
+)
+
+
+@dataclasses.dataclass(eq=False)
+class Replica:
+    url: str
+    engine: AsyncEngine
+    failed_until: float = 0.0
+    failures: int = 0
+    sessions: int = 0
+    read_only_engine: AsyncEngine = dataclasses.field(init=False)
+
+    def __post_init__(self) -> None:
+        self.read_only_engine = self.engine.execution_options(
+            postgresql_readonly=True
+        )
+
+    @property
+    def name(self) -> str:
+        return make_url(self.url).render_as_string(hide_password=True)
+
+    @property
+    def healthy(self) -> bool:
+        return self.failed_until <= time.monotonic()
+
+    @property
+    def in_use(self) -> int:
+        return self.engine.pool.checkedout()
+
+
+QUERY_CANCELED: str = "57014"  # statement_timeout or cancel request
+
+
+def is_statement_timeout(error: BaseException | None) -> bool:
+    """
+    True if error, or any error it was raised from, is a cancelled query.
+    Raw asyncpg errors (e.g. of COPY) carry sqlstate themselves, not on orig.
+    """
+    while error is not None:
+        orig = getattr(error, "orig", error)
+        if getattr(orig, "sqlstate", None) == QUERY_CANCELED:
+            return True
+        error = error.__cause__
+    return False
+
+
+def is_disconnect(error: BaseException | None) -> bool:
+    """True if error, or any error it was raised from, is a lost connection."""
+    if is_statement_timeout(error):
+        return False
+    while error is not None:
+        if isinstance(error, OSError | exc.InterfaceError):
+            return True
+        if isinstance(error, exc.DBAPIError) and (
+            error.connection_invalidated
+            or isinstance(error, exc.OperationalError)
+        ):
+            return True
+        error = error.__cause__
+    return False
+
+
+class ReplicaSet:
+    """
+    Read replicas of primary Postgres, each with its own engine and pool.
+    `choose` returns a healthy replica by least checked out connections
+        or round-robin, None means read has to go to primary.
+    Replica that lost connection is skipped for `cooldown` seconds.
+    After a client writes, its reads stay on primary for `sticky_window`
+        seconds, so it reads its own writes despite replication lag.
+    Time of the last write is carried by the client itself, as a signed
+        marker (see `write_marker`), so any worker or container serving
+        its next request knows about it. Clocks of hosts must agree
+        to well within `sticky_window`.
+    Engines are created lazily and recreated after fork, like primary.
+    """
+
+    def __init__(
+        self,
+        *,
+        urls: list[str],
+        strategy: str,
+        cooldown: float,
+        sticky_window: float,
+        secret: str,
+    ) -> None:
+        self.urls = urls
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.sticky_window = sticky_window
+        self._replicas: list[Replica] = []
+        self._pid: int | None = None
+        self._round_robin = itertools.count()
+        self._secret = secret.encode()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.urls)
+
+    @property
+    def replicas(self) -> list[Replica]:
+        if self._replicas and self._pid != os.getpid():
+            logger.debug("Replica engines inherited from parent, recreating")
+            for replica in self._replicas:
+                replica.engine.sync_engine.dispose(close=False)
+            self._replicas = []
+        if not self._replicas and self.urls:
+            self._replicas = [
+                Replica(url=url, engine=self._create_engine(url=url))
+                for url in self.urls
+            ]
+            self._pid = os.getpid()
+        return self._replicas
+
+    @staticmethod
+    def _create_engine(*, url: str) -> AsyncEngine:
+        engine = create_async_engine(
+            url=url,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=pg_config.POSTGRES_REPLICA_POOL_SIZE,
+            max_overflow=pg_config.POSTGRES_POOL_MAX_OVERFLOW,
+            pool_timeout=pg_config.POSTGRES_POOL_TIMEOUT,
+            pool_recycle=pg_config.POSTGRES_POOL_RECYCLE,
+            pool_pre_ping=pg_config.POSTGRES_POOL_PRE_PING,
+        )
+        instrument_engine(engine)
+        return engine
+
+    def choose(self) -> Replica | None:
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "round_robin":
+            replica = healthy[next(self._round_robin) % len(healthy)]
+        else:
+            replica = min(healthy, key=lambda r: r.in_use)
+        replica.sessions += 1
+        return replica
+
+    def mark_failed(self, replica: Replica) -> None:
+        replica.failures += 1
+        replica.failed_until = time.monotonic() + self.cooldown
+        logger.warning(
+            f"Replica {replica.name} failed, "
+            f"skipping it for {self.cooldown}s"
+        )
+
+    def _sign(self, written_at: str) -> str:
+        return hmac.new(
+            self._secret, written_at.encode(), hashlib.sha256
+        ).hexdigest()
+
+    def write_marker(self, written_at: float) -> str:
+        """Signed wall clock time of a committed write, kept by the client."""
+        stamp = f"{written_at:.3f}"
+        return f"{stamp}.{self._sign(stamp)}"
+
+    def is_sticky(self, marker: str | None) -> bool:
+        """True for a genuine marker of a write within `sticky_window`."""
+        if not marker:
+            return False
+        stamp, _, signature = marker.rpartition(".")
+        if not hmac.compare_digest(signature, self._sign(stamp)):
+            return False
+        try:
+            age = time.time() - float(stamp)
+        except ValueError:
+            return False
+        return -self.sticky_window < age < self.sticky_window
+
+    async def dispose(self) -> None:
+        for replica in self._replicas:
+            await replica.engine.dispose()
+        self._replicas = []
+        self._pid = None
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "replica": replica.name,
+                "healthy": replica.healthy,
+                "failures": replica.failures,
+                "sessions": replica.sessions,
+                **replica.engine.pool.stats(),
+            }
+            for replica in self._replicas
+        ]
+
+
+replica_set = ReplicaSet(
+    urls=pg_config.POSTGRES_REPLICA_URLS,
+    strategy=pg_config.POSTGRES_REPLICA_STRATEGY,
+    cooldown=pg_config.POSTGRES_REPLICA_COOLDOWN,
+    sticky_window=pg_config.POSTGRES_READ_YOUR_WRITES_WINDOW,
+    secret=pg_config.POSTGRES_READ_YOUR_WRITES_SECRET,
+)
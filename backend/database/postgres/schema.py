@@ -0,0 +1,84 @@
+import hashlib
+
+from loguru import logger
+from sqlalchemy import MetaData, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+# Any constant bigint, same for every process initializing the schema.
+SCHEMA_LOCK_KEY: int = 0x4C6F674F6273  # "LogObs"
+FINGERPRINT_TABLE: str = "schema_fingerprint"
+
+
+def schema_fingerprint(metadata: MetaData) -> str:
+    """sha256 of Postgres DDL of all tables and indexes in metadata."""
+    dialect = postgresql.dialect()
+    digest = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        digest.update(
+            str(CreateTable(table).compile(dialect=dialect)).encode()
+        )
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(
+                str(CreateIndex(index).compile(dialect=dialect)).encode()
+            )
+    return digest.hexdigest()
+
+
+async def _stored_fingerprint(conn: AsyncConnection) -> str | None:
+    exists = await conn.scalar(
+        text("SELECT to_regclass(:name) IS NOT NULL"),
+        {"name": FINGERPRINT_TABLE},
+    )
+    if not exists:
+        return None
+    return await conn.scalar(
+        text(f"SELECT fingerprint FROM {FINGERPRINT_TABLE} WHERE id = 1")
+    )
+
+
+async def init_schema(*, engine: AsyncEngine, metadata: MetaData) -> bool:
+    """
+    Creates missing tables of metadata, once per schema version.
+    Fingerprint of metadata is stored in the DB, when it matches
+        nothing is done, which is one cheap query for every worker.
+    Otherwise create_all runs under a transaction advisory lock,
+        so only one process of the deployment does it, the others
+        wait for the lock and find the new fingerprint already stored.
+    Returns True if create_all was run.
+    """
+    fingerprint: str = schema_fingerprint(metadata)
+    async with engine.connect() as conn:
+        stored = await _stored_fingerprint(conn)
+    if stored == fingerprint:
+        logger.debug(f"Postgres schema up to date {fingerprint[:12]}")
+        return False
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": SCHEMA_LOCK_KEY},
+        )
+        if await _stored_fingerprint(conn) == fingerprint:
+            logger.debug("Postgres schema initialized by another process")
+            return False
+        await conn.run_sync(metadata.create_all, checkfirst=True)
+        await conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} ("
+                "id int PRIMARY KEY, "
+                "fingerprint text NOT NULL, "
+                "updated_at timestamptz NOT NULL DEFAULT now())"
+            )
+        )
+        await conn.execute(
+            text(
+                f"INSERT INTO {FINGERPRINT_TABLE} (id, fingerprint) "
+                "VALUES (1, :fingerprint) "
+                "ON CONFLICT (id) DO UPDATE "
+                "SET fingerprint = excluded.fingerprint, updated_at = now()"
+            ),
+            {"fingerprint": fingerprint},
+        )
+    logger.info(f"Postgres schema initialized {fingerprint[:12]}")
+    return True
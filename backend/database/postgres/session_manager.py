@@ -1,3 +1,8 @@
+import asyncio
+import contextlib
+import os
+from collections.abc import Callable
+
 import fastapi
 from loguru import logger
 from sqlalchemy.ext.asyncio import (
@@ -9,8 +14,16 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend import exceptions
 from backend.database.config import pg_config
+from backend.database.postgres.replicas import (
+    Replica,
+    is_disconnect,
+    is_statement_timeout,
+    replica_set,
+)
 from backend.database.postgres.session_measurement import (
+    InstrumentedAsyncAdaptedQueuePool,
     InstrumentedAsyncSession,
+    instrument_engine,
 )
 
 
@@ -22,48 +35,196 @@ class PostgresSessionManager:
     It manages all fallbacks for user.
     UserCore doesn't need to worry
         about committing changes to DB and exception handling.
+
+    Engine and its connection pool are shared by the whole process.
+    They are created lazily on first use, not at import,
+    so gunicorn workers never share sockets inherited from the master.
+
+    With read_only=True transaction starts as `BEGIN READ ONLY`,
+        nothing is committed on exit, session is just closed,
+        which ends the transaction and returns connection to the pool.
+        Any write attempt fails in Postgres.
+    Session checks out a pooled connection only on its first statement,
+        sessions that never talk to Postgres never touch the pool.
+    Read-only sessions go to a read replica when POSTGRES_REPLICA_URLS
+        are set, unless `last_write` marker says the client wrote recently
+        (read-your-writes), then they stay on primary.
+        Read-write sessions always use primary, `on_write_commit` is called
+        after each of their commits that wrote something.
     """
 
-    _instance = None
+    _engine: AsyncEngine | None = None
+    _engine_pid: int | None = None
+    _session_factory: async_sessionmaker | None = None
+    _read_only_session_factory: async_sessionmaker | None = None
 
     def __init__(
         self,
         *args,
         suppress_exc: bool = False,
+        read_only: bool = False,
+        last_write: str | None = None,
+        on_write_commit: Callable[[], None] | None = None,
         **kwargs,
     ) -> None:
         logger.debug("Initializing Postgres session manager")
-        self.engine: AsyncEngine = create_async_engine(
-            url=pg_config.async_url,
-            pool_size=50,
-            max_overflow=20,
-        )
+        self.engine: AsyncEngine = self.get_engine()
         self.suppress_exc = suppress_exc
-        self.async_session_factory = async_sessionmaker(
+        self.read_only = read_only
+        self.on_write_commit = on_write_commit
+        self.replica: Replica | None = None
+        self.sticky: bool = read_only and replica_set.is_sticky(last_write)
+        if read_only and replica_set.enabled and not self.sticky:
+            self.replica = replica_set.choose()
+        self.async_session_factory = (
+            self._read_only_session_factory
+            if read_only
+            else self._session_factory
+        )
+        if args or kwargs:
+            self.async_session_factory = self._make_session_factory(
+                *args, **kwargs
+            )
+
+    @classmethod
+    def _make_session_factory(
+        cls,
+        *args,
+        bind: AsyncEngine | None = None,
+        **kwargs,
+    ) -> async_sessionmaker:
+        # Objects stay readable after commit, e.g. by response serialization
+        # running after the session was already closed.
+        kwargs.setdefault("expire_on_commit", False)
+        return async_sessionmaker(
             *args,
-            bind=self.engine,
+            bind=bind or cls._engine,
             autocommit=False,
             autoflush=False,
             class_=InstrumentedAsyncSession,
             **kwargs,
         )
 
+    @classmethod
+    def get_engine(cls) -> AsyncEngine:
+        """
+        Returns process-wide engine, creating it on first call.
+        If engine was inherited through fork (gunicorn --preload)
+            pool is dropped without closing parent's connections
+            and a fresh engine is created for this process.
+        """
+        if cls._engine is not None and cls._engine_pid != os.getpid():
+            logger.debug("Postgres engine inherited from parent, recreating")
+            cls._engine.sync_engine.dispose(close=False)
+            cls._engine = None
+        if cls._engine is None:
+            logger.opt(lazy=True).debug(
+                "Creating Postgres engine pid:{pid}",
+                pid=lambda: os.getpid(),
+            )
+            cls._engine = create_async_engine(
+                url=pg_config.async_url,
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                pool_size=pg_config.POSTGRES_POOL_SIZE,
+                max_overflow=pg_config.POSTGRES_POOL_MAX_OVERFLOW,
+                pool_timeout=pg_config.POSTGRES_POOL_TIMEOUT,
+                pool_recycle=pg_config.POSTGRES_POOL_RECYCLE,
+                pool_pre_ping=pg_config.POSTGRES_POOL_PRE_PING,
+            )
+            instrument_engine(cls._engine)
+            cls._engine_pid = os.getpid()
+            cls._session_factory = cls._make_session_factory()
+            cls._read_only_session_factory = cls._make_session_factory(
+                bind=cls._engine.execution_options(postgresql_readonly=True)
+            )
+        return cls._engine
+
+    @classmethod
+    async def warm_up(cls, connections: int | None = None) -> None:
+        """
+        Opens `connections` pooled connections at once and returns them,
+        so first requests don't pay TCP and auth handshakes.
+        Connections are held together, otherwise pool would reuse one.
+        """
+        if connections is None:
+            connections = pg_config.POSTGRES_POOL_WARMUP
+        connections = min(connections, pg_config.POSTGRES_POOL_SIZE)
+        engine = cls.get_engine()
+        logger.info(f"Warming up Postgres pool with {connections} conns...")
+        async with contextlib.AsyncExitStack() as stack:
+            await asyncio.gather(
+                *(
+                    stack.enter_async_context(engine.connect())
+                    for _ in range(connections)
+                )
+            )
+        logger.info("Postgres pool warmed up!")
+
+    @classmethod
+    async def dispose(cls) -> None:
+        if cls._engine is None:
+            return
+        logger.info("Disposing Postgres engine...")
+        await cls._engine.dispose()
+        await replica_set.dispose()
+        cls._engine = None
+        cls._engine_pid = None
+        cls._session_factory = None
+        cls._read_only_session_factory = None
+        logger.info("Postgres engine disposed!")
+
+    @classmethod
+    def pool_stats(cls) -> dict:
+        if cls._engine is None:
+            return {"initialized": False}
+        return {
+            "initialized": True,
+            **cls._engine.pool.stats(),
+            "replicas": replica_set.stats(),
+        }
+
     async def __aenter__(self) -> AsyncSession:
         """
         :return: SQLAlchemy session object for context manager to operate on.
         """
         logger.debug("Postgres session manager __aenter__")
-        self.session: AsyncSession = self.async_session_factory()
+        if self.replica is not None:
+            self.session: AsyncSession = self.async_session_factory(
+                bind=self.replica.read_only_engine
+            )
+            self.session.info["replica"] = self.replica.name
+        else:
+            self.session: AsyncSession = self.async_session_factory()
+        self.session.info["sticky"] = self.sticky
+        self.session.info["read_only"] = self.read_only
+        if self.on_write_commit is not None and not self.read_only:
+            self.session.info["after_write_commit"] = [self.on_write_commit]
         return self.session
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         logger.debug("Postgres session manager __aexit__")
         if any((exc_type, exc_val, exc_tb)):
+            if self.replica is not None and is_disconnect(exc_val):
+                replica_set.mark_failed(self.replica)
+            if isinstance(exc_val, asyncio.CancelledError):
+                # Client went away, see request_deadline dependency
+                await self.session.rollback()
+                await self.session.close()
+                raise exc_val
+            if is_statement_timeout(exc_val):
+                await self.session.rollback()
+                await self.session.close()
+                raise exceptions.db.sql.StatementTimeoutError(
+                    internal_message=f"Statement timed out: {exc_val}"
+                ) from exc_val
             if isinstance(
                 exc_val,
                 (fastapi.HTTPException, exceptions.BaseCustomError),
             ):
                 # Forwarding dev control flow exceptions giving HTTP4xx
+                # Connection must go back to the pool in this case too
+                await self.session.rollback()
+                await self.session.close()
                 raise exc_val
             logger.opt(exception=exc_val).error("Error in DB session occurred")
             logger.debug("Rolling back session")
@@ -80,6 +241,10 @@ class PostgresSessionManager:
                 return self.suppress_exc  # gracefully suppressing if True
             raise exceptions.db.sql.SQLError from exc_val
 
+        if self.read_only or not self.session.in_transaction():
+            # Nothing to commit, close just returns connection if any
+            await self.session.close()
+            return
         try:
             await self.session.commit()
         except Exception as exc_info:
@@ -92,4 +257,4 @@ class PostgresSessionManager:
             await self.session.close()
 
     async def close(self):
-        await self.engine.dispose()
+        await self.dispose()
@@ -1,32 +1,279 @@
+import contextlib
+import dataclasses
 import time
+from collections.abc import AsyncIterator
 
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.elements import (
+    ReleaseSavepointClause,
+    RollbackToSavepointClause,
+    SavepointClause,
+)
 from sqlalchemy.sql.expression import Executable
+from sqlmodel import Session
+
+from backend import exceptions
+from backend.database.postgres.invalidation import notify
+from backend.database.postgres.query_context import query_context
+from backend.database.postgres.slow_queries import slow_queries
+from backend.database.postgres.statement_stats import statement_stats
+
+
+@dataclasses.dataclass
+class Measurement:
+    name: str
+    duration: float = 0.0
+
+
+class InstrumentedSession(Session):
+    """Sync session behind InstrumentedAsyncSession, owns its events."""
+
+
+# Transaction statement_timeout is shortened once it overshoots time left
+DEADLINE_SLACK: float = 1.0
+
+
+def _statement_timeout(seconds: float) -> str:
+    return f"SET LOCAL statement_timeout = {max(int(seconds * 1000), 1)}"
+
+
+def _deadline_passed(context) -> exceptions.db.sql.StatementTimeoutError:
+    return exceptions.db.sql.StatementTimeoutError(
+        internal_message=f"{context.route} deadline passed before query"
+    )
+
+
+@event.listens_for(InstrumentedSession, "after_begin")
+def _apply_deadline(session, transaction, connection: Connection) -> None:
+    """
+    Limits statements of a new transaction to the time left
+        until request deadline, Postgres cancels them when exceeded.
+    SET LOCAL ends with the transaction, pooled connection is not affected.
+    Applied timeout is kept in `connection.info` for `_refresh_deadline`.
+    """
+    if (context := query_context.get()) is None:
+        return
+    remaining = context.remaining()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise _deadline_passed(context)
+    connection.exec_driver_sql(
+        _statement_timeout(remaining), execution_options={"measure": False}
+    )
+    connection.info["statement_timeout"] = remaining
+
+
+def _refresh_deadline(conn: Connection, cursor, context) -> None:
+    """
+    Timeout set at begin holds for every statement of the transaction,
+        later ones would get more time than the request has left.
+    Statement is refused once deadline passed, timeout is re-issued
+        when applied one overshoots time left by more than DEADLINE_SLACK.
+    """
+    applied = conn.info.get("statement_timeout")
+    if applied is None or (remaining := context.remaining()) is None:
+        return
+    if remaining <= 0:
+        raise _deadline_passed(context)
+    if applied - remaining > DEADLINE_SLACK:
+        cursor.execute(_statement_timeout(remaining))
+        conn.info["statement_timeout"] = remaining
+
+
+SAVEPOINTS = (
+    SavepointClause,
+    ReleaseSavepointClause,
+    RollbackToSavepointClause,
+)
+
+
+def _measured(exec_context: ExecutionContext | None) -> bool:
+    """
+    Plumbing is not measured: savepoints of bulk chunks and statements
+        executed with `execution_options(measure=False)`.
+    """
+    if exec_context is None:
+        return False
+    if exec_context.execution_options.get("measure", True) is False:
+        return False
+    compiled = exec_context.compiled
+    return compiled is None or not isinstance(compiled.statement, SAVEPOINTS)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Measures every statement executed by engine, see `_listen`."""
+    _listen(engine.sync_engine, explain_engine=engine)
+    _track_statement_timeout(engine.sync_engine)
+
+
+def _track_statement_timeout(sync_engine: Engine) -> None:
+    """Keeps `info["statement_timeout"]` true to the connection state."""
+
+    @event.listens_for(sync_engine, "begin")
+    def begin(conn):
+        conn.info.pop("statement_timeout", None)
+
+    @event.listens_for(sync_engine, "rollback_savepoint")
+    def rollback_savepoint(conn, name, context):
+        # Undoes SET LOCAL issued after the savepoint, value is unknown
+        if "statement_timeout" in conn.info:
+            conn.info["statement_timeout"] = float("inf")
+
+
+def _listen(sync_engine: Engine, explain_engine: AsyncEngine | None) -> None:
+    """
+    Cursor events see every statement sent to Postgres, including the ones
+        ORM emits on its own: selectinload queries, flush and refresh.
+    Before a statement: request budget and deadline are checked
+        and statement counted.
+    After it: duration goes to its fingerprint histogram,
+        to slow query log when over threshold and to DEBUG log.
+    SQL text is rendered (once per fingerprint) only if DEBUG is logged.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, exec_context, many):
+        if not _measured(exec_context):
+            return
+        if (context := query_context.get()) is not None:
+            context.check_budget()
+            _refresh_deadline(conn, cursor, context)
+        compiled = exec_context.compiled
+        fingerprint = statement_stats.fingerprint(
+            compiled.statement if compiled is not None else statement,
+            conn.dialect,
+        )
+        if context is not None:
+            context.record(fingerprint)
+        exec_context.measurement = (fingerprint, time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, exec_context, many):
+        measurement = getattr(exec_context, "measurement", None)
+        if measurement is None:
+            return
+        fingerprint, start = measurement
+        duration = time.perf_counter() - start
+        if fingerprint is not None:
+            fingerprint.observe(duration)
+        compiled = exec_context.compiled
+        # Driver SQL (exec_driver_sql) has no compiled parameters
+        params = getattr(exec_context, "compiled_parameters", None) or [None]
+        slow_queries.capture(
+            statement=(
+                compiled.statement if compiled is not None else statement
+            ),
+            params=params if len(params) != 1 else params[0],
+            duration=duration,
+            fingerprint=fingerprint,
+            engine=explain_engine,
+            sql=statement,
+            parameters=parameters,
+        )
+        logger.opt(lazy=True).debug(
+            "SQL: {sql} | Duration: {duration}s",
+            sql=lambda: fingerprint.text if fingerprint else statement,
+            duration=lambda: f"{duration:.4f}",
+        )
 
 
 class InstrumentedAsyncSession(AsyncSession):
+    sync_session_class = InstrumentedSession
+
     async def execute(self, statement: Executable, *args, **kwargs):
-        start = time.perf_counter()
-        try:
-            return await super().execute(statement, *args, **kwargs)
-        finally:
-            duration = time.perf_counter() - start
-            sql_str: str = str(statement).replace("\n", "")
-            logger.debug(f"SQL: {sql_str} | Duration: {duration:.4f}s")
+        if getattr(statement, "is_dml", False):
+            self.info["writes"] = True
+        return await super().execute(statement, *args, **kwargs)
 
     async def commit(self):
+        """
+        Cache invalidations queued in `info["invalidations"]` are NOTIFYed
+            in the transaction being committed.
+        Callables in `info["after_write_commit"]` run after a commit
+            of a transaction that wrote something.
+        """
+        if invalidations := self.info.pop("invalidations", None):
+            await notify(self, invalidations)
         start = time.perf_counter()
         try:
-            return await super().commit()
+            await super().commit()
         finally:
             duration = time.perf_counter() - start
             logger.debug(f"Session.commit | Duration: {duration:.4f}s")
+        if self.info.pop("writes", False):
+            for hook in self.info.get("after_write_commit", ()):
+                hook()
 
     async def flush(self, *args, **kwargs):
+        if self.new or self.dirty or self.deleted:
+            self.info["writes"] = True
         start = time.perf_counter()
         try:
             return await super().flush(*args, **kwargs)
         finally:
             duration = time.perf_counter() - start
             logger.debug(f"Session.flush | Duration: {duration:.4f}s")
+
+    @contextlib.asynccontextmanager
+    async def measure(self, name: str) -> AsyncIterator[Measurement]:
+        """
+        Times a block of session work, e.g. one chunk of a bulk operation.
+        Duration is available on yielded object after the block exits.
+        """
+        measurement = Measurement(name=name)
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            measurement.duration = time.perf_counter() - start
+            logger.debug(
+                f"Session.{name} | Duration: {measurement.duration:.4f}s"
+            )
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Default asyncio pool with checkout counters.
+    Wait time is measured around `_do_get`, so it covers both
+    waiting for a free slot and opening a new connection.
+    Counters live on the pool, `dispose()` recreates the pool and resets them.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_s": round(self.wait_total, 4),
+            "wait_avg_s": round(self.wait_total / (self.checkouts or 1), 4),
+            "wait_max_s": round(self.wait_max, 4),
+        }
@@ -0,0 +1,250 @@
+import asyncio
+import collections
+import dataclasses
+import random
+import time
+
+import orjson
+from loguru import logger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.expression import Executable
+
+from backend.database.config import pg_config
+from backend.database.postgres.query_context import (
+    current_correlation_id,
+    current_route,
+)
+from backend.database.postgres.statement_stats import Fingerprint
+
+
+@dataclasses.dataclass
+class SlowQuery:
+    digest: str
+    sql: str
+    duration: float
+    params: dict[str, str]
+    correlation_id: str | None
+    route: str | None
+    captured_at: float
+    plan: list | dict | None = None
+    plan_error: str | None = None
+
+
+def _shape(value) -> str:
+    """Type of bound value without the value itself."""
+    if isinstance(value, list | tuple | set):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _params_shape(
+    statement: Executable,
+    params,
+    dialect: Dialect | None,
+) -> dict[str, str]:
+    if isinstance(params, list):  # executemany
+        first = params[0] if params else {}
+        return {
+            "rows": str(len(params)),
+            **_params_shape(statement, first, dialect),
+        }
+    shape: dict[str, str] = {}
+    try:
+        bound = statement.compile(dialect=dialect).params
+    except Exception:
+        bound = {}
+    for name, value in {**bound, **(params or {})}.items():
+        shape[name] = _shape(value)
+    return shape
+
+
+class SlowQueryLog:
+    """
+    Bounded ring of statements slower than `threshold` seconds.
+    Each entry has bound parameter shapes (types, never values),
+        correlation_id and route of the request that issued it.
+    A `sample_rate` share of slow SELECTs is re-run in background with
+        EXPLAIN (ANALYZE, BUFFERS) on a separate connection, inside
+        a rolled back transaction with its own statement_timeout.
+    Explained is driver `sql` with its real bound `parameters`, values
+        are held only until the explain is done, never kept in entries.
+    Same fingerprint is explained at most once per `explain_interval`.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float,
+        sample_rate: float,
+        max_entries: int,
+        explain_timeout: float,
+        explain_interval: float,
+        enabled: bool = True,
+    ) -> None:
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.explain_timeout = explain_timeout
+        self.explain_interval = explain_interval
+        self.enabled = enabled
+        self._entries: collections.deque[SlowQuery] = collections.deque(
+            maxlen=max_entries
+        )
+        self._explained_at: dict[str, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.captured: int = 0
+        self.explained: int = 0
+
+    def capture(
+        self,
+        *,
+        statement: Executable,
+        params,
+        duration: float,
+        fingerprint: Fingerprint | None,
+        engine: AsyncEngine | None,
+        sql: str | None = None,
+        parameters=None,
+    ) -> SlowQuery | None:
+        if not self.enabled or duration < self.threshold:
+            return None
+        dialect = engine.dialect if engine is not None else None
+        entry = SlowQuery(
+            digest=fingerprint.digest if fingerprint else "",
+            sql=fingerprint.text if fingerprint else str(statement),
+            duration=duration,
+            params=_params_shape(statement, params, dialect),
+            correlation_id=current_correlation_id(),
+            route=current_route(),
+            captured_at=time.time(),
+        )
+        self._entries.append(entry)
+        self.captured += 1
+        logger.opt(lazy=True).warning(
+            "Slow query {digest} | {duration}s | route:{route}",
+            digest=lambda: entry.digest,
+            duration=lambda: f"{duration:.4f}",
+            route=lambda: entry.route,
+        )
+        if (
+            engine is not None
+            and sql is not None
+            and self._should_explain(statement, entry)
+        ):
+            task = asyncio.create_task(
+                self._explain(
+                    entry=entry, sql=sql, parameters=parameters, engine=engine
+                )
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return entry
+
+    def _should_explain(self, statement: Executable, entry: SlowQuery) -> bool:
+        # ANALYZE executes the statement, never do that with writes
+        if not getattr(statement, "is_select", False):
+            return False
+        if random.random() >= self.sample_rate:
+            return False
+        last = self._explained_at.get(entry.digest, 0.0)
+        if time.monotonic() - last < self.explain_interval:
+            return False
+        self._explained_at[entry.digest] = time.monotonic()
+        return True
+
+    async def _explain(
+        self,
+        *,
+        entry: SlowQuery,
+        sql: str,
+        parameters,
+        engine: AsyncEngine,
+    ) -> None:
+        try:
+            async with engine.connect() as conn:
+                # Not measured itself, would be slow query of its own
+                await conn.execution_options(measure=False)
+                timeout_ms = int(self.explain_timeout * 1000)
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {timeout_ms}"
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}",
+                    parameters or None,
+                )
+                plan = result.scalar()
+                await conn.rollback()
+            if isinstance(plan, str | bytes):
+                plan = orjson.loads(plan)
+            entry.plan = plan
+            self.explained += 1
+        except Exception as exc_info:
+            entry.plan_error = f"{type(exc_info).__name__}: {exc_info}"
+            logger.opt(lazy=True).debug(
+                "Cannot explain slow query {digest}: {error}",
+                digest=lambda: entry.digest,
+                error=lambda: entry.plan_error,
+            )
+
+    def top(self, limit: int = 10) -> list[dict]:
+        """Slow fingerprints ordered by worst duration, newest plan each."""
+        groups: dict[str, dict] = {}
+        for entry in self._entries:
+            group = groups.setdefault(
+                entry.digest,
+                {
+                    "digest": entry.digest,
+                    "sql": entry.sql,
+                    "count": 0,
+                    "max_s": 0.0,
+                    "total_s": 0.0,
+                    "routes": set(),
+                    "last": None,
+                    "plan": None,
+                },
+            )
+            group["count"] += 1
+            group["total_s"] += entry.duration
+            group["max_s"] = max(group["max_s"], entry.duration)
+            group["routes"].add(entry.route)
+            group["last"] = {
+                "duration_s": round(entry.duration, 4),
+                "params": entry.params,
+                "correlation_id": entry.correlation_id,
+                "route": entry.route,
+                "captured_at": entry.captured_at,
+            }
+            if entry.plan is not None or entry.plan_error is not None:
+                group["plan"] = entry.plan or entry.plan_error
+        result = sorted(
+            groups.values(), key=lambda g: g["max_s"], reverse=True
+        )
+        for group in result:
+            group["routes"] = sorted(r for r in group["routes"] if r)
+            group["max_s"] = round(group["max_s"], 4)
+            group["total_s"] = round(group["total_s"], 4)
+        return result[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "threshold_s": self.threshold,
+            "sample_rate": self.sample_rate,
+            "entries": len(self._entries),
+            "captured": self.captured,
+            "explained": self.explained,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._explained_at.clear()
+
+
+slow_queries = SlowQueryLog(
+    threshold=pg_config.POSTGRES_SLOW_QUERY_THRESHOLD,
+    sample_rate=pg_config.POSTGRES_SLOW_QUERY_SAMPLE_RATE,
+    max_entries=pg_config.POSTGRES_SLOW_QUERY_MAX_ENTRIES,
+    explain_timeout=pg_config.POSTGRES_SLOW_QUERY_EXPLAIN_TIMEOUT,
+    explain_interval=pg_config.POSTGRES_SLOW_QUERY_EXPLAIN_INTERVAL,
+    enabled=pg_config.POSTGRES_SLOW_QUERY_ENABLED,
+)
@@ -0,0 +1,148 @@
+import bisect
+import dataclasses
+import hashlib
+
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.expression import Executable
+
+from backend.database.config import pg_config
+
+# Upper bounds in seconds, last bucket catches everything slower.
+BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+
+@dataclasses.dataclass(eq=False)
+class Fingerprint:
+    """Latency histogram of one statement shape.
+    Keeps the first statement seen, SQL text is rendered from it
+        only when someone asks for `text` or `digest`.
+    """
+
+    statement: Executable
+    dialect: Dialect | None
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    buckets: list[int] = dataclasses.field(
+        default_factory=lambda: [0] * (len(BUCKETS) + 1)
+    )
+    _text: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            try:
+                compiled = self.statement.compile(dialect=self.dialect)
+            except Exception:  # some statements compile only when executed
+                compiled = self.statement
+            self._text = " ".join(str(compiled).split())
+        return self._text
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha1(self.text.encode()).hexdigest()[:16]
+
+    def observe(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+
+    def stats(self) -> dict:
+        return {
+            "digest": self.digest,
+            "sql": self.text,
+            "count": self.count,
+            "total_s": round(self.total, 4),
+            "avg_s": round(self.total / (self.count or 1), 4),
+            "max_s": round(self.max, 4),
+            "histogram": {
+                **{
+                    f"le_{bound}": hits
+                    for bound, hits in zip(BUCKETS, self.buckets, strict=False)
+                },
+                "le_inf": self.buckets[-1],
+            },
+        }
+
+
+class StatementStats:
+    """
+    Process-wide registry of statement fingerprints.
+    Fingerprint is SQLAlchemy's own cache key of the statement,
+        the same structure it uses for its compiled cache.
+    Literal values are bind parameters, so one shape is one fingerprint,
+        without compiling statement to SQL string on every execute.
+    Registry is bounded, statements beyond max_size are only counted.
+    """
+
+    def __init__(self, *, max_size: int) -> None:
+        self.max_size = max_size
+        self._fingerprints: dict[object, Fingerprint] = {}
+        self.overflow: int = 0
+
+    def fingerprint(
+        self,
+        statement: Executable,
+        dialect: Dialect | None = None,
+    ) -> Fingerprint | None:
+        try:
+            cache_key = statement._generate_cache_key()
+        except Exception:  # not every Executable supports caching
+            cache_key = None
+        key = cache_key.key if cache_key is not None else str(statement)
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            if len(self._fingerprints) >= self.max_size:
+                self.overflow += 1
+                return None
+            fingerprint = Fingerprint(statement=statement, dialect=dialect)
+            self._fingerprints[key] = fingerprint
+        return fingerprint
+
+    def observe(
+        self,
+        statement: Executable,
+        duration: float,
+        dialect: Dialect | None = None,
+    ) -> Fingerprint | None:
+        fingerprint = self.fingerprint(statement, dialect)
+        if fingerprint is not None:
+            fingerprint.observe(duration)
+        return fingerprint
+
+    def top(self, limit: int = 20, order_by: str = "total") -> list[dict]:
+        fingerprints = sorted(
+            self._fingerprints.values(),
+            key=lambda f: getattr(f, order_by),
+            reverse=True,
+        )
+        return [f.stats() for f in fingerprints[:limit]]
+
+    def stats(self) -> dict:
+        return {
+            "fingerprints": len(self._fingerprints),
+            "max_size": self.max_size,
+            "overflow": self.overflow,
+        }
+
+    def clear(self) -> None:
+        self._fingerprints.clear()
+        self.overflow = 0
+
+
+statement_stats = StatementStats(
+    max_size=pg_config.POSTGRES_STATEMENT_STATS_MAX_SIZE,
+)
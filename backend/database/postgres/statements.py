@@ -0,0 +1,91 @@
+import dataclasses
+
+from sqlalchemy import (
+    Column,
+    Delete,
+    Select,
+    UniqueConstraint,
+    bindparam,
+    delete,
+)
+from sqlmodel import SQLModel, select
+
+from backend import exceptions
+from backend.database.postgres.models import tables
+
+
+@dataclasses.dataclass(frozen=True)
+class KeyStatements:
+    """
+    Statements looking up one table by one indexed column.
+    Values are bound at execution, `value` for single ones,
+        `values` (expanding) for select_in.
+    """
+
+    column: Column
+    select: Select
+    select_in: Select
+    delete: Delete
+
+
+def indexed_columns(table: type[SQLModel]) -> list[str]:
+    """Columns that lead an index, so equality lookup never scans."""
+    core = table.__table__
+    names: dict[str, None] = dict.fromkeys(c.name for c in core.primary_key)
+    for column in core.columns:
+        if column.index or column.unique:
+            names[column.name] = None
+    for index in core.indexes:
+        names[next(iter(index.columns)).name] = None
+    for constraint in core.constraints:
+        # Foreign keys are not indexed by Postgres on their own
+        if isinstance(constraint, UniqueConstraint) and constraint.columns:
+            names[next(iter(constraint.columns)).name] = None
+    return list(names)
+
+
+class StatementRegistry:
+    """
+    Statements of every (place, key) pair built once at import,
+        instead of on every call.
+    Being the very same objects they also hit SQLAlchemy compiled cache
+        without rebuilding the statement first.
+    Only indexed keys are registered, lookup by any other column
+        is rejected before it gets a chance to scan the table.
+    """
+
+    def __init__(self, tables: dict[str, type[SQLModel]]) -> None:
+        self._statements: dict[tuple[str, str], KeyStatements] = {}
+        for place, table in tables.items():
+            for key in indexed_columns(table):
+                self._statements[(place, key)] = self._build(table, key)
+
+    @staticmethod
+    def _build(table: type[SQLModel], key: str) -> KeyStatements:
+        column = table.__table__.columns[key]
+        value = bindparam("value", type_=column.type)
+        return KeyStatements(
+            column=column,
+            select=select(table).where(column == value),
+            select_in=select(table).where(
+                column.in_(bindparam("values", expanding=True))
+            ),
+            # Bound value is unknown to "evaluate", so fetch deleted ids
+            delete=delete(table)
+            .where(column == value)
+            .execution_options(synchronize_session="fetch"),
+        )
+
+    def get(self, place: str, key: str) -> KeyStatements:
+        statements = self._statements.get((place, key))
+        if statements is None:
+            raise exceptions.db.sql.InvalidRequestError(
+                internal_message=f"{place}.{key} is not an indexed key"
+            )
+        return statements
+
+    def keys(self, place: str) -> list[str]:
+        return [k for p, k in self._statements if p == place]
+
+
+statements = StatementRegistry(tables)
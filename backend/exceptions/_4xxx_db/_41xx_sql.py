@@ -61,3 +61,16 @@ class AddRecordError(SQLError):
         "Unexpected add_record error occurred. "
         "Probably adding value to an unique colum that already exists."
     )
+
+
+class QueryBudgetExceededError(SQLError):
+    http_code = fastapi.status.HTTP_500_INTERNAL_SERVER_ERROR
+    internal_code = 4109
+    internal_message = "Request executed more SQL statements than its budget."
+
+
+class StatementTimeoutError(SQLError):
+    http_code = fastapi.status.HTTP_504_GATEWAY_TIMEOUT
+    internal_code = 4110
+    external_message = "Request took too long. Please try again later."
+    internal_message = "SQL statement cancelled by request deadline."
@@ -1,9 +1,18 @@
+import math
 import time
 
 import fastapi
 from loguru import logger
 
 from backend.auth import extract_jwt
+from backend.database.interface import WRITE_MARKER_COOKIE
+from backend.database.postgres.query_context import (
+    QueryContext,
+    query_context,
+)
+from backend.database.postgres.replicas import replica_set
+
+CLIENT_CLOSED_REQUEST: int = 499  # nginx convention, not sent to anyone
 
 
 def add_http_middleware(*, _app: fastapi.FastAPI):
@@ -28,11 +37,32 @@ def add_http_middleware(*, _app: fastapi.FastAPI):
                 f"IN {request.method}:{request.url.path}",
             ),
         start = time.perf_counter()
-        response = await call_next(request)
+        context = QueryContext(scope=request.scope)
+        token = query_context.set(context)
+        try:
+            response = await call_next(request)
+        except Exception:
+            if not context.disconnected:
+                raise
+            # Route was cancelled, nobody is waiting for the response
+            response = fastapi.Response(status_code=CLIENT_CLOSED_REQUEST)
+        finally:
+            query_context.reset(token)
+        last_write = getattr(request.state, "last_write", None)
+        if last_write is not None and replica_set.enabled:
+            # Next reads of this client stay on primary, in any process
+            response.set_cookie(
+                WRITE_MARKER_COOKIE,
+                replica_set.write_marker(last_write),
+                max_age=math.ceil(replica_set.sticky_window),
+                httponly=True,
+                samesite="lax",
+            )
         duration = time.perf_counter() - start
         msg = (
             f"OUT {request.method}:{request.url.path} | "
-            f"{response.status_code} | {duration:.4f}s"
+            f"{response.status_code} | {duration:.4f}s | "
+            f"{context.summary()}"
         )
         if 200 <= response.status_code <= 299:
             logger.log("EXIT 200", msg)
@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+import datetime
+import time
+
+import aio_pika
+from loguru import logger
+from pydantic_settings import BaseSettings
+from sqlalchemy import delete, func, select, update
+
+from backend.database.postgres import PostgresSessionManager
+from backend.database.postgres.models import Outbox
+
+# Sent rows are deleted at most this often, not on every idle poll
+PURGE_INTERVAL: float = 3600.0
+
+
+class OutboxRelay:
+    """
+    Publishes pending `outbox` rows to RabbitMQ, at least once.
+    Batch of pending rows is claimed with FOR UPDATE SKIP LOCKED,
+        relays of other API processes skip it and take the next rows.
+    Rows are marked sent only after broker confirmed them, in transaction
+        still holding their locks. Crash in between publishes them again,
+        consumers can dedupe by `message_id`.
+    Unconfirmed rows stay pending and are retried with the next batch.
+    `wake()` after committing a new row skips waiting for next poll.
+    """
+
+    def __init__(
+        self,
+        *,
+        channel: aio_pika.abc.AbstractChannel,
+        settings: BaseSettings,
+    ) -> None:
+        self.channel = channel
+        self.batch_size: int = settings.RABBITMQ_OUTBOX_BATCH_SIZE
+        self.poll_interval: float = settings.RABBITMQ_OUTBOX_POLL_INTERVAL
+        self.retention = datetime.timedelta(
+            seconds=settings.RABBITMQ_OUTBOX_RETENTION
+        )
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._purged_at: float = 0.0
+        self.published: int = 0
+        self.failed: int = 0
+        self.purged: int = 0
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def start(self) -> None:
+        logger.info("Starting outbox relay")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        logger.info("Stopping outbox relay...")
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                claimed = await self.relay_batch()
+                if claimed < self.batch_size:
+                    await self._purge()
+            except Exception as exc_info:
+                logger.error(f"Outbox relay failed: {exc_info!r}")
+                claimed = 0
+            if claimed < self.batch_size:  # drained, wait for new rows
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.poll_interval
+                    )
+
+    async def relay_batch(self) -> int:
+        """Publishes one batch of pending rows, returns number claimed."""
+        async with PostgresSessionManager() as session:
+            results = await session.execute(
+                select(Outbox)
+                .where(Outbox.sent_at.is_(None))
+                .order_by(Outbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows: list[Outbox] = list(results.scalars().all())
+            if not rows:
+                return 0
+            # Publishes are pipelined, each one awaits its broker confirm
+            confirms = await asyncio.gather(
+                *(self._publish(row) for row in rows),
+                return_exceptions=True,
+            )
+            sent: list[int] = []
+            for row, confirm in zip(rows, confirms, strict=True):
+                if isinstance(confirm, Exception):
+                    logger.warning(
+                        f"Outbox message {row.message_id} not confirmed, "
+                        f"will retry: {confirm!r}"
+                    )
+                    continue
+                sent.append(row.id)
+            if sent:
+                await session.execute(
+                    update(Outbox)
+                    .where(Outbox.id.in_(sent))
+                    .values(sent_at=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+        self.published += len(sent)
+        self.failed += len(rows) - len(sent)
+        logger.opt(lazy=True).debug(
+            "Outbox relayed {sent}/{claimed}",
+            sent=lambda: len(sent),
+            claimed=lambda: len(rows),
+        )
+        return len(rows)
+
+    async def _publish(self, row: Outbox) -> None:
+        await self.channel.default_exchange.publish(
+            aio_pika.Message(
+                body=row.body.encode(),
+                message_id=row.message_id,
+                correlation_id=row.correlation_id,
+                type=row.type,
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+            ),
+            routing_key=row.routing_key,
+        )
+
+    async def _purge(self) -> None:
+        if time.monotonic() - self._purged_at < PURGE_INTERVAL:
+            return
+        self._purged_at = time.monotonic()
+        async with PostgresSessionManager() as session:
+            results = await session.execute(
+                delete(Outbox)
+                .where(Outbox.sent_at < func.now() - self.retention)
+                .execution_options(synchronize_session=False)
+            )
+        self.purged += results.rowcount
+        logger.opt(lazy=True).debug(
+            "Outbox purged {rows} sent rows", rows=lambda: results.rowcount
+        )
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "published": self.published,
+            "failed": self.failed,
+            "purged": self.purged,
+        }
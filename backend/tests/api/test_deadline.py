@@ -0,0 +1,64 @@
+import asyncio
+
+import fastapi
+import pytest
+from loguru import logger
+
+from backend.api.v2.routers import request_deadline
+from backend.middleware.http_middleware import (
+    CLIENT_CLOSED_REQUEST,
+    add_http_middleware,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/slow",
+    "raw_path": b"/slow",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"test"), (b"user-agent", b"test")],
+    "client": ("127.0.0.1", 50000),
+    "server": ("test", 80),
+}
+
+
+@pytest.mark.asyncio
+async def test_client_disconnect_cancels_route_with_499(monkeypatch):
+    # Custom ENTER/EXIT levels are registered only by app lifespan
+    monkeypatch.setattr(logger, "log", lambda *args, **kwargs: None)
+    started, cancelled = asyncio.Event(), asyncio.Event()
+    app = fastapi.FastAPI()
+    add_http_middleware(_app=app)
+
+    @app.get("/slow", dependencies=[request_deadline()])
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages = iter([{"type": "http.request", "body": b""}])
+
+    async def receive() -> dict:
+        if (message := next(messages, None)) is not None:
+            return message
+        await started.wait()  # client goes away while route is running
+        return {"type": "http.disconnect"}
+
+    sent: list[dict] = []
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await asyncio.wait_for(app(dict(SCOPE), receive, send), timeout=5)
+    assert cancelled.is_set()
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[0]["status"] == CLIENT_CLOSED_REQUEST
@@ -0,0 +1,62 @@
+import orjson
+import pydantic
+import pytest
+
+from backend.api.v2.routers.export import export_response
+
+pytest_plugins = ["pytest_asyncio"]
+
+
+class Row(pydantic.BaseModel):
+    row_id: str
+    name: str
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export():
+    response = export_response(
+        batches=_batches(
+            [{"row_id": "1", "name": "a"}], [Row(row_id="2", name="b")]
+        ),
+        model=Row,
+        export_format="ndjson",
+        filename="rows",
+    )
+    lines = (await _body(response)).splitlines()
+    assert [orjson.loads(line)["row_id"] for line in lines] == ["1", "2"]
+    assert response.media_type == "application/x-ndjson"
+    assert "rows.ndjson" in response.headers["content-disposition"]
+
+
+@pytest.mark.asyncio
+async def test_csv_export_has_single_header():
+    response = export_response(
+        batches=_batches(
+            [{"row_id": "1", "name": "a"}], [{"row_id": "2", "name": "b,c"}]
+        ),
+        model=Row,
+        export_format="csv",
+        filename="rows",
+    )
+    body = (await _body(response)).decode()
+    assert body == 'row_id,name\r\n1,a\r\n2,"b,c"\r\n'
+
+
+@pytest.mark.asyncio
+async def test_csv_export_of_empty_table_is_header_only():
+    response = export_response(
+        batches=_batches(),
+        model=Row,
+        export_format="csv",
+        filename="rows",
+    )
+    assert await _body(response) == b"row_id,name\r\n"
@@ -0,0 +1,37 @@
+import types
+
+import pytest
+
+from backend import exceptions
+from backend.api.v2.routers.fields import (
+    parse_fields,
+    project,
+    projected_model,
+)
+from backend.api.v2.routers.files import File
+
+
+def test_fields_are_returned_in_model_order():
+    assert parse_fields(fields="name, file_id", model=File) == (
+        "file_id",
+        "name",
+    )
+
+
+def test_no_or_all_fields_mean_full_model():
+    assert parse_fields(fields=None, model=File) is None
+    assert parse_fields(fields=" , ", model=File) is None
+    assert parse_fields(fields=",".join(File.model_fields), model=File) is None
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(exceptions.api.FieldFormatError):
+        parse_fields(fields="file_id,password", model=File)
+
+
+def test_projection_skips_other_fields_and_is_cached():
+    row = types.SimpleNamespace(id=1, file_id="f1", name="a.pdf")
+    assert project(records=[row], model=File, fields=("file_id", "name")) == [
+        {"file_id": "f1", "name": "a.pdf"}
+    ]
+    assert projected_model(File, ("name",)) is projected_model(File, ("name",))
@@ -0,0 +1,56 @@
+import types
+
+import pytest
+
+from backend import exceptions
+from backend.api.v2.routers.include import (
+    UserDetail,
+    WorkspaceDetail,
+    nest,
+    parse_include,
+    relations,
+)
+
+
+def test_relations_are_fields_added_by_detail_model():
+    assert relations(UserDetail) == ("workspaces", "files")
+    assert relations(WorkspaceDetail) == ("owner",)
+
+
+def test_include_is_validated():
+    assert parse_include(include="files,workspaces", model=UserDetail) == (
+        "workspaces",
+        "files",
+    )
+    assert parse_include(include=None, model=UserDetail) is None
+    with pytest.raises(exceptions.api.FieldFormatError):
+        parse_include(include="owner", model=UserDetail)
+    with pytest.raises(exceptions.api.FieldFormatError):
+        parse_include(include="files", model=UserDetail, fields=("name",))
+
+
+def test_nest_reads_only_included_relations():
+    workspace = types.SimpleNamespace(
+        workspace_id="w1", name="Main", user_id="u1"
+    )
+
+    class Record:
+        user_id = "u1"
+        name = "John"
+        email = "john@example.com"
+        workspaces = (workspace,)
+
+        @property
+        def files(self):
+            raise AssertionError("files were not included")
+
+    assert nest(records=[Record()], model=UserDetail, include=("workspaces",))[
+        0
+    ] == {
+        "user_id": "u1",
+        "name": "John",
+        "email": "john@example.com",
+        "workspaces": [
+            {"workspace_id": "w1", "name": "Main", "user_id": "u1"}
+        ],
+    }
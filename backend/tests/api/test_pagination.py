@@ -0,0 +1,59 @@
+import types
+import urllib.parse
+
+import fastapi
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import exceptions
+from backend.api.v2.routers.pagination import (
+    build_page,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest.mark.parametrize("last_id", [0, 1, 20, 2_147_483_647])
+def test_cursor_round_trip(last_id):
+    cursor = encode_cursor(last_id=last_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor=cursor) == last_id
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "not-a-cursor", "e30", encode_cursor(last_id=1)[:-2] + "!!"],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(exceptions.api.FieldFormatError):
+        decode_cursor(cursor=cursor)
+
+
+def test_next_page_keeps_other_query_params():
+    app = fastapi.FastAPI()
+
+    @app.get("/items", name="get_items")
+    async def get_items(request: fastapi.Request, page_size: int = 2):
+        records = [types.SimpleNamespace(id=i) for i in range(page_size + 1)]
+        _, page = build_page(
+            records=records,
+            page_num=1,
+            page_size=page_size,
+            request=request,
+            route_name="get_items",
+        )
+        return page.next_page
+
+    next_page = TestClient(app).get(
+        "/items?page_size=2&fields=name&include=files&include=owner&count=true"
+    )
+    url = urllib.parse.urlsplit(next_page.json())
+    assert url.path == "/items"
+    assert urllib.parse.parse_qs(url.query) == {
+        "page_size": ["2"],
+        "fields": ["name"],
+        "include": ["files", "owner"],
+        "count": ["true"],
+        "cursor": [encode_cursor(last_id=1)],
+        "page_num": ["2"],
+    }
@@ -0,0 +1,154 @@
+import types
+
+import asyncpg
+import pytest
+from sqlalchemy import exc
+
+from backend import exceptions
+from backend.database.postgres.models import tables
+from backend.database.postgres.postgres_implementation import (
+    PostgresImplementation,
+)
+from backend.database.postgres.replicas import is_statement_timeout
+from backend.database.postgres.session_measurement import (
+    InstrumentedAsyncSession,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+USERS = [
+    {"user_id": f"user_{i}", "name": f"User {i}", "email": f"u{i}@x.pl"}
+    for i in range(5)
+]
+
+
+class FakeDriverConnection:
+    """asyncpg connection, COPYed rows stay pending until commit."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.transaction = False
+        self.pending: list[tuple] = []
+        self.copies: list[list[tuple]] = []
+
+    def is_in_transaction(self) -> bool:
+        return self.transaction
+
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        if not self.transaction:
+            raise AssertionError("COPY outside of transaction autocommits")
+        if self.error is not None and self.copies:
+            raise self.error
+        self.copies.append(records)
+        self.pending.extend(records)
+
+
+class FakeSession:
+    measure = InstrumentedAsyncSession.measure
+
+    def __init__(self, driver: FakeDriverConnection | None = None) -> None:
+        self.info: dict = {}
+        self.driver = driver or FakeDriverConnection()
+        self.begins: list[str] = []
+        self.inserts: list[tuple] = []
+        self.insert_error: Exception | None = None
+
+    async def connection(self):
+        return types.SimpleNamespace(
+            get_raw_connection=self._raw_connection,
+            exec_driver_sql=self._exec_driver_sql,
+        )
+
+    async def _raw_connection(self):
+        return types.SimpleNamespace(driver_connection=self.driver)
+
+    async def _exec_driver_sql(self, sql, execution_options=None):
+        self.begins.append(sql)
+        self.driver.transaction = True
+
+    async def scalars(self, statement, chunk):
+        if self.insert_error is not None and self.inserts:
+            raise self.insert_error
+        self.inserts.append((statement, chunk))
+        User = tables["users"]
+        offset = sum(len(c) for _, c in self.inserts[:-1])
+        rows = [User(id=offset + i, **row) for i, row in enumerate(chunk)]
+        return types.SimpleNamespace(all=lambda: rows)
+
+    async def rollback(self) -> None:
+        self.driver.pending.clear()
+        self.driver.transaction = False
+
+
+@pytest.mark.asyncio
+async def test_insert_path_chunks_and_keeps_parameter_order():
+    session = FakeSession()
+    pg_db = PostgresImplementation(session=session)
+    result = await pg_db.add_many_records(
+        USERS, "users", chunk_size=2, use_copy=False
+    )
+    statement, _ = session.inserts[0]
+    assert statement._sort_by_parameter_order
+    assert [len(chunk) for _, chunk in session.inserts] == [2, 2, 1]
+    assert [r.user_id for r in result.records] == [u["user_id"] for u in USERS]
+    assert result.affected == 5
+    assert [chunk.affected for chunk in result.chunks] == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_insert_path_conflict_is_add_record_error():
+    session = FakeSession()
+    session.insert_error = exc.IntegrityError("INSERT", {}, Exception())
+    pg_db = PostgresImplementation(session=session)
+    with pytest.raises(exceptions.db.sql.AddRecordError):
+        await pg_db.add_many_records(
+            USERS, "users", chunk_size=2, use_copy=False
+        )
+
+
+@pytest.mark.asyncio
+async def test_copy_begins_transaction_before_first_chunk():
+    session = FakeSession()
+    pg_db = PostgresImplementation(session=session)
+    result = await pg_db.add_many_records(
+        USERS, "users", chunk_size=2, use_copy=True
+    )
+    assert session.begins == ["SELECT 1"]
+    assert [len(chunk) for chunk in session.driver.copies] == [2, 2, 1]
+    assert "user_0" in session.driver.copies[0][0]
+    assert result.affected == 5
+    assert session.info["writes"]
+
+
+@pytest.mark.asyncio
+async def test_copy_joins_already_open_transaction():
+    session = FakeSession()
+    session.driver.transaction = True
+    pg_db = PostgresImplementation(session=session)
+    await pg_db.add_many_records(USERS, "users", use_copy=True)
+    assert session.begins == []
+
+
+@pytest.mark.asyncio
+async def test_failed_copy_chunk_rolls_back_earlier_chunks():
+    driver = FakeDriverConnection(error=asyncpg.UniqueViolationError("dup"))
+    session = FakeSession(driver)
+    pg_db = PostgresImplementation(session=session)
+    with pytest.raises(exceptions.db.sql.AddRecordError):
+        await pg_db.add_many_records(
+            USERS, "users", chunk_size=2, use_copy=True
+        )
+    assert len(driver.pending) == 2  # first chunk, not committed
+    await session.rollback()  # what session manager __aexit__ does
+    assert driver.pending == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_copy_is_statement_timeout():
+    driver = FakeDriverConnection(error=asyncpg.QueryCanceledError("late"))
+    pg_db = PostgresImplementation(session=FakeSession(driver))
+    with pytest.raises(asyncpg.QueryCanceledError) as exc_info:
+        await pg_db.add_many_records(
+            USERS, "users", chunk_size=2, use_copy=True
+        )
+    assert is_statement_timeout(exc_info.value)
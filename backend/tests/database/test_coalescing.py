@@ -0,0 +1,82 @@
+import types
+
+import pytest
+
+from backend.database.postgres import postgres_implementation
+from backend.database.postgres.entity_cache import EntityCache
+from backend.database.postgres.models import tables
+from backend.database.postgres.postgres_implementation import (
+    PostgresImplementation,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+USER = tables["users"](id=1, user_id="user_1", name="User 1", email="u@x.pl")
+
+
+class FakeSession:
+    def __init__(self, **info) -> None:
+        self.info = info
+        self.new = self.dirty = self.deleted = ()
+
+    def in_transaction(self) -> bool:
+        return False
+
+    async def execute(self, statement, params=None):
+        return types.SimpleNamespace(
+            scalars=lambda: types.SimpleNamespace(first=lambda: USER)
+        )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = EntityCache(
+        ttl=60,
+        max_bytes=10_000,
+        max_items=10,
+        alias_columns={"users": ("id", "user_id")},
+        dependents={"users": ()},
+    )
+    monkeypatch.setattr(postgres_implementation, "entity_cache", cache)
+    return cache
+
+
+@pytest.mark.parametrize(
+    ("info", "expected"),
+    [
+        ({"read_only": True, "sticky": False}, True),
+        ({"read_only": True, "sticky": True}, False),
+        ({"read_only": False, "sticky": False}, False),
+    ],
+)
+def test_only_read_only_sessions_coalesce(info, expected):
+    pg_db = PostgresImplementation(session=FakeSession(**info))
+    assert pg_db._can_coalesce() is expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("replica", "cached"), [(None, True), ("r1", False)])
+async def test_replica_reads_are_not_cached(cache, replica, cached):
+    pg_db = PostgresImplementation(session=FakeSession(replica=replica))
+    assert await pg_db.get_record("user_id", "user_1", "users") is USER
+    assert (cache.get("users", "user_id", "user_1") is not None) is cached
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("info", "dirty", "cached"),
+    [
+        ({"read_only": False}, (), True),
+        ({"read_only": False, "writes": True}, (), False),
+        ({"read_only": False}, (USER,), False),
+        ({"read_only": True, "sticky": True}, (), True),
+    ],
+)
+async def test_uncommitted_writes_keep_rows_out_of_cache(
+    cache, info, dirty, cached
+):
+    session = FakeSession(**info)
+    session.dirty = dirty
+    pg_db = PostgresImplementation(session=session)
+    await pg_db.get_record("user_id", "user_1", "users")
+    assert (cache.get("users", "user_id", "user_1") is not None) is cached
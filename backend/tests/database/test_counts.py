@@ -0,0 +1,62 @@
+import pytest
+
+from backend.database.postgres.counts import CountService
+
+pytest_plugins = ["pytest_asyncio"]
+
+
+class FakeSession:
+    def __init__(self, *, estimate: int, exact: int) -> None:
+        self.results = {"reltuples": estimate, "count": exact}
+        self.queries: list[str] = []
+
+    async def scalar(self, statement, params=None):
+        sql = str(statement).lower()
+        kind = "reltuples" if "reltuples" in sql else "count"
+        self.queries.append(kind)
+        return self.results[kind]
+
+
+def service() -> CountService:
+    return CountService(
+        ttl=60.0,
+        exact_threshold=1_000,
+        dependents={"users": ("files",), "files": ()},
+    )
+
+
+@pytest.mark.asyncio
+async def test_small_table_is_counted_exactly():
+    session = FakeSession(estimate=10, exact=12)
+    count = await service().count(session, "users")
+    assert (count.value, count.is_estimate) == (12, False)
+    assert session.queries == ["reltuples", "count"]
+
+
+@pytest.mark.asyncio
+async def test_big_table_uses_estimate_and_is_cached():
+    counts = service()
+    session = FakeSession(estimate=5_000, exact=5_123)
+    first = await counts.count(session, "users")
+    second = await counts.count(session, "users")
+    assert (first.value, first.is_estimate) == (5_000, True)
+    assert second is first
+    assert session.queries == ["reltuples"]
+
+
+@pytest.mark.asyncio
+async def test_never_analyzed_table_is_counted():
+    session = FakeSession(estimate=-1, exact=3)
+    assert (await service().count(session, "users")).value == 3
+
+
+@pytest.mark.asyncio
+async def test_bump_follows_writes_and_drops_dependents():
+    counts = service()
+    await counts.count(FakeSession(estimate=0, exact=5), "users")
+    await counts.count(FakeSession(estimate=0, exact=7), "files")
+    counts.bump("users", 3)
+    assert counts.stats()["places"]["users"]["value"] == 8
+    counts.bump("users", -10)
+    assert counts.stats()["places"]["users"]["value"] == 0
+    assert "files" not in counts.stats()["places"]
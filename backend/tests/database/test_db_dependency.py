@@ -0,0 +1,237 @@
+import functools
+import types
+import typing
+
+import fastapi
+import orjson
+import pytest
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.database import PG_SESSION, PG_STREAM_SESSION
+from backend.database.interface import WRITE_MARKER_COOKIE, DatabaseInterface
+from backend.database.postgres import PostgresSessionManager, session_manager
+from backend.database.postgres.replicas import replica_set
+from backend.middleware.http_middleware import add_http_middleware
+
+pytest_plugins = ["pytest_asyncio"]
+
+
+class FakeSessionManager:
+    def __init__(self, **options) -> None:
+        self.options = options
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.options.get("wrote") and not self.options["read_only"]:
+            self.options["on_write_commit"]()
+
+
+class FakeDb:
+    opened: typing.ClassVar[list[dict]] = []
+
+    def __init__(self, *, session: FakeSessionManager) -> None:
+        self.session = session
+
+    @classmethod
+    def open_session(cls, **options) -> FakeSessionManager:
+        cls.opened.append(options)
+        return FakeSessionManager(**options)
+
+
+FAKE_SESSION = fastapi.Depends(
+    DatabaseInterface.get_db_impl(db_name="fake"), scope="function"
+)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Custom ENTER/EXIT levels are registered only by app lifespan
+    monkeypatch.setattr(logger, "log", lambda *args, **kwargs: None)
+    monkeypatch.setitem(DatabaseInterface._registry, "fake", FakeDb)
+    monkeypatch.setattr(FakeDb, "opened", [])
+    monkeypatch.setattr(replica_set, "urls", ["postgresql+asyncpg://r/db"])
+    app = fastapi.FastAPI()
+    add_http_middleware(_app=app)
+
+    @app.get("/items")
+    async def read(db=FAKE_SESSION):
+        return {}
+
+    @app.post("/items")
+    async def write(db=FAKE_SESSION):
+        db.session.options["wrote"] = True
+        return {}
+
+    return TestClient(app)
+
+
+def test_write_marker_cookie_keeps_next_read_on_primary(client):
+    assert WRITE_MARKER_COOKIE not in client.get("/items").cookies
+    marker = client.post("/items").cookies[WRITE_MARKER_COOKIE]
+    assert replica_set.is_sticky(marker)
+    client.get("/items")  # any process verifies marker it is sent
+    assert FakeDb.opened[-1]["last_write"] == marker
+    assert replica_set.is_sticky(FakeDb.opened[-1]["last_write"])
+
+
+@pytest.mark.parametrize(
+    ("method", "read_only", "expected"),
+    [
+        ("GET", None, True),
+        ("HEAD", None, True),
+        ("OPTIONS", None, True),
+        ("POST", None, False),
+        ("PUT", None, False),
+        ("PATCH", None, False),
+        ("DELETE", None, False),
+        ("GET", False, False),
+        ("POST", True, True),
+    ],
+)
+def test_session_flavor_follows_http_method(
+    monkeypatch, method, read_only, expected
+):
+    monkeypatch.setitem(DatabaseInterface._registry, "fake", FakeDb)
+    monkeypatch.setattr(FakeDb, "opened", [])
+    app = fastapi.FastAPI()
+    get_db = DatabaseInterface.get_db_impl(db_name="fake", read_only=read_only)
+
+    @app.api_route("/items", methods=[method])
+    async def route(db=fastapi.Depends(get_db)):  # noqa: B008
+        return None
+
+    TestClient(app).request(method, "/items")
+    assert FakeDb.opened[-1]["read_only"] is expected
+
+
+class RecordingSession:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def in_transaction(self) -> bool:
+        return True
+
+    async def commit(self) -> None:
+        self.calls.append("commit")
+
+    async def close(self) -> None:
+        self.calls.append("close")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("read_only", "calls"),
+    [(True, ["close"]), (False, ["commit", "close"])],
+)
+async def test_read_only_session_is_closed_without_commit(read_only, calls):
+    manager = PostgresSessionManager(read_only=read_only)
+    manager.session = RecordingSession()
+    await manager.__aexit__(None, None, None)
+    assert manager.session.calls == calls
+
+
+class FakeAsyncpgStatement:
+    ROWS: typing.ClassVar[dict] = {
+        "select pg_catalog.version()": [("PostgreSQL 16.0",)],
+        "select current_schema()": [("public",)],
+        "show transaction isolation level": [("read committed",)],
+        "show standard_conforming_strings": [("on",)],
+    }
+
+    def __init__(self, sql: str) -> None:
+        self.sql = sql
+
+    def get_attributes(self) -> list:
+        oid = types.SimpleNamespace(oid=25)
+        return [types.SimpleNamespace(name="value", type=oid)]
+
+    async def fetch(self, *params) -> list[tuple]:
+        return self.ROWS.get(self.sql, [(1,)])
+
+    def get_statusmsg(self) -> str:
+        return "SELECT 1"
+
+
+class FakeAsyncpgConnection:
+    """Just enough of asyncpg.Connection for a real engine and pool."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def set_type_codec(self, *args, **kwargs) -> None:
+        pass
+
+    async def prepare(self, sql: str, name=None) -> FakeAsyncpgStatement:
+        return FakeAsyncpgStatement(sql)
+
+    def transaction(self, **options):
+        return types.SimpleNamespace(
+            start=self._noop, commit=self._noop, rollback=self._noop
+        )
+
+    async def _noop(self) -> None:
+        pass
+
+    async def fetchrow(self, sql: str) -> None:
+        pass
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self, timeout=None) -> None:
+        self.closed = True
+
+    def terminate(self) -> None:
+        self.closed = True
+
+
+async def _fake_connect() -> FakeAsyncpgConnection:
+    return FakeAsyncpgConnection()
+
+
+@pytest.fixture
+def fake_postgres(monkeypatch):
+    """Real engine and pool of PostgresSessionManager, fake connections."""
+    monkeypatch.setattr(
+        session_manager,
+        "create_async_engine",
+        functools.partial(create_async_engine, async_creator=_fake_connect),
+    )
+    for name in ("_engine", "_engine_pid", "_session_factory"):
+        monkeypatch.setattr(PostgresSessionManager, name, None)
+    monkeypatch.setattr(
+        PostgresSessionManager, "_read_only_session_factory", None
+    )
+
+
+def _checked_out() -> int:
+    return PostgresSessionManager.pool_stats()["checked_out"]
+
+
+@pytest.mark.parametrize(
+    ("dependency", "while_streaming"),
+    [(PG_SESSION, 0), (PG_STREAM_SESSION, 1)],
+)
+def test_connection_is_back_in_pool_before_response_streams(
+    fake_postgres, dependency, while_streaming
+):
+    app = fastapi.FastAPI()
+
+    @app.get("/rows")
+    async def rows(pg_db=dependency):
+        await pg_db.session.execute(text("SELECT 1"))
+        in_route = _checked_out()
+
+        async def body():
+            yield orjson.dumps([in_route, _checked_out()])
+
+        return StreamingResponse(body())
+
+    assert TestClient(app).get("/rows").json() == [1, while_streaming]
+    assert _checked_out() == 0
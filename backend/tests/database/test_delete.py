@@ -0,0 +1,94 @@
+import types
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.dialects import postgresql
+
+from backend import exceptions
+from backend.database.postgres.postgres_implementation import (
+    PostgresImplementation,
+)
+from backend.database.postgres.session_measurement import (
+    InstrumentedAsyncSession,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+
+class Cancelled(Exception):
+    sqlstate = "57014"
+
+
+class FakeSession:
+    measure = InstrumentedAsyncSession.measure
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.info: dict = {}
+        self.error = error
+        self.executed: list[tuple] = []
+
+    async def execute(self, statement, params=None):
+        if self.error is not None:
+            raise self.error
+        self.executed.append((statement, params))
+        keys = params.get("keys", [params.get("value")])
+        return types.SimpleNamespace(rowcount=len(keys))
+
+    async def commit(self) -> None:
+        pass
+
+
+TIMEOUT = exc.OperationalError("DELETE", {}, Cancelled())
+DEADLINE = exceptions.db.sql.StatementTimeoutError()
+BUDGET = exceptions.db.sql.QueryBudgetExceededError()
+
+
+async def _delete_one(session: FakeSession):
+    return await PostgresImplementation(session=session).delete_record(
+        "user_id", "user_1", "users"
+    )
+
+
+async def _delete_many(session: FakeSession):
+    return await PostgresImplementation(session=session).delete_many_records(
+        ["user_1", "user_2"], "users"
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("delete", [_delete_one, _delete_many])
+@pytest.mark.parametrize("error", [TIMEOUT, DEADLINE, BUDGET])
+async def test_deadline_and_budget_errors_pass_through(delete, error):
+    with pytest.raises(type(error)):
+        await delete(FakeSession(error))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("delete", [_delete_one, _delete_many])
+async def test_other_database_errors_are_db_error(delete):
+    error = exc.IntegrityError("DELETE", {}, Exception("fk"))
+    with pytest.raises(exceptions.db.DbError) as exc_info:
+        await delete(FakeSession(error))
+    assert exc_info.type is exceptions.db.DbError
+
+
+@pytest.mark.asyncio
+async def test_delete_many_runs_one_any_array_statement_per_chunk():
+    session = FakeSession()
+    keys = [f"user_{i}" for i in range(5)]
+    result = await PostgresImplementation(session=session).delete_many_records(
+        keys, "users", chunk_size=2
+    )
+    statements = {statement for statement, _ in session.executed}
+    assert len(statements) == 1  # same statement, only parameters change
+    sql = str(statements.pop().compile(dialect=postgresql.dialect()))
+    assert sql == (
+        "DELETE FROM users WHERE users.user_id = ANY (%(keys)s::VARCHAR[])"
+    )
+    assert [p["keys"] for _, p in session.executed] == [
+        ["user_0", "user_1"],
+        ["user_2", "user_3"],
+        ["user_4"],
+    ]
+    assert result.affected == 5
+    assert [chunk.affected for chunk in result.chunks] == [2, 2, 1]
@@ -0,0 +1,62 @@
+import pytest
+
+from backend.database.postgres.entity_cache import EntityCache
+
+USER = {"id": 1, "user_id": "user_1", "name": "User 1", "email": "u1@x.pl"}
+
+
+@pytest.fixture
+def cache():
+    return EntityCache(
+        ttl=60,
+        max_bytes=10_000,
+        max_items=3,
+        alias_columns={"users": ("id", "user_id"), "files": ("id", "file_id")},
+        dependents={"users": ("files",), "files": ()},
+    )
+
+
+def test_hit_and_miss(cache):
+    assert cache.get("users", "user_id", "user_1") is None
+    cache.set("users", "user_id", "user_1", USER)
+    assert cache.get("users", "user_id", "user_1") == USER
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_invalidate_by_alias_drops_every_key_of_row(cache):
+    cache.set("users", "user_id", "user_1", USER)
+    cache.set("users", "email", "u1@x.pl", USER)
+    cache.invalidate("users", "id", 1)
+    assert cache.get("users", "user_id", "user_1") is None
+    assert cache.get("users", "email", "u1@x.pl") is None
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_invalidate_by_other_column_drops_place(cache):
+    cache.set("users", "user_id", "user_1", USER)
+    cache.set("files", "file_id", "file_1", {"id": 1, "file_id": "file_1"})
+    cache.invalidate("users", "name", "User 1")
+    assert cache.get("users", "user_id", "user_1") is None
+    assert cache.get("files", "file_id", "file_1") is not None
+
+
+def test_cascade_drops_dependents(cache):
+    cache.set("files", "file_id", "file_1", {"id": 1, "file_id": "file_1"})
+    cache.invalidate("users", "user_id", "user_1", cascade=True)
+    assert cache.get("files", "file_id", "file_1") is None
+
+
+def test_lru_eviction(cache):
+    for i in range(4):
+        cache.set("users", "id", i, {**USER, "id": i, "user_id": f"u_{i}"})
+    assert cache.get("users", "id", 0) is None
+    assert cache.get("users", "id", 3) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(cache):
+    cache.ttl = -1
+    cache.set("users", "user_id", "user_1", USER)
+    assert cache.get("users", "user_id", "user_1") is None
+    assert cache.stats()["expirations"] == 1
@@ -0,0 +1,48 @@
+import pytest
+
+from backend import exceptions
+from backend.database.postgres.postgres_implementation import _group_changes
+
+COLUMNS = {"id", "user_id", "name", "email"}
+
+
+def test_changes_are_grouped_by_columns_last_change_wins():
+    groups, unchanged, invalid = _group_changes(
+        records=[
+            {"user_id": "user_1", "name": "Old"},
+            {"user_id": "user_2", "email": "u2@x.pl"},
+            {"user_id": "user_1", "name": "New"},
+        ],
+        key="user_id",
+        columns=COLUMNS,
+    )
+    assert groups == {
+        ("name",): [{"user_id": "user_1", "name": "New"}],
+        ("email",): [{"user_id": "user_2", "email": "u2@x.pl"}],
+    }
+    assert (unchanged, invalid) == ([], [])
+
+
+def test_keyless_and_no_op_records_are_reported_separately():
+    groups, unchanged, invalid = _group_changes(
+        records=[
+            {"name": "No key"},
+            {"user_id": "user_1"},
+            {"user_id": None, "name": "Null key"},
+            {"user_id": "user_2", "name": "Changed"},
+        ],
+        key="user_id",
+        columns=COLUMNS,
+    )
+    assert list(groups) == [("name",)]
+    assert unchanged == ["user_1"]
+    assert invalid == [0, 2]
+
+
+def test_unknown_column_is_rejected():
+    with pytest.raises(exceptions.db.sql.DataError):
+        _group_changes(
+            records=[{"user_id": "user_1", "nickname": "x"}],
+            key="user_id",
+            columns=COLUMNS,
+        )
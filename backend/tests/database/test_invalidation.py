@@ -0,0 +1,113 @@
+import types
+
+import orjson
+import pytest
+
+from backend.database.postgres import invalidation
+from backend.database.postgres.entity_cache import EntityCache
+from backend.database.postgres.postgres_implementation import (
+    PostgresImplementation,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+USER = {"id": 1, "user_id": "user_1", "name": "User 1", "email": "u1@x.pl"}
+FILE = {"id": 1, "file_id": "file_1"}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = EntityCache(
+        ttl=60,
+        max_bytes=10_000,
+        max_items=10,
+        alias_columns={"users": ("id", "user_id"), "files": ("id", "file_id")},
+        dependents={"users": ("files",), "files": ()},
+    )
+    monkeypatch.setattr(invalidation, "entity_cache", cache)
+    return cache
+
+
+def test_write_evicts_locally_and_queues_notify(cache):
+    session = types.SimpleNamespace(info={})
+    cache.set("users", "user_id", "user_1", USER)
+    invalidation.invalidate(session, "users", "id", 1)
+    invalidation.invalidate(session, "users", "id", 1)
+    invalidation.invalidate_dependents(session, "users")
+    assert cache.get("users", "user_id", "user_1") is None
+    assert session.info["invalidations"] == {
+        ("users", "id", "1", False),
+        ("users", None, None, True),
+    }
+
+
+def test_notified_payload_evicts_in_other_process(cache):
+    cache.set("users", "user_id", "user_1", USER)
+    cache.set("files", "file_id", "file_1", FILE)
+    (payload,) = invalidation.payloads({("users", "id", "1", True)})
+    invalidation.apply(payload)
+    assert cache.get("users", "user_id", "user_1") is None
+    assert cache.get("files", "file_id", "file_1") is None
+
+
+def test_payloads_fit_notify_limit_and_collapse_crowded_places():
+    entries = {("users", "id", str(i), False) for i in range(900)}
+    entries |= {("files", "id", str(i), False) for i in range(1_001)}
+    payloads = invalidation.payloads(entries)
+    assert all(len(p.encode()) < 8_000 for p in payloads)
+    decoded = [tuple(e) for p in payloads for e in orjson.loads(p)]
+    assert ("files", "", "", False) in decoded
+    assert len(decoded) == 901
+
+
+class CommitRecordingSession:
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.committed: list[set] = []
+
+    async def execute(self, statement, params=None):
+        return types.SimpleNamespace(
+            rowcount=1,
+            mappings=lambda: types.SimpleNamespace(first=lambda: USER),
+        )
+
+    async def commit(self) -> None:
+        self.committed.append(self.info.pop("invalidations", set()))
+
+
+@pytest.mark.asyncio
+async def test_invalidations_go_out_with_the_write_commit(cache):
+    session = CommitRecordingSession()
+    pg_db = PostgresImplementation(session=session)
+    await pg_db.patch_record("users", "user_id", "user_1", {"name": "U"})
+    await pg_db.delete_record("user_id", "user_1", "users")
+    assert session.committed == [
+        {("users", "id", "1", False)},
+        {("users", "user_id", "user_1", True)},
+    ]
+
+
+def test_crowded_place_collapses_to_whole_place_drop(cache):
+    cache.set("users", "user_id", "user_1", USER)
+    cache.set("files", "file_id", "file_1", FILE)
+    entries = {
+        ("users", "id", str(i), False)
+        for i in range(2, invalidation.PLACE_WIDE_AFTER + 3)
+    }
+    entries.add(("users", "id", "2", True))
+    payloads = invalidation.payloads(entries)
+    assert payloads == ['[["users","","",true]]']
+    invalidation.apply(payloads[0])
+    # user_1 was not written but goes with the rest of the place
+    assert cache.get("users", "user_id", "user_1") is None
+    assert cache.get("files", "file_id", "file_1") is None  # cascade kept
+
+
+def test_place_at_limit_is_not_collapsed():
+    entries = {
+        ("users", "id", str(i), False)
+        for i in range(invalidation.PLACE_WIDE_AFTER)
+    }
+    payloads = invalidation.payloads(entries)
+    decoded = {tuple(e) for p in payloads for e in orjson.loads(p)}
+    assert decoded == entries
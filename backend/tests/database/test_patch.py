@@ -0,0 +1,68 @@
+import types
+
+import pydantic
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend import exceptions
+from backend.database.postgres.postgres_implementation import (
+    PostgresImplementation,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+USER = {"id": 1, "user_id": "user_1", "name": "New", "email": "u1@x.pl"}
+
+
+class UserPatch(pydantic.BaseModel):
+    name: str | None = None
+    email: str | None = None
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.executed: list = []
+
+    async def execute(self, statement, params=None):
+        self.executed.append(statement)
+        return types.SimpleNamespace(
+            mappings=lambda: types.SimpleNamespace(first=lambda: USER)
+        )
+
+    async def commit(self) -> None:
+        pass
+
+
+async def _patch(changes) -> tuple[str, dict]:
+    session = FakeSession()
+    pg_db = PostgresImplementation(session=session)
+    record = await pg_db.patch_record("users", "user_id", "user_1", changes)
+    assert record.name == "New"
+    (statement,) = session.executed
+    compiled = statement.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+@pytest.mark.asyncio
+async def test_only_sent_fields_are_written():
+    sql, params = await _patch(UserPatch(name="New"))
+    set_clause = sql.split(" SET ")[1].split(" WHERE ")[0]
+    assert set_clause == "name=%(name)s::VARCHAR"
+    assert params["name"] == "New"
+    assert "email" not in params
+    assert sql.count("SELECT") == 0  # single UPDATE ... RETURNING
+
+
+@pytest.mark.asyncio
+async def test_id_is_never_patched():
+    sql, _ = await _patch({"id": 7, "email": "new@x.pl"})
+    set_clause = sql.split(" SET ")[1].split(" WHERE ")[0]
+    assert set_clause == "email=%(email)s::VARCHAR"
+
+
+@pytest.mark.asyncio
+async def test_unknown_column_is_rejected():
+    pg_db = PostgresImplementation(session=FakeSession())
+    with pytest.raises(exceptions.db.sql.DataError):
+        await pg_db.patch_record("users", "user_id", "user_1", {"age": 3})
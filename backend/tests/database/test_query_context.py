@@ -0,0 +1,103 @@
+import types
+
+import pytest
+from sqlmodel import select
+
+from backend import exceptions
+from backend.database.config import pg_config
+from backend.database.postgres.models import tables
+from backend.database.postgres.query_context import (
+    QueryContext,
+    query_context,
+)
+from backend.database.postgres.session_measurement import (
+    _apply_deadline,
+    _refresh_deadline,
+)
+from backend.database.postgres.statement_stats import StatementStats
+
+User = tables["users"]
+
+
+def _run(context: QueryContext, fingerprint) -> None:
+    context.check_budget()
+    context.record(fingerprint)
+
+
+def test_repeated_fingerprint_is_flagged_once():
+    stats = StatementStats(max_size=10)
+    context = QueryContext(scope={"path": "/users"}, n_plus_one_threshold=3)
+    for user_id in range(5):
+        _run(
+            context, stats.fingerprint(select(User).where(User.id == user_id))
+        )
+    assert context.statements == 5
+    assert len(context.n_plus_one) == 1
+    assert context.summary().startswith("sql: 5 | N+1: ")
+
+
+def test_strict_budget_raises_before_extra_statement():
+    context = QueryContext(scope={"path": "/users"}, budget=2, strict=True)
+    _run(context, None)
+    _run(context, None)
+    with pytest.raises(exceptions.db.sql.QueryBudgetExceededError):
+        _run(context, None)
+    assert context.statements == 2
+
+
+def test_lenient_budget_only_counts():
+    context = QueryContext(scope={"path": "/users"}, budget=1)
+    for _ in range(3):
+        _run(context, None)
+    assert context.summary() == "sql: 3/1"
+
+
+def test_deadline_defaults_to_request_timeout(monkeypatch):
+    monkeypatch.setattr(pg_config, "POSTGRES_REQUEST_TIMEOUT", 10.0)
+    context = QueryContext(scope={"path": "/users"})
+    assert context.deadline == context.started + 10.0
+    assert 9 < context.remaining() <= 10
+    monkeypatch.setattr(pg_config, "POSTGRES_REQUEST_TIMEOUT", 0)
+    assert QueryContext(scope={"path": "/users"}).remaining() is None
+
+
+def test_passed_deadline_raises_before_transaction():
+    context = QueryContext(scope={"path": "/users"})
+    context.deadline = context.started - 1
+    token = query_context.set(context)
+    try:
+        with pytest.raises(exceptions.db.sql.StatementTimeoutError):
+            _apply_deadline(None, None, None)
+    finally:
+        query_context.reset(token)
+
+
+class FakeCursor:
+    def __init__(self) -> None:
+        self.executed: list[str] = []
+
+    def execute(self, sql: str) -> None:
+        self.executed.append(sql)
+
+
+@pytest.mark.parametrize(
+    ("applied", "reissued"), [(None, False), (10.5, False), (30.0, True)]
+)
+def test_statement_timeout_follows_time_left(applied, reissued):
+    context = QueryContext(scope={"path": "/users"})
+    context.deadline = context.started + 10
+    conn = types.SimpleNamespace(info={"statement_timeout": applied})
+    cursor = FakeCursor()
+    _refresh_deadline(conn, cursor, context)
+    assert bool(cursor.executed) is reissued
+    if reissued:
+        assert cursor.executed[0].startswith("SET LOCAL statement_timeout")
+        assert conn.info["statement_timeout"] <= 10
+
+
+def test_passed_deadline_raises_before_next_statement():
+    context = QueryContext(scope={"path": "/users"})
+    context.deadline = context.started - 1
+    conn = types.SimpleNamespace(info={"statement_timeout": 5.0})
+    with pytest.raises(exceptions.db.sql.StatementTimeoutError):
+        _refresh_deadline(conn, FakeCursor(), context)
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from backend.database.postgres.query_context import QueryContext, query_context
+from backend.database.postgres.record_loader import RecordLoader
+
+pytest_plugins = ["pytest_asyncio"]
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    calls: list[tuple[str, str, list]] = []
+
+    async def fetch(*, place: str, key: str, values: list) -> dict:
+        calls.append((place, key, sorted(values)))
+        await asyncio.sleep(0)
+        return {v: {"id": i, key: v} for i, v in enumerate(values) if v != "x"}
+
+    instance = RecordLoader(max_batch_size=3)
+    monkeypatch.setattr(instance, "_fetch", fetch)
+    instance.calls = calls
+    return instance
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_query(loader):
+    rows = await asyncio.gather(
+        loader.load("users", "user_id", "a"),
+        loader.load("users", "user_id", "b"),
+        loader.load("users", "user_id", "a"),
+    )
+    assert loader.calls == [("users", "user_id", ["a", "b"])]
+    assert rows[0] == rows[2]
+    assert rows[1]["user_id"] == "b"
+    assert loader.stats()["coalesced"] == 1
+    assert loader.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_missing_key_resolves_to_none(loader):
+    assert await loader.load("users", "user_id", "x") is None
+
+
+@pytest.mark.asyncio
+async def test_batch_is_split_at_max_size(loader):
+    await asyncio.gather(
+        *(loader.load("users", "user_id", v) for v in "abcde"),
+    )
+    assert [len(values) for *_, values in loader.calls] == [3, 2]
+
+
+@pytest.mark.asyncio
+async def test_failure_is_propagated_to_every_waiter(loader, monkeypatch):
+    async def fetch(**_):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(loader, "_fetch", fetch)
+    results = await asyncio.gather(
+        loader.load("users", "user_id", "a"),
+        loader.load("users", "user_id", "b"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_outside_context_of_any_request(loader, monkeypatch):
+    seen: list = []
+
+    async def fetch(**_):
+        seen.append(query_context.get())
+        return {}
+
+    async def request(path: str):
+        query_context.set(QueryContext(scope={"path": path}))
+        return await loader.load("users", "user_id", path)
+
+    monkeypatch.setattr(loader, "_fetch", fetch)
+    await asyncio.gather(request("/a"), request("/b"))
+    assert seen == [None]
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table
+from sqlmodel import SQLModel
+
+from backend.database.postgres.models import tables  # noqa: F401
+from backend.database.postgres.schema import schema_fingerprint
+
+
+def _metadata(*, extra_column: bool = False, index: bool = False):
+    metadata = MetaData()
+    columns = [Column("id", Integer, primary_key=True), Column("name", String)]
+    if extra_column:
+        columns.append(Column("email", String))
+    table = Table("things", metadata, *columns)
+    if index:
+        Index("ix_things_name", table.c.name)
+    return metadata
+
+
+def test_fingerprint_is_stable():
+    assert schema_fingerprint(_metadata()) == schema_fingerprint(_metadata())
+    assert schema_fingerprint(SQLModel.metadata) == schema_fingerprint(
+        SQLModel.metadata
+    )
+
+
+def test_fingerprint_changes_with_columns_and_indexes():
+    base = schema_fingerprint(_metadata())
+    assert schema_fingerprint(_metadata(extra_column=True)) != base
+    assert schema_fingerprint(_metadata(index=True)) != base
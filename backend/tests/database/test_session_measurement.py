@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, select
+
+from backend import exceptions
+from backend.database.postgres.models import tables
+from backend.database.postgres.query_context import QueryContext, query_context
+from backend.database.postgres.session_measurement import _listen
+
+User = tables["users"]
+Workspace = tables["workspaces"]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    _listen(engine, explain_engine=None)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        owner = User(user_id="user_1", name="User 1", email="u1@x.pl")
+        session.add(Workspace(workspace_id="ws_1", name="WS", owner=owner))
+        session.commit()
+    return engine
+
+
+def _with_relations():
+    return select(User).options(
+        selectinload(User.workspaces), selectinload(User.files)
+    )
+
+
+def _run(engine, context: QueryContext, work) -> None:
+    token = query_context.set(context)
+    try:
+        with Session(engine) as session:
+            work(session)
+    finally:
+        query_context.reset(token)
+
+
+def test_orm_emitted_statements_are_counted(engine):
+    context = QueryContext(scope={"path": "/users"})
+    _run(engine, context, lambda s: s.exec(_with_relations()).all())
+    assert context.statements == 3
+
+
+def test_savepoints_are_not_counted(engine):
+    def work(session: Session) -> None:
+        with session.begin_nested():
+            session.add(
+                Workspace(workspace_id="ws_2", name="WS", user_id="user_1")
+            )
+
+    context = QueryContext(scope={"path": "/workspaces"})
+    _run(engine, context, work)
+    assert context.statements == 1
+
+
+def test_strict_budget_stops_relationship_load(engine):
+    context = QueryContext(scope={"path": "/users"}, budget=2, strict=True)
+    with pytest.raises(exceptions.db.sql.QueryBudgetExceededError):
+        _run(engine, context, lambda s: s.exec(_with_relations()).all())
+    assert context.statements == 2
@@ -0,0 +1,124 @@
+import asyncio
+import contextlib
+import types
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from backend.database.postgres.models import tables
+from backend.database.postgres.query_context import QueryContext, query_context
+from backend.database.postgres.slow_queries import SlowQueryLog
+from backend.database.postgres.statement_stats import StatementStats
+
+pytest_plugins = ["pytest_asyncio"]
+
+User = tables["users"]
+
+
+def _log(**kwargs) -> SlowQueryLog:
+    options = {
+        "threshold": 0.1,
+        "sample_rate": 1.0,
+        "max_entries": 3,
+        "explain_timeout": 1.0,
+        "explain_interval": 60.0,
+    }
+    return SlowQueryLog(**{**options, **kwargs})
+
+
+def _capture(log: SlowQueryLog, statement, duration: float):
+    return log.capture(
+        statement=statement,
+        params=None,
+        duration=duration,
+        fingerprint=StatementStats(max_size=10).fingerprint(statement),
+        engine=None,
+    )
+
+
+def test_fast_statement_is_not_captured():
+    log = _log()
+    assert _capture(log, select(User), 0.01) is None
+    assert log.stats()["captured"] == 0
+
+
+def test_captures_param_shape_and_route_not_values():
+    log = _log()
+    token = query_context.set(
+        QueryContext(scope={"path": "/api/v2/users/user_1"})
+    )
+    try:
+        statement = select(User).where(User.user_id.in_(["a", "b"]))
+        entry = _capture(log, statement, 0.5)
+    finally:
+        query_context.reset(token)
+    assert entry.route == "/api/v2/users/user_1"
+    assert entry.params == {"user_id_1": "list[2]"}
+    assert "'a'" not in entry.sql
+
+
+def test_top_groups_by_fingerprint_and_ring_is_bounded():
+    log = _log()
+    for user_id in ("a", "b", "c"):
+        _capture(log, select(User).where(User.user_id == user_id), 0.2)
+    _capture(log, select(User).where(User.email == "x"), 0.9)
+    top = log.top(limit=5)
+    assert log.stats()["entries"] == 3
+    assert [group["count"] for group in top] == [1, 2]
+    assert top[0]["max_s"] == 0.9
+
+
+def test_writes_are_never_explained():
+    log = _log()
+    update = User.__table__.update().values(name="x")
+    entry = _capture(log, update, 0.5)
+    assert not log._should_explain(update, entry)
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.executed: list[tuple] = []
+
+    async def execution_options(self, **options):
+        return self
+
+    async def exec_driver_sql(self, sql, parameters=None):
+        self.executed.append((sql, parameters))
+        return types.SimpleNamespace(scalar=lambda: '[{"Plan": {}}]')
+
+    async def rollback(self) -> None:
+        pass
+
+
+class FakeEngine:
+    dialect = postgresql.asyncpg.dialect()
+
+    def __init__(self) -> None:
+        self.conn = FakeConnection()
+
+    @contextlib.asynccontextmanager
+    async def connect(self):
+        yield self.conn
+
+
+@pytest.mark.asyncio
+async def test_explain_runs_driver_sql_with_bound_values():
+    log, engine = _log(), FakeEngine()
+    statement = select(User).where(User.user_id == "user_1")
+    entry = log.capture(
+        statement=statement,
+        params={"user_id_1": "user_1"},
+        duration=0.5,
+        fingerprint=None,
+        engine=engine,
+        sql="SELECT users.id FROM users WHERE users.user_id = $1::VARCHAR",
+        parameters=("user_1",),
+    )
+    await asyncio.gather(*log._tasks)
+    explain, parameters = engine.conn.executed[-1]
+    assert explain.startswith("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ")
+    assert explain.endswith("= $1::VARCHAR")
+    assert parameters == ("user_1",)
+    assert entry.plan == [{"Plan": {}}]
+    assert "user_1" not in str(entry.params)
@@ -0,0 +1,42 @@
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from backend.database.postgres.models import tables
+from backend.database.postgres.statement_stats import StatementStats
+
+User = tables["users"]
+
+
+def test_same_shape_different_literals_share_fingerprint():
+    stats = StatementStats(max_size=10)
+    first = stats.observe(select(User).where(User.user_id == "a"), 0.002)
+    second = stats.observe(select(User).where(User.user_id == "b"), 0.2)
+    assert first is second
+    assert first.count == 2
+    assert first.buckets[1] == 1  # <= 5ms
+    assert first._text is None  # nothing rendered yet
+
+
+def test_in_list_length_does_not_change_fingerprint():
+    stats = StatementStats(max_size=10)
+    first = stats.fingerprint(select(User).where(User.id.in_([1])))
+    second = stats.fingerprint(select(User).where(User.id.in_([1, 2, 3])))
+    assert first is second
+
+
+def test_text_is_rendered_lazily_for_dialect():
+    stats = StatementStats(max_size=10)
+    fingerprint = stats.observe(
+        select(User).where(User.id == 1), 0.01, postgresql.dialect()
+    )
+    assert fingerprint.text.startswith("SELECT users.id")
+    assert "%(id_1)s" in fingerprint.text
+    assert len(fingerprint.digest) == 16
+
+
+def test_registry_is_bounded():
+    stats = StatementStats(max_size=1)
+    assert stats.observe(select(User), 0.01) is not None
+    assert stats.observe(select(User).where(User.id == 1), 0.01) is None
+    assert stats.stats()["overflow"] == 1
+    assert stats.top(limit=5)[0]["count"] == 1
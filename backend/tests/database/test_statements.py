@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend import exceptions
+from backend.database.postgres.models import tables
+from backend.database.postgres.statements import (
+    StatementRegistry,
+    indexed_columns,
+)
+
+
+def test_only_indexed_columns_are_registered():
+    assert indexed_columns(tables["users"]) == [
+        "id",
+        "user_id",
+        "name",
+        "email",
+    ]
+    # foreign key without index
+    assert "user_id" not in indexed_columns(tables["workspaces"])
+
+
+def test_statements_are_built_once_with_bound_value():
+    registry = StatementRegistry(tables)
+    lookup = registry.get("users", "user_id")
+    assert registry.get("users", "user_id") is lookup
+    sql = str(lookup.select.compile(dialect=postgresql.dialect()))
+    assert "users.user_id = %(value)s" in sql
+
+
+def test_unindexed_key_is_rejected():
+    registry = StatementRegistry(tables)
+    with pytest.raises(exceptions.db.sql.InvalidRequestError):
+        registry.get("files", "url")
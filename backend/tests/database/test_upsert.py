@@ -0,0 +1,80 @@
+import types
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend import exceptions
+from backend.database.postgres.entity_cache import entity_cache
+from backend.database.postgres.models import tables
+from backend.database.postgres.postgres_implementation import (
+    PostgresImplementation,
+    _upsert_statement,
+)
+from backend.database.postgres.session_measurement import (
+    InstrumentedAsyncSession,
+)
+
+pytest_plugins = ["pytest_asyncio"]
+
+
+class FakeSession:
+    """Returns RETURNING rows, `inserted` is what `xmax = 0` yields."""
+
+    measure = InstrumentedAsyncSession.measure
+
+    def __init__(self, existing: set[str]) -> None:
+        self.info: dict = {}
+        self.existing = existing
+        self.chunks: list[list[dict]] = []
+
+    async def execute(self, statement, chunk):
+        self.chunks.append(chunk)
+        rows = [
+            {
+                "id": int(row["user_id"].removeprefix("user_")),
+                **row,
+                "inserted": row["user_id"] not in self.existing,
+            }
+            for row in chunk
+        ]
+        return types.SimpleNamespace(
+            mappings=lambda: types.SimpleNamespace(all=lambda: rows)
+        )
+
+
+def test_upsert_updates_only_changed_rows_and_flags_inserts():
+    statement = _upsert_statement(tables["users"], "users", "user_id")
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (user_id) DO UPDATE SET" in sql
+    assert "name = excluded.name" in sql
+    assert "user_id = excluded.user_id" not in sql
+    assert "IS DISTINCT FROM excluded.email" in sql
+    assert "(xmax = 0) AS inserted" in sql
+
+
+def test_upsert_requires_unique_conflict_key():
+    with pytest.raises(exceptions.db.sql.InvalidRequestError):
+        _upsert_statement(tables["users"], "users", "name")
+
+
+@pytest.mark.asyncio
+async def test_upsert_counts_inserted_and_updated_rows(monkeypatch):
+    monkeypatch.setattr(entity_cache, "enabled", True)
+    users = [
+        {"user_id": f"user_{i}", "name": f"User {i}", "email": f"u{i}@x.pl"}
+        for i in range(4)
+    ]
+    session = FakeSession(existing={"user_1", "user_3"})
+    pg_db = PostgresImplementation(session=session)
+    result = await pg_db.upsert_many_records(
+        [*users, users[0]], "users", chunk_size=3
+    )
+    assert [len(chunk) for chunk in session.chunks] == [3, 1]  # deduplicated
+    assert (result.inserted, result.updated) == (2, 2)
+    assert result.affected == 4
+    assert [chunk.affected for chunk in result.chunks] == [3, 1]
+    assert [r.user_id for r in result.records] == [u["user_id"] for u in users]
+    assert all(isinstance(r, tables["users"]) for r in result.records)
+    # Only updated rows can be stale in other caches
+    invalidated = {entry[2] for entry in session.info["invalidations"]}
+    assert invalidated == {"1", "3"}
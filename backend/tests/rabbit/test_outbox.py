@@ -0,0 +1,96 @@
+import types
+import typing
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.database.postgres.models import Outbox
+from backend.rabbit import outbox
+
+pytest_plugins = ["pytest_asyncio"]
+
+SETTINGS = types.SimpleNamespace(
+    RABBITMQ_OUTBOX_BATCH_SIZE=10,
+    RABBITMQ_OUTBOX_POLL_INTERVAL=1.0,
+    RABBITMQ_OUTBOX_RETENTION=60.0,
+)
+
+
+class FakeResult:
+    def __init__(self, rows: list) -> None:
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self) -> list:
+        return self.rows
+
+
+class FakeSessionManager:
+    """Stands in for PostgresSessionManager, records compiled statements."""
+
+    statements: typing.ClassVar[list] = []
+    rows: typing.ClassVar[list] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, statement):
+        self.statements.append(statement.compile(dialect=postgresql.dialect()))
+        return FakeResult(self.rows if len(self.statements) == 1 else [])
+
+
+class FakeChannel:
+    def __init__(self, *, nacked: set[str]) -> None:
+        self.nacked = nacked
+        self.published: list[str] = []
+        self.default_exchange = self
+
+    async def publish(self, message, routing_key: str) -> None:
+        if message.message_id in self.nacked:
+            raise RuntimeError("nack")
+        self.published.append(message.message_id)
+
+
+def row(number: int) -> Outbox:
+    return Outbox(
+        id=number,
+        message_id=f"m{number}",
+        type="generate_report",
+        routing_key="tasks",
+        body="{}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_confirmed_rows_are_marked_sent(monkeypatch):
+    monkeypatch.setattr(outbox, "PostgresSessionManager", FakeSessionManager)
+    monkeypatch.setattr(FakeSessionManager, "statements", [])
+    monkeypatch.setattr(FakeSessionManager, "rows", [row(1), row(2), row(3)])
+    channel = FakeChannel(nacked={"m2"})
+    relay = outbox.OutboxRelay(channel=channel, settings=SETTINGS)
+
+    assert await relay.relay_batch() == 3
+
+    claim, mark = FakeSessionManager.statements
+    assert "FOR UPDATE SKIP LOCKED" in str(claim)
+    assert mark.params["id_1"] == [1, 3]
+    assert channel.published == ["m1", "m3"]
+    assert relay.stats()["published"] == 2
+    assert relay.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_outbox_marks_nothing(monkeypatch):
+    monkeypatch.setattr(outbox, "PostgresSessionManager", FakeSessionManager)
+    monkeypatch.setattr(FakeSessionManager, "statements", [])
+    monkeypatch.setattr(FakeSessionManager, "rows", [])
+    relay = outbox.OutboxRelay(
+        channel=FakeChannel(nacked=set()), settings=SETTINGS
+    )
+    assert await relay.relay_batch() == 0
+    assert len(FakeSessionManager.statements) == 1